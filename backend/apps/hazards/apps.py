@@ -6,3 +6,10 @@ class HazardsConfig(AppConfig):
     name = 'apps.hazards'
     label = 'hazards'
     verbose_name = 'Hazards'
+
+    def ready(self):
+        from django.core import checks
+
+        from .checks import check_barangay_boundaries
+
+        checks.register(check_barangay_boundaries)
@@ -0,0 +1,233 @@
+"""
+Offline barangay / municipality lookup from boundary polygons.
+
+BARANGAY_BOUNDARIES_PATH points at a GeoJSON FeatureCollection (WGS84,
+[lng, lat]) of Polygon / MultiPolygon barangay boundaries, e.g. the PSGC
+level-4 boundaries for Sorsogon exported from PhilGIS / HDX. The file is not
+shipped with the repo: install it with `python manage.py
+load_barangay_boundaries <file>`. Without it lookup() returns None, the
+resolver falls back to Nominatim and a system check (hazards.W001) warns.
+
+Each feature's labels come from the first non-empty property in
+BARANGAY_KEYS / MUNICIPALITY_KEYS and are mapped to the canonical dropdown
+labels of apps.users.barangay_utils, so stored report locations match the
+barangays residents pick at registration.
+
+The file is loaded once per process into a uniform lat/lng grid: every
+polygon is listed under the cells its bounding box covers, so a lookup tests
+only the few polygons registered in the point's cell (bbox check, then
+even-odd ray casting over the outer ring and holes).
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from apps.users.barangay_utils import (
+    canonical_barangay,
+    canonical_municipality,
+    normalize_barangay_label,
+    normalize_municipality_label,
+)
+
+logger = logging.getLogger(__name__)
+
+BARANGAY_KEYS = ('barangay', 'ADM4_EN', 'NAME_3', 'name')
+MUNICIPALITY_KEYS = ('municipality', 'ADM3_EN', 'NAME_2')
+
+# ~1.1 km cells: a barangay covers a handful to a few hundred of them.
+CELL_DEG = 0.01
+
+Ring = List[Tuple[float, float]]
+
+
+class _Area:
+    """One polygon (outer ring + holes) of a barangay, with its labels."""
+
+    __slots__ = ('barangay', 'municipality', 'rings', 'bbox')
+
+    def __init__(self, barangay: str, municipality: str, rings: List[Ring]):
+        self.barangay = barangay
+        self.municipality = municipality
+        self.rings = rings
+        xs = [x for x, _ in rings[0]]
+        ys = [y for _, y in rings[0]]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+
+    def contains(self, x: float, y: float) -> bool:
+        min_x, min_y, max_x, max_y = self.bbox
+        if not (min_x <= x <= max_x and min_y <= y <= max_y):
+            return False
+        inside = False
+        for ring in self.rings:
+            x1, y1 = ring[-1]
+            for x2, y2 in ring:
+                if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+                    inside = not inside
+                x1, y1 = x2, y2
+        return inside
+
+
+class BoundaryIndex:
+    """Grid index over barangay polygons."""
+
+    def __init__(self, areas: List[_Area]):
+        self.areas = areas
+        self.grid: Dict[Tuple[int, int], List[_Area]] = {}
+        for area in areas:
+            min_x, min_y, max_x, max_y = area.bbox
+            for cx in range(int(min_x // CELL_DEG), int(max_x // CELL_DEG) + 1):
+                for cy in range(int(min_y // CELL_DEG), int(max_y // CELL_DEG) + 1):
+                    self.grid.setdefault((cx, cy), []).append(area)
+
+    def lookup(self, latitude: float, longitude: float) -> Optional[Tuple[str, str]]:
+        """(barangay, municipality) of the polygon containing the point, or None."""
+        x, y = float(longitude), float(latitude)
+        for area in self.grid.get((int(x // CELL_DEG), int(y // CELL_DEG)), ()):
+            if area.contains(x, y):
+                return area.barangay, area.municipality
+        return None
+
+    def centroid(self, barangay: str, municipality: str = '') -> Optional[Tuple[float, float]]:
+        """
+        (lat, lng) area centroid of every polygon labelled barangay (within
+        municipality when given; labels compared case-insensitively), holes
+        subtracted. None if no polygon carries the label.
+        """
+        name, muni = barangay.casefold(), municipality.casefold()
+        total = sx = sy = 0.0
+        for area in self.areas:
+            if area.barangay.casefold() != name or (muni and area.municipality.casefold() != muni):
+                continue
+            for i, ring in enumerate(area.rings):
+                a, cx, cy = _ring_area_centroid(ring)
+                weight = abs(a) if i == 0 else -abs(a)
+                total += weight
+                sx += weight * cx
+                sy += weight * cy
+        if total <= 0:
+            return None
+        return sy / total, sx / total
+
+
+def _ring_area_centroid(ring: Ring) -> Tuple[float, float, float]:
+    """Signed shoelace area and centroid (x, y) of a closed or open ring."""
+    a = cx = cy = 0.0
+    x1, y1 = ring[-1]
+    for x2, y2 in ring:
+        cross = x1 * y2 - x2 * y1
+        a += cross
+        cx += (x1 + x2) * cross
+        cy += (y1 + y2) * cross
+        x1, y1 = x2, y2
+    a /= 2.0
+    if a == 0:
+        xs = [x for x, _ in ring]
+        ys = [y for _, y in ring]
+        return 0.0, sum(xs) / len(xs), sum(ys) / len(ys)
+    return a, cx / (6.0 * a), cy / (6.0 * a)
+
+
+def _first_property(props: dict, keys) -> str:
+    for key in keys:
+        value = props.get(key)
+        if value:
+            return str(value)
+    return ''
+
+
+def _labels(props: dict) -> Tuple[str, str]:
+    raw_muni = _first_property(props, MUNICIPALITY_KEYS)
+    raw_brgy = _first_property(props, BARANGAY_KEYS)
+    municipality = canonical_municipality(raw_muni) or normalize_municipality_label(raw_muni)
+    barangay = canonical_barangay(raw_brgy, municipality) or normalize_barangay_label(raw_brgy)
+    return barangay, municipality
+
+
+def _polygons(geometry: dict) -> List[list]:
+    kind = (geometry or {}).get('type')
+    if kind == 'Polygon':
+        return [geometry['coordinates']]
+    if kind == 'MultiPolygon':
+        return list(geometry['coordinates'])
+    return []
+
+
+def build_index(feature_collection: dict) -> BoundaryIndex:
+    """Build a BoundaryIndex from a GeoJSON FeatureCollection dict."""
+    areas = []
+    for feature in feature_collection.get('features', []):
+        barangay, municipality = _labels(feature.get('properties') or {})
+        if not barangay:
+            continue
+        for polygon in _polygons(feature.get('geometry')):
+            rings = [[(float(p[0]), float(p[1])) for p in ring] for ring in polygon if len(ring) >= 3]
+            if rings:
+                areas.append(_Area(barangay, municipality, rings))
+    return BoundaryIndex(areas)
+
+
+def load_index(path: str) -> Optional[BoundaryIndex]:
+    """Read and index the boundary file at path; None if it is missing or unreadable."""
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as fh:
+            index = build_index(json.load(fh))
+    except (OSError, ValueError, KeyError, TypeError, IndexError) as exc:
+        logger.warning('Could not load barangay boundaries from %s: %s', path, exc)
+        return None
+    logger.info('Loaded %d barangay polygons from %s', len(index.areas), path)
+    return index
+
+
+_lock = threading.Lock()
+_index: Optional[BoundaryIndex] = None
+_loaded_key: Optional[tuple] = None
+
+
+def _file_key(path: str) -> tuple:
+    try:
+        return path, os.path.getmtime(path)
+    except OSError:
+        return path, None
+
+
+def get_index() -> Optional[BoundaryIndex]:
+    """
+    The process-wide index for BARANGAY_BOUNDARIES_PATH, loaded on first use
+    and reloaded when the file is replaced (load_barangay_boundaries).
+    """
+    global _index, _loaded_key
+    path = str(settings.BARANGAY_BOUNDARIES_PATH or '')
+    key = _file_key(path)
+    if _loaded_key == key:
+        return _index
+    with _lock:
+        if _loaded_key != key:
+            if key[1] is None:
+                logger.warning(
+                    'No barangay boundary file at %s; run manage.py load_barangay_boundaries', path or '(unset)',
+                )
+            _index = load_index(path)
+            _loaded_key = key
+    return _index
+
+
+def is_loaded() -> bool:
+    """True when BARANGAY_BOUNDARIES_PATH holds at least one usable polygon."""
+    index = get_index()
+    return index is not None and bool(index.areas)
+
+
+def lookup(latitude: float, longitude: float) -> Optional[Tuple[str, str]]:
+    """(barangay, municipality) containing the point, or None (no polygon / no boundary file)."""
+    index = get_index()
+    if index is None:
+        return None
+    return index.lookup(latitude, longitude)
@@ -0,0 +1,22 @@
+"""
+System checks for the hazards app (run by runserver, migrate and manage.py check).
+"""
+import os
+
+from django.conf import settings
+from django.core.checks import Warning
+
+
+def check_barangay_boundaries(app_configs, **kwargs):
+    """Warn when the barangay boundary file is missing (labels then depend on Nominatim)."""
+    path = str(settings.BARANGAY_BOUNDARIES_PATH or '')
+    if path and os.path.exists(path):
+        return []
+    return [Warning(
+        f'Barangay boundary file not found: {path or "(BARANGAY_BOUNDARIES_PATH unset)"}.',
+        hint=(
+            'Report barangay/municipality labels fall back to Nominatim. Install the '
+            'boundaries with `python manage.py load_barangay_boundaries <file.geojson>`.'
+        ),
+        id='hazards.W001',
+    )]
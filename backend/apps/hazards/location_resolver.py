@@ -1,7 +1,11 @@
 """
 Resolve human-readable hazard location from latitude/longitude.
 
-Uses OpenStreetMap Nominatim reverse geocoding with a short timeout.
+Barangay and municipality come from the local boundary polygons
+(barangay_boundaries) — no network, microseconds per lookup. OpenStreetMap
+Nominatim reverse geocoding (short timeout) adds the full address when
+REVERSE_GEOCODE_NOMINATIM is on, and supplies barangay/municipality for
+points outside every polygon or when no boundary file is configured.
 Failures are handled gracefully (returns empty strings).
 """
 from __future__ import annotations
@@ -11,6 +15,9 @@ from functools import lru_cache
 from urllib.parse import urlencode
 from urllib.request import Request, urlopen
 
+from django.conf import settings
+
+from apps.hazards import barangay_boundaries
 from apps.users.barangay_utils import (
     normalize_barangay_label,
     normalize_municipality_label,
@@ -67,6 +74,23 @@ def _reverse_geocode_cached(lat_rounded: float, lng_rounded: float) -> tuple[str
     return location_address, barangay, municipality
 
 
+def resolve_local_location(latitude: float, longitude: float) -> dict:
+    """
+    Barangay / municipality from the local boundary polygons only (never calls
+    Nominatim). Returns dict with keys location_barangay, location_municipality;
+    empty strings when the point is outside every polygon.
+    """
+    try:
+        hit = barangay_boundaries.lookup(float(latitude), float(longitude))
+    except (TypeError, ValueError):
+        hit = None
+    barangay, municipality = hit or ('', '')
+    return {
+        'location_barangay': barangay,
+        'location_municipality': municipality,
+    }
+
+
 def resolve_hazard_location(latitude: float, longitude: float) -> dict:
     """
     Best-effort location lookup for a hazard pin.
@@ -82,14 +106,16 @@ def resolve_hazard_location(latitude: float, longitude: float) -> dict:
             'location_municipality': '',
         }
 
-    try:
-        location_address, barangay, municipality = _reverse_geocode_cached(lat, lng)
-    except Exception:
-        location_address, barangay, municipality = '', '', ''
+    local = resolve_local_location(lat, lng)
+    location_address, barangay, municipality = '', '', ''
+    if settings.REVERSE_GEOCODE_NOMINATIM:
+        try:
+            location_address, barangay, municipality = _reverse_geocode_cached(lat, lng)
+        except Exception:
+            pass
 
     return {
         'location_address': location_address,
-        'location_barangay': barangay,
-        'location_municipality': municipality,
+        'location_barangay': local['location_barangay'] or barangay,
+        'location_municipality': local['location_municipality'] or municipality,
     }
-
@@ -0,0 +1,61 @@
+"""
+Management command: install the barangay boundary polygons.
+
+Validates a GeoJSON FeatureCollection of barangay Polygon / MultiPolygon
+boundaries (WGS84, [lng, lat]; labels from the properties listed in
+apps.hazards.barangay_boundaries.BARANGAY_KEYS / MUNICIPALITY_KEYS) and copies
+it to BARANGAY_BOUNDARIES_PATH, where report location lookups read it.
+
+SOURCE:
+- PSGC level-4 (barangay) boundaries for Sorsogon, e.g. from PhilGIS / HDX,
+  exported as GeoJSON in EPSG:4326.
+
+Usage:
+    python manage.py load_barangay_boundaries sorsogon_barangays.geojson
+    python manage.py load_barangay_boundaries boundaries.geojson --dry-run
+"""
+import json
+import os
+import shutil
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.hazards.barangay_boundaries import BARANGAY_KEYS, build_index
+
+
+class Command(BaseCommand):
+    help = 'Validate a barangay boundary GeoJSON file and install it at BARANGAY_BOUNDARIES_PATH.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='GeoJSON FeatureCollection of barangay boundaries.')
+        parser.add_argument('--dry-run', action='store_true', help='Validate only; do not install the file.')
+
+    def handle(self, *args, **options):
+        source = options['path']
+        try:
+            with open(source, encoding='utf-8') as fh:
+                data = json.load(fh)
+            index = build_index(data)
+        except (OSError, ValueError, KeyError, TypeError, IndexError) as exc:
+            raise CommandError(f'{source}: not a readable boundary GeoJSON file ({exc})')
+        if not index.areas:
+            raise CommandError(
+                f'{source}: no Polygon / MultiPolygon feature with a barangay label '
+                f'(properties tried: {", ".join(BARANGAY_KEYS)}).'
+            )
+
+        barangays = {(a.barangay, a.municipality) for a in index.areas}
+        municipalities = sorted({m for _, m in barangays if m})
+        self.stdout.write(
+            f'{len(index.areas)} polygons, {len(barangays)} barangays in '
+            f'{len(municipalities)} municipalities: {", ".join(municipalities) or "(none labelled)"}'
+        )
+        if options['dry_run']:
+            return
+
+        target = str(settings.BARANGAY_BOUNDARIES_PATH)
+        if os.path.abspath(source) != os.path.abspath(target):
+            os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+            shutil.copyfile(source, target)
+        self.stdout.write(self.style.SUCCESS(f'Installed barangay boundaries at {target}.'))
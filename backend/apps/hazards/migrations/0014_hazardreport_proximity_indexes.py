@@ -0,0 +1,19 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hazards', '0013_hazardreport_location_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hazardreport',
+            index=models.Index(fields=['hazard_type', 'status', 'latitude'], name='hazard_type_status_lat_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hazardreport',
+            index=models.Index(fields=['status', 'latitude'], name='hazard_status_lat_idx'),
+        ),
+    ]
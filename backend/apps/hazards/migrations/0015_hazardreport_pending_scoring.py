@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('hazards', '0014_hazardreport_proximity_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='hazardreport',
+            name='status',
+            field=models.CharField(choices=[('pending_scoring', 'Pending Scoring'), ('pending', 'Pending'), ('approved', 'Approved'), ('rejected', 'Rejected')], default='pending', max_length=20),
+        ),
+    ]
@@ -38,6 +38,8 @@ class HazardReport(models.Model):
     4) MDRRMO approves/rejects; only APPROVED reports affect routing risk (see route_service).
     """
     class Status(models.TextChoices):
+        # Accepted; validation scoring still queued (apps.mobile_sync.tasks), then PENDING.
+        PENDING_SCORING = 'pending_scoring', 'Pending Scoring'
         PENDING = 'pending', 'Pending'
         APPROVED = 'approved', 'Approved'
         REJECTED = 'rejected', 'Rejected'
@@ -114,6 +116,12 @@ class HazardReport(models.Model):
     class Meta:
         db_table = 'hazards_hazardreport'
         ordering = ['-created_at']  # Newest first
+        indexes = [
+            # Nearby-report lookups (consensus, duplicate check, check-similar-reports)
+            # filter by type / status and a latitude range; see validation.services.consensus.
+            models.Index(fields=['hazard_type', 'status', 'latitude'], name='hazard_type_status_lat_idx'),
+            models.Index(fields=['status', 'latitude'], name='hazard_status_lat_idx'),
+        ]
 
     def __str__(self):
         return f"Report {self.id} - {self.hazard_type} ({self.status})"
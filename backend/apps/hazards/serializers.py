@@ -2,7 +2,8 @@
 from rest_framework import serializers
 
 from .models import HazardReport
-from .location_resolver import resolve_hazard_location
+from . import barangay_boundaries
+from .location_resolver import resolve_hazard_location, resolve_local_location
 
 
 def _round_coord(value):
@@ -98,10 +99,22 @@ def _location_label_for_report(obj):
     return _coord_fallback_label(obj)
 
 
+def _resident_status(data):
+    """
+    Resident-facing status: a report still in PENDING_SCORING (scoring job queued)
+    is reported as 'pending' — residents see the same review state either way.
+    """
+    if data.get('status') == HazardReport.Status.PENDING_SCORING:
+        data['status'] = HazardReport.Status.PENDING
+    return data
+
+
 def _resolved_location_fields(obj):
     """
     Return location_address/barangay/municipality for a report.
-    Uses stored fields first; falls back to reverse geocoding when missing.
+    Uses stored fields first. When they are missing, resolves from the local
+    barangay polygons if a boundary file is loaded (no network wait while
+    serializing a list), otherwise falls back to reverse geocoding as before.
     """
     address = (getattr(obj, 'location_address', '') or '').strip()
     barangay = (getattr(obj, 'location_barangay', '') or '').strip()
@@ -113,7 +126,12 @@ def _resolved_location_fields(obj):
             'location_municipality': municipality,
         }
     try:
-        return resolve_hazard_location(float(obj.latitude), float(obj.longitude))
+        if not barangay_boundaries.is_loaded():
+            return resolve_hazard_location(float(obj.latitude), float(obj.longitude))
+        return {
+            'location_address': '',
+            **resolve_local_location(float(obj.latitude), float(obj.longitude)),
+        }
     except Exception:
         return {
             'location_address': '',
@@ -123,7 +141,11 @@ def _resolved_location_fields(obj):
 
 
 class HazardReportSerializer(serializers.ModelSerializer):
-    """Full read serializer: NB + rule scores + breakdown (no Random Forest in validation)."""
+    """
+    Full read serializer: NB + rule scores + breakdown (no Random Forest in validation).
+    Resident-facing (submit, my-reports, confirm): PENDING_SCORING is shown as
+    'pending' with scoring_pending=True.
+    """
 
     reporter_full_name = serializers.SerializerMethodField()
     reporter_display_id = serializers.SerializerMethodField()
@@ -208,7 +230,8 @@ class HazardReportSerializer(serializers.ModelSerializer):
         data = super().to_representation(instance)
         data['has_photo'] = bool((instance.photo_url or '').strip())
         data['has_video'] = bool((instance.video_url or '').strip())
-        return data
+        data['scoring_pending'] = instance.status == HazardReport.Status.PENDING_SCORING
+        return _resident_status(data)
 
 class PublicHazardSerializer(serializers.ModelSerializer):
     """
@@ -271,6 +294,9 @@ class SimilarReportPublicSerializer(serializers.ModelSerializer):
     def get_confirmation_count(self, obj):
         return obj.confirmation_count
 
+    def to_representation(self, instance):
+        return _resident_status(super().to_representation(instance))
+
 
 class PendingReportSerializer(serializers.ModelSerializer):
     """For MDRRMO pending list. validation_breakdown used in Report Details → View Technical Details."""
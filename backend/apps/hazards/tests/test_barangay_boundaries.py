@@ -0,0 +1,167 @@
+"""
+Tests for offline barangay lookup (barangay_boundaries + location_resolver).
+Boundaries here are synthetic squares, not real barangay shapes.
+"""
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, override_settings
+
+from apps.hazards import barangay_boundaries
+from apps.hazards.checks import check_barangay_boundaries
+from apps.hazards.location_resolver import resolve_hazard_location, resolve_local_location
+from apps.hazards.models import HazardReport
+from apps.hazards.serializers import _resolved_location_fields
+
+
+def _square(min_lng, min_lat, size):
+    return [
+        [min_lng, min_lat], [min_lng + size, min_lat], [min_lng + size, min_lat + size],
+        [min_lng, min_lat + size], [min_lng, min_lat],
+    ]
+
+
+FEATURES = {
+    'type': 'FeatureCollection',
+    'features': [
+        {
+            # 0.05° square with a 0.01° hole in the middle.
+            'type': 'Feature',
+            'properties': {'ADM4_EN': 'ZONE 1', 'ADM3_EN': 'Municipality of Bulan'},
+            'geometry': {
+                'type': 'Polygon',
+                'coordinates': [_square(123.80, 12.60, 0.05), _square(123.82, 12.62, 0.01)],
+            },
+        },
+        {
+            # The hole, filled by another barangay.
+            'type': 'Feature',
+            'properties': {'barangay': 'Obrero', 'municipality': 'Bulan'},
+            'geometry': {'type': 'Polygon', 'coordinates': [_square(123.82, 12.62, 0.01)]},
+        },
+        {
+            'type': 'Feature',
+            'properties': {'NAME_3': 'Bagatao Island', 'NAME_2': 'BULAN'},
+            'geometry': {
+                'type': 'MultiPolygon',
+                'coordinates': [[_square(123.90, 12.60, 0.01)], [_square(123.95, 12.60, 0.01)]],
+            },
+        },
+    ],
+}
+
+
+class BarangayBoundariesTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.tmpdir.name, 'barangays.geojson')
+        with open(cls.path, 'w', encoding='utf-8') as fh:
+            json.dump(FEATURES, fh)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+        super().tearDownClass()
+
+    def test_point_in_polygon_with_canonical_labels(self):
+        index = barangay_boundaries.load_index(self.path)
+        self.assertEqual(index.lookup(12.61, 123.81), ('Zone 1 (Pob.)', 'Bulan'))
+
+    def test_hole_belongs_to_inner_barangay(self):
+        index = barangay_boundaries.load_index(self.path)
+        self.assertEqual(index.lookup(12.625, 123.825), ('Obrero', 'Bulan'))
+
+    def test_multipolygon_parts(self):
+        index = barangay_boundaries.load_index(self.path)
+        self.assertEqual(index.lookup(12.605, 123.905), ('Bagatao Island', 'Bulan'))
+        self.assertEqual(index.lookup(12.605, 123.955), ('Bagatao Island', 'Bulan'))
+        self.assertIsNone(index.lookup(12.605, 123.93))
+
+    def test_outside_and_missing_file(self):
+        index = barangay_boundaries.load_index(self.path)
+        self.assertIsNone(index.lookup(13.5, 124.5))
+        self.assertIsNone(barangay_boundaries.load_index(os.path.join(self.tmpdir.name, 'missing.geojson')))
+
+    def test_resolver_offline(self):
+        with override_settings(BARANGAY_BOUNDARIES_PATH=self.path, REVERSE_GEOCODE_NOMINATIM=False), \
+                mock.patch('apps.hazards.location_resolver._reverse_geocode_cached') as nominatim:
+            self.assertEqual(resolve_hazard_location(12.61, 123.81), {
+                'location_address': '',
+                'location_barangay': 'Zone 1 (Pob.)',
+                'location_municipality': 'Bulan',
+            })
+        nominatim.assert_not_called()
+
+    def test_polygon_labels_win_over_nominatim(self):
+        with override_settings(BARANGAY_BOUNDARIES_PATH=self.path, REVERSE_GEOCODE_NOMINATIM=True), \
+                mock.patch(
+                    'apps.hazards.location_resolver._reverse_geocode_cached',
+                    return_value=('Main St, Bulan, Sorsogon', 'Zone 2', 'Bulan'),
+                ):
+            location = resolve_hazard_location(12.61, 123.81)
+            fallback = resolve_hazard_location(13.5, 124.5)
+        self.assertEqual(location['location_address'], 'Main St, Bulan, Sorsogon')
+        self.assertEqual(location['location_barangay'], 'Zone 1 (Pob.)')
+        self.assertEqual(fallback['location_barangay'], 'Zone 2')
+
+    def test_local_resolution_without_boundary_file(self):
+        with override_settings(BARANGAY_BOUNDARIES_PATH=os.path.join(self.tmpdir.name, 'missing.geojson')):
+            self.assertEqual(resolve_local_location(12.61, 123.81), {
+                'location_barangay': '',
+                'location_municipality': '',
+            })
+
+    def test_serializer_fallback_uses_nominatim_without_boundaries(self):
+        report = HazardReport(latitude=12.61, longitude=123.81)
+        missing = os.path.join(self.tmpdir.name, 'missing.geojson')
+        with override_settings(BARANGAY_BOUNDARIES_PATH=missing, REVERSE_GEOCODE_NOMINATIM=True), \
+                mock.patch(
+                    'apps.hazards.location_resolver._reverse_geocode_cached',
+                    return_value=('Main St, Bulan, Sorsogon', 'Zone 2', 'Bulan'),
+                ):
+            self.assertEqual(_resolved_location_fields(report)['location_barangay'], 'Zone 2')
+        with override_settings(BARANGAY_BOUNDARIES_PATH=self.path), \
+                mock.patch('apps.hazards.location_resolver._reverse_geocode_cached') as nominatim:
+            self.assertEqual(_resolved_location_fields(report)['location_barangay'], 'Zone 1 (Pob.)')
+        nominatim.assert_not_called()
+
+    def test_centroid_subtracts_holes_and_merges_parts(self):
+        # 0.04° square minus a 0.02° hole in its south-west corner: the centroid
+        # sits at 7/12 of the side from that corner.
+        cornered = barangay_boundaries.build_index({'features': [{
+            'properties': {'barangay': 'Obrero', 'municipality': 'Bulan'},
+            'geometry': {'type': 'Polygon', 'coordinates': [_square(123.80, 12.60, 0.04), _square(123.80, 12.60, 0.02)]},
+        }]})
+        lat, lng = cornered.centroid('Obrero', 'Bulan')
+        self.assertAlmostEqual(lat, 12.60 + 0.04 * 7 / 12, places=7)
+        self.assertAlmostEqual(lng, 123.80 + 0.04 * 7 / 12, places=7)
+
+        index = barangay_boundaries.load_index(self.path)
+        lat, lng = index.centroid('bagatao island')
+        self.assertAlmostEqual(lat, 12.605, places=6)
+        self.assertAlmostEqual(lng, 123.93, places=6)
+        self.assertIsNone(index.centroid('Obrero', 'Sorsogon City'))
+
+    def test_loader_command_installs_file(self):
+        target = os.path.join(self.tmpdir.name, 'installed', 'barangays.geojson')
+        with override_settings(BARANGAY_BOUNDARIES_PATH=target):
+            self.assertTrue(check_barangay_boundaries(None))
+            out = StringIO()
+            call_command('load_barangay_boundaries', self.path, stdout=out)
+            self.assertIn('4 polygons, 3 barangays', out.getvalue())
+            self.assertTrue(os.path.exists(target))
+            self.assertEqual(check_barangay_boundaries(None), [])
+            self.assertTrue(barangay_boundaries.is_loaded())
+
+    def test_loader_command_rejects_file_without_polygons(self):
+        empty = os.path.join(self.tmpdir.name, 'empty.geojson')
+        with open(empty, 'w', encoding='utf-8') as fh:
+            json.dump({'type': 'FeatureCollection', 'features': []}, fh)
+        with self.assertRaises(CommandError):
+            call_command('load_barangay_boundaries', empty, '--dry-run', stdout=StringIO())
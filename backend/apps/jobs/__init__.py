@@ -0,0 +1 @@
+# Background jobs app
@@ -0,0 +1,48 @@
+"""
+Django management command: run_jobs
+
+Run queued jobs (apps.jobs.queue) in a dedicated process instead of, or next
+to, the worker threads inside the web processes (JOB_QUEUE_WORKERS=0 turns
+those off).
+
+Usage:
+    python manage.py run_jobs              # loop forever, polling every JOB_QUEUE_POLL_SECONDS
+    python manage.py run_jobs --once       # run everything due now, then exit (cron)
+    python manage.py run_jobs --stats      # print queue depth and exit
+"""
+import json
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (report scoring, geocoding, notifications, risk refreshes).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Run the jobs due now and exit.')
+        parser.add_argument('--stats', action='store_true', help='Print queue depth as JSON and exit.')
+
+    def handle(self, *args, **options):
+        from apps.jobs import queue
+
+        if options['stats']:
+            self.stdout.write(json.dumps(queue.stats(), indent=2))
+            return
+        if options['once']:
+            ran = queue.run_pending()
+            self.stderr.write(f'{ran} job(s) run')
+            return
+        self.stderr.write(f'Running jobs; polling every {settings.JOB_QUEUE_POLL_SECONDS}s (Ctrl+C to stop)')
+        last_purge = 0.0
+        while True:
+            close_old_connections()
+            ran = queue.run_pending()
+            if ran:
+                self.stderr.write(f'{ran} job(s) run')
+            if time.monotonic() - last_purge > 3600:
+                last_purge = time.monotonic()
+                queue.purge_finished(settings.JOB_QUEUE_RETENTION_DAYS)
+            time.sleep(settings.JOB_QUEUE_POLL_SECONDS)
@@ -0,0 +1,225 @@
+"""
+Small pluggable job queue for work that should not run on the request thread
+(report scoring, reverse geocoding, FCM pushes, segment-risk refreshes).
+
+A job is a jobs_job row: a handler name registered with @register in some
+app's tasks.py, its keyword arguments (JSON) and its state. enqueue() stores
+the row; what runs it depends on JOB_QUEUE_BACKEND:
+
+  thread : JOB_QUEUE_WORKERS daemon threads in each web process, started when
+           the WSGI / ASGI application loads (start_workers; management
+           commands never start them), woken when the enqueuing transaction
+           commits and otherwise polling every JOB_QUEUE_POLL_SECONDS
+           (retries, jobs left pending by a restart, jobs queued elsewhere)
+  sync   : the job runs inside enqueue() (tests, scripts)
+
+`python manage.py run_jobs` drains the same table from a separate process, so
+web workers can run with JOB_QUEUE_WORKERS=0. Another broker (Redis, Celery)
+only has to replace _dispatch and call run_job(job_id) from its own worker.
+
+A job is claimed with a conditional UPDATE, so each attempt runs in exactly
+one worker. Handlers must still be idempotent: a failing job is retried with
+exponential backoff up to its max_attempts, and a job left RUNNING by a worker
+that died is handed out again after JOB_QUEUE_STALE_SECONDS. A handler
+registered with on_failure gets that callback (same payload) once the job is
+marked FAILED, so it can leave its data in a usable state.
+"""
+import logging
+import threading
+import time
+import traceback
+from datetime import timedelta
+from typing import Callable, Dict, Optional, Tuple
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Count, F, Min
+from django.utils import timezone
+
+from apps.jobs.models import Job
+
+logger = logging.getLogger(__name__)
+
+BACKEND_THREAD = 'thread'
+BACKEND_SYNC = 'sync'
+
+# name -> (handler, max_attempts, on_failure)
+_handlers: Dict[str, Tuple[Callable, int, Optional[Callable]]] = {}
+
+_wake_event = threading.Event()
+_workers: list = []
+_workers_lock = threading.Lock()
+_last_purge = 0.0
+
+
+def register(name: str, max_attempts: int = 5, on_failure: Optional[Callable] = None):
+    """
+    Decorator: run fn(**payload) for jobs enqueued under name. on_failure(**payload)
+    runs once when the last attempt has failed.
+    """
+    def decorator(fn):
+        _handlers[name] = (fn, max_attempts, on_failure)
+        return fn
+    return decorator
+
+
+def is_eager() -> bool:
+    """True when enqueue() runs the job before returning."""
+    return settings.JOB_QUEUE_BACKEND == BACKEND_SYNC
+
+
+def enqueue(name: str, payload: Optional[dict] = None, dedupe_key: str = '', delay_seconds: float = 0.0) -> Job:
+    """
+    Queue handler name with keyword arguments payload. With dedupe_key, a job of
+    the same name and key that has not started yet is returned instead of adding
+    another (e.g. several full risk refreshes in a row run once).
+    """
+    if name not in _handlers:
+        raise KeyError(f'No job handler registered as {name!r}')
+    if dedupe_key:
+        pending = Job.objects.filter(name=name, dedupe_key=dedupe_key, status=Job.Status.PENDING).first()
+        if pending is not None:
+            return pending
+    job = Job.objects.create(
+        name=name,
+        payload=payload or {},
+        dedupe_key=dedupe_key,
+        max_attempts=_handlers[name][1],
+        run_after=timezone.now() + timedelta(seconds=delay_seconds),
+    )
+    _dispatch(job)
+    return job
+
+
+def _dispatch(job: Job) -> None:
+    if is_eager():
+        run_job(job.id)
+        job.refresh_from_db()
+    else:
+        transaction.on_commit(wake_workers)
+
+
+def run_job(job_id: int) -> bool:
+    """Claim and run one due PENDING job. Returns False if it was not claimable."""
+    now = timezone.now()
+    claimed = Job.objects.filter(pk=job_id, status=Job.Status.PENDING, run_after__lte=now).update(
+        status=Job.Status.RUNNING, started_at=now, attempts=F('attempts') + 1,
+    )
+    if not claimed:
+        return False
+    job = Job.objects.get(pk=job_id)
+    try:
+        handler = _handlers.get(job.name)
+        if handler is None:
+            raise KeyError(f'No job handler registered as {job.name!r}')
+        handler[0](**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()[-4000:]
+        if job.attempts >= job.max_attempts:
+            job.status = Job.Status.FAILED
+            job.finished_at = timezone.now()
+            logger.error('Job %s %s failed after %d attempts', job.id, job.name, job.attempts)
+        else:
+            job.status = Job.Status.PENDING
+            backoff = settings.JOB_QUEUE_RETRY_SECONDS * 2 ** (job.attempts - 1)
+            job.run_after = timezone.now() + timedelta(seconds=backoff)
+            logger.warning('Job %s %s attempt %d failed; retrying in %ss', job.id, job.name, job.attempts, backoff)
+        job.save(update_fields=['status', 'last_error', 'finished_at', 'run_after'])
+        if job.status == Job.Status.FAILED and handler is not None and handler[2] is not None:
+            try:
+                handler[2](**job.payload)
+            except Exception:
+                logger.exception('Failure callback for job %s %s failed', job.id, job.name)
+        return True
+    Job.objects.filter(pk=job.pk).update(status=Job.Status.DONE, finished_at=timezone.now(), last_error='')
+    return True
+
+
+def requeue_stale() -> int:
+    """Hand RUNNING jobs whose worker has not finished them in JOB_QUEUE_STALE_SECONDS back to the queue."""
+    cutoff = timezone.now() - timedelta(seconds=settings.JOB_QUEUE_STALE_SECONDS)
+    return Job.objects.filter(status=Job.Status.RUNNING, started_at__lt=cutoff).update(status=Job.Status.PENDING)
+
+
+def run_pending(limit: Optional[int] = None) -> int:
+    """Run due jobs (oldest first) until none are left or limit is reached. Returns how many ran."""
+    requeue_stale()
+    ran = 0
+    while limit is None or ran < limit:
+        batch = list(
+            Job.objects.filter(status=Job.Status.PENDING, run_after__lte=timezone.now())
+            .order_by('run_after', 'id')
+            .values_list('id', flat=True)[:20]
+        )
+        if not batch:
+            break
+        for job_id in batch:
+            if limit is not None and ran >= limit:
+                break
+            if run_job(job_id):
+                ran += 1
+    return ran
+
+
+def purge_finished(older_than_days: float) -> int:
+    """Delete DONE and FAILED jobs that finished more than older_than_days ago."""
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    deleted, _ = Job.objects.filter(
+        status__in=[Job.Status.DONE, Job.Status.FAILED], finished_at__lt=cutoff,
+    ).delete()
+    return deleted
+
+
+def _worker_loop() -> None:
+    global _last_purge
+    while True:
+        _wake_event.wait(settings.JOB_QUEUE_POLL_SECONDS)
+        _wake_event.clear()
+        close_old_connections()
+        try:
+            run_pending()
+            if time.monotonic() - _last_purge > 3600:
+                _last_purge = time.monotonic()
+                purge_finished(settings.JOB_QUEUE_RETENTION_DAYS)
+        except Exception:
+            logger.exception('Job worker loop failed')
+        finally:
+            close_old_connections()
+
+
+def start_workers() -> None:
+    """
+    Start this process's worker threads when the thread backend is configured,
+    so jobs left pending across a restart run without waiting for a new enqueue.
+    Called from config.wsgi / config.asgi.
+    """
+    if settings.JOB_QUEUE_BACKEND == BACKEND_THREAD and settings.JOB_QUEUE_WORKERS > 0:
+        wake_workers()
+
+
+def wake_workers() -> None:
+    """Start this process's worker threads if needed and wake them."""
+    with _workers_lock:
+        if not _workers:
+            for i in range(settings.JOB_QUEUE_WORKERS):
+                thread = threading.Thread(target=_worker_loop, name=f'job-worker-{i}', daemon=True)
+                thread.start()
+                _workers.append(thread)
+    _wake_event.set()
+
+
+def stats() -> dict:
+    """Queue depth for dashboards: counts per status, pending per handler, age of the oldest due job."""
+    by_status = {s: 0 for s in Job.Status.values}
+    by_status.update(dict(Job.objects.values_list('status').annotate(n=Count('id')).order_by()))
+    pending = Job.objects.filter(status=Job.Status.PENDING)
+    pending_by_name = dict(pending.values_list('name').annotate(n=Count('id')).order_by())
+    oldest = pending.filter(run_after__lte=timezone.now()).aggregate(t=Min('run_after'))['t']
+    return {
+        'backend': settings.JOB_QUEUE_BACKEND,
+        'workers': sum(1 for t in _workers if t.is_alive()),
+        'depth': by_status[Job.Status.PENDING] + by_status[Job.Status.RUNNING],
+        'by_status': by_status,
+        'pending_by_name': pending_by_name,
+        'oldest_due_seconds': round((timezone.now() - oldest).total_seconds(), 1) if oldest else None,
+    }
@@ -0,0 +1,137 @@
+"""
+Tests for the background job queue (apps.jobs.queue).
+"""
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.jobs import queue
+from apps.jobs.models import Job
+
+calls = []
+
+
+@queue.register('tests.record')
+def _record(value):
+    calls.append(value)
+
+
+@queue.register('tests.fail', max_attempts=2, on_failure=lambda **payload: calls.append(('failed', payload)))
+def _fail(**payload):
+    raise ValueError('boom')
+
+
+@override_settings(JOB_QUEUE_BACKEND='thread', JOB_QUEUE_RETRY_SECONDS=10)
+class JobQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_stores_pending_job(self):
+        job = queue.enqueue('tests.record', {'value': 1})
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertEqual(calls, [])
+        self.assertEqual(queue.run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.DONE)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(calls, [1])
+
+    def test_unknown_handler_rejected(self):
+        with self.assertRaises(KeyError):
+            queue.enqueue('tests.missing')
+
+    def test_dedupe_key_returns_pending_job(self):
+        first = queue.enqueue('tests.record', {'value': 1}, dedupe_key='k')
+        second = queue.enqueue('tests.record', {'value': 2}, dedupe_key='k')
+        self.assertEqual(first.pk, second.pk)
+        queue.run_pending()
+        third = queue.enqueue('tests.record', {'value': 3}, dedupe_key='k')
+        self.assertNotEqual(first.pk, third.pk)
+
+    def test_job_claimed_once(self):
+        job = queue.enqueue('tests.record', {'value': 1})
+        self.assertTrue(queue.run_job(job.pk))
+        self.assertFalse(queue.run_job(job.pk))
+        self.assertEqual(calls, [1])
+
+    def test_delayed_job_not_run_early(self):
+        queue.enqueue('tests.record', {'value': 1}, delay_seconds=60)
+        self.assertEqual(queue.run_pending(), 0)
+
+    def test_failure_backs_off_then_fails(self):
+        job = queue.enqueue('tests.fail')
+        queue.run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertIn('boom', job.last_error)
+        self.assertEqual(calls, [])
+        self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=9))
+        self.assertEqual(queue.run_pending(), 0)
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        queue.run_pending()
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertIsNotNone(job.finished_at)
+        self.assertEqual(calls, [('failed', {})])
+
+    @override_settings(JOB_QUEUE_STALE_SECONDS=60)
+    def test_stale_running_job_requeued(self):
+        job = queue.enqueue('tests.record', {'value': 1})
+        Job.objects.filter(pk=job.pk).update(
+            status=Job.Status.RUNNING, started_at=timezone.now() - timedelta(seconds=120),
+        )
+        self.assertEqual(queue.run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.Status.DONE)
+
+    def test_purge_finished(self):
+        job = queue.enqueue('tests.record', {'value': 1})
+        queue.run_pending()
+        Job.objects.filter(pk=job.pk).update(finished_at=timezone.now() - timedelta(days=8))
+        self.assertEqual(queue.purge_finished(7), 1)
+        self.assertFalse(Job.objects.exists())
+
+    def test_start_workers_only_for_thread_backend(self):
+        with mock.patch.object(queue, 'wake_workers') as wake:
+            queue.start_workers()
+            with self.settings(JOB_QUEUE_WORKERS=0):
+                queue.start_workers()
+            with self.settings(JOB_QUEUE_BACKEND='sync'):
+                queue.start_workers()
+        wake.assert_called_once_with()
+
+    @override_settings(JOB_QUEUE_BACKEND='sync')
+    def test_sync_backend_runs_inline(self):
+        job = queue.enqueue('tests.record', {'value': 5})
+        self.assertEqual(job.status, Job.Status.DONE)
+        self.assertEqual(calls, [5])
+
+
+@override_settings(JOB_QUEUE_BACKEND='thread')
+class JobQueueStatsEndpointTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.mdrrmo = User.objects.create_user(
+            username='jobs_admin', email='jobs_admin@test.local', password='testpass123',
+            role=User.Role.MDRRMO,
+        )
+        User.objects.filter(pk=self.mdrrmo.pk).update(is_active=True)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.mdrrmo).key}')
+
+    def test_stats(self):
+        queue.enqueue('tests.record', {'value': 1})
+        queue.enqueue('tests.record', {'value': 2}, delay_seconds=60)
+        response = self.client.get('/api/mdrrmo/job-queue/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['depth'], 2)
+        self.assertEqual(response.data['by_status']['pending'], 2)
+        self.assertEqual(response.data['pending_by_name'], {'tests.record': 2})
+        self.assertIsNotNone(response.data['oldest_due_seconds'])
@@ -0,0 +1,9 @@
+"""
+URL configuration for the background job queue.
+"""
+from django.urls import path
+from . import views
+
+urlpatterns = [
+    path('mdrrmo/job-queue/', views.job_queue_stats, name='job_queue_stats'),
+]
@@ -0,0 +1,21 @@
+"""
+Job queue monitoring (MDRRMO).
+"""
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from apps.jobs import queue
+from core.permissions.mdrrmo import IsMDRRMO
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsMDRRMO])
+def job_queue_stats(request):
+    """
+    GET /api/mdrrmo/job-queue/
+    Background job queue depth: backend, live worker threads in this process,
+    depth (pending + running), by_status counts, pending_by_name and
+    oldest_due_seconds (how long the oldest due job has been waiting).
+    """
+    return Response(queue.stats())
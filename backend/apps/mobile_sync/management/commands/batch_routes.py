@@ -0,0 +1,93 @@
+"""
+Django management command: batch_routes
+
+Evacuation-planning reachability for many origins at once, written as NDJSON
+(one JSON object per line, one line per origin × centre; see
+apps.mobile_sync.services.batch_routing). The road graph is loaded once and the
+per-origin searches are spread over a process pool.
+
+Origins come from a CSV file (header with lat, lng and optionally id; other
+columns are copied to every row), a JSON / NDJSON file of {id?, lat, lng}
+objects, or barangay names resolved through barangay_utils.
+
+Usage:
+    python manage.py batch_routes --origins households.csv --output reach.ndjson
+    python manage.py batch_routes --barangays "Bibincahan,Cambulaga" --municipality "Sorsogon City"
+    python manage.py batch_routes --origins clusters.json --centers 1,4 --workers 4 --polyline
+"""
+import csv
+import json
+import os
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+def _load_origins(path: str) -> list:
+    with open(path, newline='', encoding='utf-8') as fh:
+        if path.lower().endswith('.csv'):
+            origins = [dict(row) for row in csv.DictReader(fh)]
+        else:
+            text = fh.read().strip()
+            if text.startswith('['):
+                origins = json.loads(text)
+            else:
+                origins = [json.loads(line) for line in text.splitlines() if line.strip()]
+    for i, o in enumerate(origins):
+        try:
+            o['lat'] = float(o['lat'])
+            o['lng'] = float(o['lng'])
+        except (KeyError, TypeError, ValueError):
+            raise CommandError(f'{path}: origin {i + 1} needs numeric lat and lng')
+        if o.get('id') in (None, ''):
+            o.pop('id', None)
+    return origins
+
+
+class Command(BaseCommand):
+    help = 'Route many origins to evacuation centres and write NDJSON reachability rows.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--origins', help='CSV (lat,lng[,id,...]) or JSON / NDJSON file of origins.')
+        parser.add_argument('--barangays', default='', help='Comma-separated barangay names.')
+        parser.add_argument('--municipality', default='', help='Municipality the barangays belong to.')
+        parser.add_argument('--centers', default='', help='Comma-separated centre ids (default: all operational).')
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Search processes (default: CPU count; 1 = no pool).',
+        )
+        parser.add_argument('--polyline', action='store_true', help='Include each route as an encoded polyline.')
+        parser.add_argument('--output', default='-', help='Output file (default: stdout).')
+
+    def handle(self, *args, **options):
+        from apps.mobile_sync.services.batch_routing import resolve_barangay_origins, route_batch
+
+        origins = _load_origins(options['origins']) if options['origins'] else []
+        names = [b.strip() for b in options['barangays'].split(',') if b.strip()]
+        origins += resolve_barangay_origins(names, options['municipality'])
+        if not origins:
+            raise CommandError('Give --origins and/or --barangays.')
+        try:
+            center_ids = [int(c) for c in options['centers'].split(',') if c.strip()] or None
+        except ValueError:
+            raise CommandError('--centers must be comma-separated integers')
+
+        out = sys.stdout if options['output'] == '-' else open(options['output'], 'w', encoding='utf-8')
+        t0 = time.monotonic()
+        rows = reachable = errors = 0
+        try:
+            for row in route_batch(
+                origins, center_ids=center_ids, workers=options['workers'], include_polyline=options['polyline'],
+            ):
+                out.write(json.dumps(row) + '\n')
+                rows += 1
+                reachable += bool(row.get('reachable'))
+                errors += 'error' in row
+        finally:
+            if out is not sys.stdout:
+                out.close()
+        self.stderr.write(
+            f'{len(origins)} origins → {rows} rows ({reachable} reachable, {errors} errors) '
+            f'in {time.monotonic() - t0:.1f}s with {options["workers"]} worker(s)'
+        )
@@ -0,0 +1,117 @@
+"""
+Django management command: benchmark_alternatives
+
+Compares ways of producing the route set calculate_safest_routes needs: k safe
+routes (first route + penalised reruns) plus the distance-only route.
+
+  searches    : k + 1 independent Dijkstra searches (the original approach)
+  engine-cold : tree-driven dijkstra_k_routes, building the destination's
+                shortest-path trees inside every query (a centre-tree miss in
+                calculate_safest_routes)
+  engine-warm : tree-driven dijkstra_k_routes with the per-centre trees cached
+                on the network snapshot (tree build time reported once, separately)
+
+For each it prints settled nodes and wall time per query, and how many queries
+returned route sets identical to / with the same costs as the searches baseline.
+Equal-cost ties (base_distance is stored to 0.1 m) can be broken differently.
+
+Usage:
+    python manage.py benchmark_alternatives
+    python manage.py benchmark_alternatives --queries 200 --k 3 --seed 7
+"""
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Benchmark k+1 independent searches vs the tree-driven alternatives engine.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', type=int, default=100, help='Number of resident start points.')
+        parser.add_argument('--k', type=int, default=3, help='Safe routes per query (penalised reruns).')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for start points.')
+
+    def handle(self, *args, **options):
+        from apps.evacuation.models import EvacuationCenter
+        from apps.mobile_sync.services.network_cache import CENTER_TREE_MULTIPLIERS, get_network_snapshot
+        from apps.routing.services import ModifiedDijkstraService
+
+        safe_mult, dist_mult = CENTER_TREE_MULTIPLIERS
+        k = options['k']
+        rnd = random.Random(options['seed'])
+
+        graph = get_network_snapshot().graph
+        if graph.num_nodes == 0:
+            self.stderr.write(self.style.WARNING('No road segments found. Run: python manage.py migrate'))
+            return
+        graph.weights(safe_mult)
+        graph.weights(dist_mult)
+
+        centers = [
+            graph.nearest_node(float(ec.latitude), float(ec.longitude))
+            for ec in EvacuationCenter.objects.filter(is_operational=True)
+        ]
+        if not centers:
+            self.stdout.write(self.style.WARNING('No operational evacuation centres; using random destinations.'))
+            centers = [rnd.randrange(graph.num_nodes) for _ in range(5)]
+        centers = list(dict.fromkeys(centers))
+        queries = [(rnd.randrange(graph.num_nodes), rnd.choice(centers)) for _ in range(options['queries'])]
+
+        t_trees = time.monotonic()
+        tree_builder = {m: ModifiedDijkstraService(risk_multiplier=m) for m in CENTER_TREE_MULTIPLIERS}
+        trees = {
+            (end, m): tree_builder[m].shortest_path_tree(graph, end)
+            for end in centers for m in CENTER_TREE_MULTIPLIERS
+        }
+        t_trees = time.monotonic() - t_trees
+        self.stdout.write(
+            f'\n=== Alternative-routes benchmark ===\n'
+            f'Graph: {graph.num_nodes} nodes, {graph.num_edges} directed edges\n'
+            f'k: {k} (+1 distance-only)  queries: {len(queries)}  centres: {len(centers)}\n'
+            f'Centre trees: {len(trees)} built in {t_trees * 1000:.0f} ms\n'
+        )
+
+        def _run(mode):
+            safe = ModifiedDijkstraService(risk_multiplier=safe_mult)
+            short = ModifiedDijkstraService(risk_multiplier=dist_mult)
+            out = []
+            t0 = time.monotonic()
+            for start, end in queries:
+                if mode == 'searches':
+                    routes = safe.dijkstra_k_routes(graph, start, end, k=k)
+                    routes += short.dijkstra_k_routes(graph, start, end, k=1)
+                elif mode == 'engine-cold':
+                    routes = safe.dijkstra_k_routes(graph, start, end, k=k, tree=safe.shortest_path_tree(graph, end))
+                    routes += short.dijkstra_k_routes(
+                        graph, start, end, k=1, tree=short.shortest_path_tree(graph, end),
+                    )
+                else:
+                    routes = safe.dijkstra_k_routes(graph, start, end, k=k, tree=trees[(end, safe_mult)])
+                    routes += short.dijkstra_k_routes(graph, start, end, k=1, tree=trees[(end, dist_mult)])
+                out.append([(r['path_nodes'], round(r['weight'], 6)) for r in routes])
+            return safe.settled_nodes + short.settled_nodes, time.monotonic() - t0, out
+
+        modes = ('searches', 'engine-cold', 'engine-warm')
+        results = {mode: _run(mode) for mode in modes}
+        base_settled, _, base_routes = results['searches']
+        n = max(1, len(queries))
+        self.stdout.write(
+            f'{"Mode":<13} {"Settled/query":>14} {"vs searches":>12} {"ms/query":>10} '
+            f'{"Identical":>10} {"Same cost":>10}'
+        )
+        self.stdout.write('-' * 74)
+        for mode in modes:
+            settled, elapsed, routes = results[mode]
+            identical = sum(1 for a, b in zip(routes, base_routes) if a == b)
+            same_cost = sum(
+                1 for a, b in zip(routes, base_routes)
+                if [w for _, w in a] == [w for _, w in b]
+            )
+            ratio = settled / base_settled if base_settled else 0.0
+            self.stdout.write(
+                f'{mode:<13} {settled / n:>14.0f} {ratio:>11.0%} '
+                f'{elapsed * 1000 / n:>10.2f} {identical:>6}/{len(queries)} {same_cost:>6}/{len(queries)}'
+            )
+        self.stdout.write('')
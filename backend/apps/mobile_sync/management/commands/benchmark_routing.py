@@ -0,0 +1,116 @@
+"""
+Django management command: benchmark_routing
+
+Compares the single-pair search modes of ModifiedDijkstraService (dijkstra,
+astar, bidirectional, ch) on resident-to-evacuation-centre queries over the
+cached road graph (same effective risks the routing endpoint uses). Contraction
+hierarchy preprocessing and customization times are printed separately.
+
+Residents are sampled uniformly from road-graph nodes; destinations are the
+operational evacuation centres (random nodes when none exist). For every mode it
+prints settled nodes and wall time per query, how many queries returned a route
+set identical to plain Dijkstra, and how many returned a best route of the same
+cost. base_distance is stored to 0.1 m, so equal-cost paths are common; a tie
+resolved differently in the first search also changes the penalised reruns.
+
+Usage:
+    python manage.py benchmark_routing
+    python manage.py benchmark_routing --queries 200 --k 1 --seed 7
+"""
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Benchmark Dijkstra vs A* vs bidirectional vs CH search on resident-to-centre queries.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queries', type=int, default=100, help='Number of resident start points.')
+        parser.add_argument('--k', type=int, default=3, help='Routes per query (penalised reruns).')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for start points.')
+        parser.add_argument(
+            '--risk-multiplier', type=float, default=None,
+            help='Risk multiplier (default: routing default, 150).',
+        )
+
+    def handle(self, *args, **options):
+        from apps.evacuation.models import EvacuationCenter
+        from apps.mobile_sync.services.network_cache import get_network_snapshot
+        from apps.routing.services.dijkstra import (
+            DEFAULT_RISK_MULTIPLIER,
+            SEARCH_DIJKSTRA,
+            SEARCH_MODES,
+            ModifiedDijkstraService,
+        )
+
+        multiplier = options['risk_multiplier']
+        if multiplier is None:
+            multiplier = DEFAULT_RISK_MULTIPLIER
+        rnd = random.Random(options['seed'])
+
+        t0 = time.monotonic()
+        graph = get_network_snapshot().graph
+        if graph.num_nodes == 0:
+            self.stderr.write(self.style.WARNING('No road segments found. Run: python manage.py migrate'))
+            return
+        # Warm the per-graph caches so they are not billed to the first mode.
+        graph.weights(multiplier)
+        graph.heuristic_scale
+        loaded = time.monotonic() - t0
+        t_ch = time.monotonic()
+        hierarchy = graph.contraction_hierarchy
+        t_custom = time.monotonic()
+        graph.ch_metric(multiplier)
+        t_done = time.monotonic()
+        self.stdout.write(
+            f'\n=== Routing search benchmark ===\n'
+            f'Graph: {graph.num_nodes} nodes, {graph.num_edges} directed edges '
+            f'(loaded in {loaded:.2f}s)\n'
+            f'Risk multiplier: {multiplier}  k: {options["k"]}  heuristic scale: {graph.heuristic_scale:.4f}\n'
+            f'Contraction hierarchy: {hierarchy.num_arcs} arcs ({hierarchy.num_shortcuts} shortcuts), '
+            f'preprocessing {(t_custom - t_ch) * 1000:.0f} ms, customization {(t_done - t_custom) * 1000:.0f} ms\n'
+        )
+
+        centers = [
+            graph.nearest_node(float(ec.latitude), float(ec.longitude))
+            for ec in EvacuationCenter.objects.filter(is_operational=True)
+        ]
+        if not centers:
+            self.stdout.write(self.style.WARNING('No operational evacuation centres; using random destinations.'))
+        queries = [
+            (rnd.randrange(graph.num_nodes), rnd.choice(centers) if centers else rnd.randrange(graph.num_nodes))
+            for _ in range(options['queries'])
+        ]
+
+        results = {}
+        for mode in SEARCH_MODES:
+            service = ModifiedDijkstraService(risk_multiplier=multiplier, search_mode=mode)
+            routes = []
+            t_mode = time.monotonic()
+            for start, end in queries:
+                found = service.dijkstra_k_routes(graph, start, end, k=options['k'])
+                routes.append([(r['path_nodes'], r['weight']) for r in found])
+            results[mode] = (service.settled_nodes, time.monotonic() - t_mode, routes)
+
+        base_settled, base_time, base_routes = results[SEARCH_DIJKSTRA]
+        n = max(1, len(queries))
+        self.stdout.write(
+            f'{"Mode":<15} {"Settled/query":>14} {"vs Dijkstra":>12} {"ms/query":>10} '
+            f'{"Identical":>10} {"Same cost":>10}'
+        )
+        self.stdout.write('-' * 76)
+        for mode in SEARCH_MODES:
+            settled, elapsed, routes = results[mode]
+            identical = sum(1 for a, b in zip(routes, base_routes) if a == b)
+            same_cost = sum(
+                1 for a, b in zip(routes, base_routes)
+                if [w for _, w in a[:1]] == [w for _, w in b[:1]]
+            )
+            ratio = settled / base_settled if base_settled else 0.0
+            self.stdout.write(
+                f'{mode:<15} {settled / n:>14.0f} {ratio:>11.0%} '
+                f'{elapsed * 1000 / n:>10.2f} {identical:>6}/{len(queries)} {same_cost:>6}/{len(queries)}'
+            )
+        self.stdout.write('')
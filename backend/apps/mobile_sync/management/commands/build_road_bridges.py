@@ -0,0 +1,30 @@
+"""
+Django management command: build_road_bridges
+
+Computes the gap-bridging edges of the current road network and stores them
+as the RoadBridgeSet for its road_network_version (network_cache.store_bridges).
+Route and layer requests only read that row.
+
+Run this after:
+  - Loading or reseeding the road network (load_mock_data runs it)
+  - Every deploy (render.yaml build step, after migrate)
+
+Usage:
+    python manage.py build_road_bridges
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Compute and store the road-network gap bridges for the current road network version.'
+
+    def handle(self, *args, **options):
+        from apps.mobile_sync.services.network_cache import store_bridges
+
+        t0 = time.monotonic()
+        count = store_bridges()
+        self.stdout.write(self.style.SUCCESS(
+            f'Stored {count} road bridges in {time.monotonic() - t0:.1f}s.'
+        ))
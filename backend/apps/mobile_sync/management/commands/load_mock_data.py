@@ -7,6 +7,7 @@ Usage:
 TO REPLACE WITH REAL MDRRMO DATA:
   Remove or replace this command with: import from MDRRMO CSV/API, then run risk prediction.
 """
+from django.core.management import call_command
 from django.core.management.base import BaseCommand
 from core.utils.mock_loader import load_baseline_hazards, load_road_network
 from apps.routing.models import RoadSegment
@@ -40,3 +41,4 @@ class Command(BaseCommand):
                 seg.save(update_fields=['predicted_risk_score'])
                 updated += 1
         self.stdout.write(self.style.SUCCESS(f'Updated {updated} segment risk scores.'))
+        call_command('build_road_bridges', stdout=self.stdout)
@@ -0,0 +1,175 @@
+"""
+Batch reachability: best route from many origins to one or more evacuation centres.
+
+Evacuation planning needs every household cluster or barangay evaluated against
+every centre. Instead of one calculate-route request per pair (each paying for
+the snapshot lookup, k penalised reruns and hazard diagnostics), route_batch
+takes the cached graph once and runs, per origin, one risk-weighted and one
+distance-only one-to-many search to all centres. The route reported per centre
+is the one calculate_safest_routes(k=1) would rank first (_best_center_route).
+
+With workers > 1 (manage.py batch_routes only; the HTTP endpoint never forks)
+origins are fanned out over a fork-based process pool; the
+workers inherit the graph and its cached weight arrays from the parent (pool
+initializer arguments are not pickled under fork) and never touch the database.
+Rows are yielded in origin order as soon as they are ready, so callers can
+stream them (NDJSON) without holding the whole result.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional
+
+from django.db.models import Q
+
+from apps.evacuation.models import EvacuationCenter
+from apps.hazards import barangay_boundaries
+from apps.hazards.models import HazardReport
+from apps.mobile_sync.services.network_cache import CENTER_TREE_MULTIPLIERS, get_network_snapshot
+from apps.mobile_sync.services.route_service import HIGH_RISK_THRESHOLD, _best_center_route
+from apps.routing.services import ModifiedDijkstraService
+from apps.users.barangay_utils import canonical_barangay, canonical_municipality, normalize_barangay_label
+from core.utils import polyline
+from core.utils.geo import haversine_meters
+
+# Per-worker state, set by _init_worker in each pool process: (graph, centers, include_polyline).
+_worker_state = None
+
+
+def resolve_barangay_origins(barangays: Iterable[str], municipality: str = '') -> List[dict]:
+    """
+    Origins for barangay names. Labels are canonicalised through barangay_utils
+    (within municipality when given). When the barangay boundary polygons are
+    loaded (barangay_boundaries), each barangay is placed at the area centroid
+    of its polygons (source 'boundary'). Otherwise, or for a barangay with no
+    polygon, it is placed at the mean position of the geotagged records filed
+    under it: evacuation centres and non-deleted hazard reports (source
+    'records', resolved_from = record count). Barangays with neither get an
+    'error' instead of coordinates.
+    """
+    muni = canonical_municipality(municipality) if municipality else None
+    index = barangay_boundaries.get_index()
+    origins = []
+    for raw in barangays:
+        label = (canonical_barangay(raw, muni) if muni else None) or normalize_barangay_label(raw)
+        origin = {'id': label, 'barangay': label}
+        if muni:
+            origin['municipality'] = muni
+        centroid = index.centroid(label, muni or '') if index is not None else None
+        if centroid is not None:
+            origin['lat'] = round(centroid[0], 7)
+            origin['lng'] = round(centroid[1], 7)
+            origin['source'] = 'boundary'
+            origins.append(origin)
+            continue
+        centers = EvacuationCenter.objects.filter(barangay__iexact=label)
+        reports = HazardReport.objects.filter(location_barangay__iexact=label, is_deleted=False)
+        if muni:
+            centers = centers.filter(municipality__iexact=muni)
+            reports = reports.filter(Q(location_municipality__iexact=muni) | Q(location_municipality=''))
+        points = [
+            (float(lat), float(lng))
+            for lat, lng in list(centers.values_list('latitude', 'longitude'))
+            + list(reports.values_list('latitude', 'longitude'))
+        ]
+        if points:
+            origin['lat'] = round(sum(p[0] for p in points) / len(points), 7)
+            origin['lng'] = round(sum(p[1] for p in points) / len(points), 7)
+            origin['resolved_from'] = len(points)
+            origin['source'] = 'records'
+        else:
+            origin['error'] = 'No geotagged evacuation centre or hazard report for this barangay.'
+        origins.append(origin)
+    return origins
+
+
+def _init_worker(graph, centers, include_polyline) -> None:
+    global _worker_state
+    _worker_state = (graph, centers, include_polyline)
+
+
+def _worker_route(origin: dict) -> List[dict]:
+    return _route_origin(origin, *_worker_state)
+
+
+def _route_origin(origin: dict, graph, centers: List[tuple], include_polyline: bool) -> List[dict]:
+    """One row per centre (id, name, lat, lng) for a single origin."""
+    base = {k: v for k, v in origin.items() if k not in ('lat', 'lng')}
+    base['origin_id'] = base.pop('id', None)
+    if 'error' in origin:
+        return [base]
+    lat, lng = float(origin['lat']), float(origin['lng'])
+    base['origin_lat'] = lat
+    base['origin_lng'] = lng
+    node = graph.nearest_node(lat, lng)
+    base['snap_distance_m'] = round(haversine_meters(lat, lng, *graph.coords(node)), 1) if node is not None else None
+    destinations = [(c_lat, c_lng) for _, _, c_lat, c_lng in centers]
+    safe_mult, dist_mult = CENTER_TREE_MULTIPLIERS
+    safest = ModifiedDijkstraService(risk_multiplier=safe_mult).get_routes_to_many_on_graph(
+        graph, lat, lng, destinations,
+    )
+    shortest = ModifiedDijkstraService(risk_multiplier=dist_mult).get_routes_to_many_on_graph(
+        graph, lat, lng, destinations,
+    )
+    rows = []
+    for (center_id, center_name, _, _), safe, short in zip(centers, safest, shortest):
+        row = dict(base, center_id=center_id, center_name=center_name)
+        best = _best_center_route(safe, short)
+        if best is None:
+            row.update(reachable=False, has_safe_route=False, total_risk=None, risk_level=None, total_distance=None)
+        else:
+            risk = float(best.get('total_risk') or 0.0)
+            row.update(
+                reachable=True,
+                has_safe_route=risk < HIGH_RISK_THRESHOLD,
+                total_risk=round(risk, 4),
+                risk_level=best.get('risk_level'),
+                total_distance=round(float(best.get('total_distance') or 0.0), 1),
+            )
+            if include_polyline:
+                row['polyline'] = polyline.encode(best.get('path') or [])
+        rows.append(row)
+    return rows
+
+
+def route_batch(
+    origins: List[dict],
+    center_ids: Optional[List[int]] = None,
+    workers: int = 1,
+    include_polyline: bool = False,
+) -> Iterator[dict]:
+    """
+    Yield one row per (origin, centre): origin fields, center_id / center_name,
+    reachable, has_safe_route, total_risk, risk_level, total_distance (m),
+    snap_distance_m and, with include_polyline, the route as an encoded polyline.
+    origins are dicts with lat, lng and an optional id (default: list index);
+    other keys are copied to every row. center_ids defaults to every operational centre.
+    """
+    qs = EvacuationCenter.objects.filter(is_operational=True)
+    if center_ids is not None:
+        qs = qs.filter(pk__in=center_ids)
+    centers = [(ec.id, ec.name, float(ec.latitude), float(ec.longitude)) for ec in qs.order_by('id')]
+    graph = get_network_snapshot().graph
+    # Warm the per-multiplier weight arrays so forked workers share them.
+    for mult in CENTER_TREE_MULTIPLIERS:
+        graph.weights(mult)
+
+    origins = [dict(o, id=o.get('id', i)) for i, o in enumerate(origins)]
+    if not centers or graph.num_nodes == 0:
+        reason = 'No operational evacuation centres.' if not centers else 'Road network data is not loaded.'
+        for o in origins:
+            yield {'origin_id': o['id'], 'error': reason}
+        return
+
+    if workers > 1 and len(origins) > 1 and 'fork' in multiprocessing.get_all_start_methods():
+        chunksize = max(1, len(origins) // (workers * 8))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context('fork'),
+            initializer=_init_worker,
+            initargs=(graph, centers, include_polyline),
+        ) as pool:
+            for rows in pool.map(_worker_route, origins, chunksize=chunksize):
+                yield from rows
+    else:
+        for origin in origins:
+            yield from _route_origin(origin, graph, centers, include_polyline)
@@ -0,0 +1,184 @@
+"""
+Reachability isochrones per evacuation centre.
+
+For each operational centre one bounded Dijkstra from the centre's road node
+settles every node within the largest requested budget; each budget is then a
+threshold on those distances. Two metrics are supported:
+
+  distance : road metres (risk multiplier 0) — independent of hazards
+  cost     : risk-weighted metres, base_distance + risk × DEFAULT_RISK_MULTIPLIER,
+             the cost the safest-route search minimises
+
+Each budget is reported as a convex-hull polygon (an outer bound, for display)
+and a bitmap over road segments in road-risk-layer/geometry/ row order (bit i set
+when both ends of segment i are within budget), so clients that already hold the
+geometry can draw exact coverage and gaps. Graph node ids are internal to one
+process and are not exposed.
+
+Refresh is incremental: the settled distances are cached per (centre node,
+metric) across snapshots. Distance isochrones are reused until the road network
+changes. When only the hazard state changes, a centre's cost isochrone is
+recomputed only if a segment whose risk changed touches a node it settled; a
+path that leaves the settled region already exceeds the budget, so changes
+outside it cannot alter anything inside.
+"""
+import base64
+import json
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from apps.evacuation.models import EvacuationCenter
+from apps.mobile_sync.services.network_cache import NetworkSnapshot, _fingerprint
+from apps.routing.services import ModifiedDijkstraService
+from apps.routing.services.dijkstra import DEFAULT_RISK_MULTIPLIER
+from core.utils.geo import convex_hull
+
+METRIC_DISTANCE = 'distance'
+METRIC_COST = 'cost'
+METRIC_MULTIPLIERS = {METRIC_DISTANCE: 0.0, METRIC_COST: DEFAULT_RISK_MULTIPLIER}
+
+_lock = threading.Lock()
+# (centre node, multiplier) -> _Reach
+_reach: Dict[tuple, '_Reach'] = {}
+# (road_version, old hazard_version, new hazard_version) -> nodes touching a changed segment
+_changed_nodes: Dict[tuple, frozenset] = {}
+_stats = {'computed': 0, 'reused': 0}
+
+
+class _Reach:
+    """Settled distances (<= budget) from one centre node for one graph state."""
+
+    __slots__ = ('road_version', 'hazard_version', 'und_risk', 'budget', 'dist')
+
+    def __init__(self, road_version, hazard_version, und_risk, budget, dist):
+        self.road_version = road_version
+        self.hazard_version = hazard_version
+        self.und_risk = und_risk
+        self.budget = budget
+        self.dist = dist
+
+
+def _nodes_touching_changes(snap: NetworkSnapshot, old: _Reach) -> frozenset:
+    key = (snap.road_version, old.hazard_version, snap.hazard_version)
+    nodes = _changed_nodes.get(key)
+    if nodes is None:
+        graph = snap.graph
+        changed = set()
+        for i, (a, b) in enumerate(zip(old.und_risk, graph.und_risk)):
+            if a != b:
+                changed.add(graph.und_u[i])
+                changed.add(graph.und_v[i])
+        nodes = frozenset(changed)
+        with _lock:
+            if len(_changed_nodes) > 64:
+                _changed_nodes.clear()
+            _changed_nodes[key] = nodes
+    return nodes
+
+
+def center_reach(snap: NetworkSnapshot, root: int, multiplier: float, budget: float) -> Dict[int, float]:
+    """{node: distance} for every node within budget of root, reusing earlier searches when valid."""
+    graph = snap.graph
+    key = (root, float(multiplier))
+    with _lock:
+        entry = _reach.get(key)
+    if entry is not None and entry.road_version == snap.road_version and entry.budget >= budget:
+        if multiplier == 0.0 or entry.hazard_version == snap.hazard_version:
+            with _lock:
+                _stats['reused'] += 1
+            return entry.dist
+        if len(graph.und_risk) == len(entry.und_risk):
+            touched = _nodes_touching_changes(snap, entry)
+            if not any(node in entry.dist for node in touched):
+                with _lock:
+                    _reach[key] = _Reach(
+                        snap.road_version, snap.hazard_version, graph.und_risk, entry.budget, entry.dist,
+                    )
+                    _stats['reused'] += 1
+                return entry.dist
+    dist = ModifiedDijkstraService(risk_multiplier=multiplier).bounded_search(graph, root, budget)
+    with _lock:
+        _reach[key] = _Reach(snap.road_version, snap.hazard_version, graph.und_risk, budget, dist)
+        _stats['computed'] += 1
+    return dist
+
+
+def _segment_bitmap(graph, segment_count: int, dist: Dict[int, float], budget: float):
+    bits = bytearray((segment_count + 7) // 8)
+    covered = 0
+    und_u, und_v = graph.und_u, graph.und_v
+    for i in range(segment_count):
+        du = dist.get(und_u[i])
+        if du is not None and du <= budget:
+            dv = dist.get(und_v[i])
+            if dv is not None and dv <= budget:
+                bits[i >> 3] |= 1 << (i & 7)
+                covered += 1
+    return base64.b64encode(bytes(bits)).decode('ascii'), covered
+
+
+def center_isochrone(snap: NetworkSnapshot, center, metric: str, budgets: Sequence[float]) -> dict:
+    """Isochrone entry for one EvacuationCenter (see module docstring)."""
+    graph = snap.graph
+    root = graph.nearest_node(float(center.latitude), float(center.longitude))
+    entry = {'center_id': center.id, 'center_name': center.name, 'budgets': []}
+    dist = center_reach(snap, root, METRIC_MULTIPLIERS[metric], max(budgets)) if root is not None else {}
+    for budget in budgets:
+        nodes = [node for node, d in dist.items() if d <= budget]
+        bitmap, covered = _segment_bitmap(graph, len(snap.segments), dist, budget)
+        entry['budgets'].append({
+            'budget': budget,
+            'node_count': len(nodes),
+            'segment_count': covered,
+            'polygon': [[round(lat, 6), round(lng, 6)] for lat, lng in convex_hull(graph.coords(n) for n in nodes)],
+            'segments': bitmap,
+        })
+    return entry
+
+
+def isochrones_version(snap: NetworkSnapshot, metric: str, budgets: Sequence[float], center_version: str) -> str:
+    """ETag version: distance isochrones ignore the hazard state."""
+    network = snap.road_version if metric == METRIC_DISTANCE else snap.version
+    return f'{network}.{_fingerprint(center_version, metric, tuple(budgets))}'
+
+
+def isochrones_json(
+    snap: NetworkSnapshot, metric: str, budgets: Sequence[float], center_ids: Optional[List[int]] = None,
+) -> bytes:
+    """Serialized isochrones for every operational centre (or the given ids)."""
+    centers = EvacuationCenter.objects.filter(is_operational=True).order_by('id')
+    if center_ids is not None:
+        centers = centers.filter(pk__in=center_ids)
+    body = {
+        'road_version': snap.road_version,
+        'metric': metric,
+        'budgets': list(budgets),
+        'segment_count': len(snap.segments),
+        'centers': [center_isochrone(snap, ec, metric, budgets) for ec in centers] if snap.segments else [],
+    }
+    if metric == METRIC_COST:
+        body['risk_layer_version'] = snap.version
+    return json.dumps(body, separators=(',', ':')).encode('utf-8')
+
+
+def warm_isochrones(snap: NetworkSnapshot, budgets: Sequence[float]) -> None:
+    """Refresh both metrics for every operational centre (network_cache.warm_snapshot)."""
+    if not snap.segments:
+        return
+    graph = snap.graph
+    for lat, lng in EvacuationCenter.objects.filter(is_operational=True).values_list('latitude', 'longitude'):
+        root = graph.nearest_node(float(lat), float(lng))
+        if root is not None:
+            for multiplier in METRIC_MULTIPLIERS.values():
+                center_reach(snap, root, multiplier, max(budgets))
+
+
+def invalidate() -> None:
+    with _lock:
+        _reach.clear()
+        _changed_nodes.clear()
+
+
+def stats() -> dict:
+    with _lock:
+        return dict(_stats, entries=len(_reach))
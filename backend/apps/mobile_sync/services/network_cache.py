@@ -0,0 +1,623 @@
+"""
+Process-wide road graph cache for route calculation.
+
+Building the routing graph — fetch every RoadSegment, compute effective risk
+against every approved hazard, build the adjacency list and bridge OSM gaps —
+costs more than the Dijkstra search itself. The bridge edges depend only on
+geometry; they are computed and stored per road-network version (RoadBridgeSet)
+by manage.py build_road_bridges and only read here. A NetworkSnapshot holds all of that
+and is reused by every route request until the road network or the approved
+hazard set changes.
+
+The same snapshot is the single effective-risk snapshot for the read endpoints:
+per-segment risks, the high / moderate / low histogram, the serialized road-risk
+layer and the high-risk-roads list are all derived from it once per version, so
+dashboard refreshes and route requests never recompute network-wide risk.
+Shortest-path trees rooted at each operational evacuation centre are kept per
+snapshot (center_tree), so a route request reads its primary route by walking
+parent pointers and runs its alternatives as tree-guided searches.
+Snapshots, trees and hierarchies live in process memory, so each web process
+warms its own: start_warmup() (config.wsgi / config.asgi) runs one daemon
+thread that rebuilds the snapshot, the centre trees, the isochrones and (search
+mode 'ch') the contraction hierarchy whenever this process sees a new version,
+and re-checks every ROUTING_WARM_POLL_SECONDS so hazard changes made through
+another process are picked up before the next request. Processes without the
+thread (management commands, run_jobs) build what they need on first use.
+A short history of recent layer versions lets clients fetch only the segments
+whose risk changed since the version they hold (risk_layer_delta); it is kept
+in RiskLayerVersion so every worker process can answer against a version
+another worker served.
+
+Staleness is detected with two cheap aggregate fingerprints, so every worker
+process notices a change made by another worker on its very next request:
+  road_network_version : segment count / max id / latest last_updated / geometry sums
+  hazard_state_version : approved, non-deleted hazards (per hazard type) + the RF base scores they produced
+"""
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models import Count, Max, Sum
+
+from apps.hazards.models import HazardReport
+from apps.mobile_sync.services import route_metrics
+from apps.routing.models import RiskLayerVersion, RoadSegment
+from apps.routing.services import ModifiedDijkstraService
+from apps.routing.services.dijkstra import DEFAULT_RISK_MULTIPLIER, SEARCH_CH
+from core.utils.geo import haversine_meters
+from core.utils.spatial import GridIndex
+
+logger = logging.getLogger(__name__)
+
+# Effective-risk colour bands shared by the map, dashboard and analytics.
+HIGH_RISK_MIN = 0.70
+MODERATE_RISK_MIN = 0.30
+# Route responses embed only segments above this risk; the layer shows all of them.
+ROUTE_RISK_SEGMENT_MIN = 0.05
+# Floor applied to layer risks so zero-risk roads are still drawn (green).
+LAYER_DISPLAY_MIN = 0.04
+# Risk multipliers calculate_safest_routes searches with (safest, distance-only).
+CENTER_TREE_MULTIPLIERS = (DEFAULT_RISK_MULTIPLIER, 0.0)
+
+_snapshot_lock = threading.Lock()
+# This process's warm-up thread (start_warmup) and the event that wakes it.
+_warm_event = threading.Event()
+_warm_thread = None
+_warm_lock = threading.Lock()
+# Bridges found in memory for a road version with no RoadBridgeSet row yet.
+_unstored_bridges: dict = {}
+_snapshot = None
+_midpoint_index = None  # (road_version, segment_ids, GridIndex)
+_hierarchy = None  # ContractionHierarchy of the latest graph topology (search mode 'ch')
+# Recent layer versions -> (road_version, {segment_id: layer risk}) for delta
+# responses; a per-process cache of the RiskLayerVersion rows.
+_layer_history: 'OrderedDict[str, tuple]' = OrderedDict()
+LAYER_HISTORY_SIZE = 32
+
+
+def _fingerprint(*parts) -> str:
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def road_network_version() -> str:
+    """Fingerprint of road geometry; unchanged by risk-score bulk updates."""
+    agg = RoadSegment.objects.aggregate(
+        n=Count('id'),
+        max_id=Max('id'),
+        updated=Max('last_updated'),
+        lat_sum=Sum('start_lat'),
+        lng_sum=Sum('end_lng'),
+        dist_sum=Sum('base_distance'),
+    )
+    return _fingerprint(
+        agg['n'], agg['max_id'], agg['updated'],
+        agg['lat_sum'], agg['lng_sum'], agg['dist_sum'],
+    )
+
+
+def hazard_state_version() -> str:
+    """
+    Fingerprint of everything that feeds effective segment risk besides geometry:
+    the approved, non-deleted hazard set and the RF base scores derived from it.
+    Sums are grouped by hazard_type, since risk is weighted by type: re-typing a
+    hazard moves its id between groups and changes the fingerprint.
+    """
+    hz = (
+        HazardReport.objects.filter(
+            status=HazardReport.Status.APPROVED,
+            is_deleted=False,
+        )
+        .values('hazard_type')
+        .annotate(
+            n=Count('id'),
+            max_id=Max('id'),
+            id_sum=Sum('id'),
+            lat_sum=Sum('latitude'),
+            lng_sum=Sum('longitude'),
+            score_sum=Sum('final_validation_score'),
+        )
+        .order_by('hazard_type')
+    )
+    by_type = tuple(
+        (row['hazard_type'], row['n'], row['max_id'], row['id_sum'],
+         row['lat_sum'], row['lng_sum'], row['score_sum'])
+        for row in hz
+    )
+    base = RoadSegment.objects.aggregate(risk_sum=Sum('predicted_risk_score'))
+    return _fingerprint(by_type, base['risk_sum'])
+
+
+class NetworkSnapshot:
+    """
+    Immutable view of the road network for one (road, hazard) version pair.
+
+    segments carry effective_risk (computed once here, also kept as the risks
+    list); the bridged graph and the derived response payloads are built lazily
+    on first use and then shared by all requests and risk multipliers.
+    """
+
+    def __init__(self, road_version: str, hazard_version: str, segments: list, approved_hazards: list):
+        from apps.mobile_sync.services.route_service import calculate_segment_risks
+
+        self.road_version = road_version
+        self.hazard_version = hazard_version
+        self.segments = segments
+        self.approved_hazards = approved_hazards
+        with route_metrics.timer('risk'):
+            self.risks = calculate_segment_risks(segments, approved_hazards)
+        for seg, risk in zip(segments, self.risks):
+            seg.effective_risk = risk
+        high = moderate = 0
+        for risk in self.risks:
+            if risk >= HIGH_RISK_MIN:
+                high += 1
+            elif risk >= MODERATE_RISK_MIN:
+                moderate += 1
+        self.risk_counts = (high, moderate, len(self.risks) - high - moderate)
+        self._graph = None
+        self._graph_lock = threading.Lock()
+        self._payloads: dict = {}
+        # (root node, risk multiplier) -> ShortestPathTree; roots already claimed by a build.
+        self.center_trees: dict = {}
+        self._tree_roots: set = set()
+        self._trees_requested = False
+
+    @property
+    def version(self) -> str:
+        return f'{self.road_version}.{self.hazard_version}'
+
+    @property
+    def graph(self):
+        """Return the bridged RoadGraph, building it once; per-multiplier weights are cached on it."""
+        cached = self._graph
+        if cached is not None:
+            return cached
+        with self._graph_lock:
+            if self._graph is None:
+                graph = bridged_graph(self.road_version, self.segments)
+                if settings.ROUTING_SEARCH_MODE == SEARCH_CH:
+                    _attach_hierarchy(graph)
+                self._graph = graph
+        return self._graph
+
+    def _payload(self, name: str, build):
+        cached = self._payloads.get(name)
+        if cached is None:
+            with self._graph_lock:
+                cached = self._payloads.get(name)
+                if cached is None:
+                    cached = build()
+                    self._payloads[name] = cached
+        return cached
+
+    @property
+    def route_risk_segments(self) -> list:
+        """Compact {s, e, r} entries for segments with risk > 0.05, embedded in route responses."""
+        return self._payload('route_risk_segments', lambda: [
+            {
+                's': [float(seg.start_lat), float(seg.start_lng)],
+                'e': [float(seg.end_lat), float(seg.end_lng)],
+                'r': round(risk, 3),
+            }
+            for seg, risk in zip(self.segments, self.risks)
+            if risk > ROUTE_RISK_SEGMENT_MIN
+        ])
+
+    @property
+    def layer_risks(self) -> list:
+        """Per-segment risk as drawn on the layer: floored at 0.04, rounded to 3 places."""
+        return self._payload('layer_risks', lambda: [
+            round(max(risk, LAYER_DISPLAY_MIN), 3) for risk in self.risks
+        ])
+
+    def _build_risk_layer(self) -> bytes:
+        layer = [
+            {
+                's': [float(seg.start_lat), float(seg.start_lng)],
+                'e': [float(seg.end_lat), float(seg.end_lng)],
+                'r': risk,
+            }
+            for seg, risk in zip(self.segments, self.layer_risks)
+        ]
+        body = {'road_risk_segments': layer, 'segment_count': len(self.segments), 'version': self.version}
+        return json.dumps(body, separators=(',', ':')).encode('utf-8')
+
+    @property
+    def risk_layer_json(self) -> bytes:
+        """Serialized road-risk-layer body: every segment, risk floored at 0.04."""
+        return self._payload('risk_layer_json', self._build_risk_layer)
+
+    def _build_geometry(self) -> bytes:
+        body = {
+            'road_version': self.road_version,
+            'segment_count': len(self.segments),
+            # [id, start_lat, start_lng, end_lat, end_lng]
+            'segments': [
+                [seg.id, float(seg.start_lat), float(seg.start_lng), float(seg.end_lat), float(seg.end_lng)]
+                for seg in self.segments
+            ],
+        }
+        return json.dumps(body, separators=(',', ':')).encode('utf-8')
+
+    @property
+    def geometry_json(self) -> bytes:
+        """Serialized segment geometry; changes only with road_version."""
+        return self._payload('geometry_json', self._build_geometry)
+
+    def _build_high_risk_roads(self) -> list:
+        hazards = [(h, float(h.latitude), float(h.longitude)) for h in self.approved_hazards]
+        result = []
+        for seg, risk in zip(self.segments, self.risks):
+            if risk < MODERATE_RISK_MIN:
+                continue
+            mid_lat = (float(seg.start_lat) + float(seg.end_lat)) / 2
+            mid_lng = (float(seg.start_lng) + float(seg.end_lng)) / 2
+
+            # Nearest approved hazard causing this elevation
+            nearest = None
+            nearest_dist = float('inf')
+            for h, h_lat, h_lng in hazards:
+                d = haversine_meters(mid_lat, mid_lng, h_lat, h_lng)
+                if d < nearest_dist:
+                    nearest_dist = d
+                    nearest = h
+
+            entry = {
+                'id': seg.id,
+                'start_lat': float(seg.start_lat),
+                'start_lng': float(seg.start_lng),
+                'end_lat': float(seg.end_lat),
+                'end_lng': float(seg.end_lng),
+                'risk_score': round(risk, 3),
+                'risk_level': 'high' if risk >= HIGH_RISK_MIN else 'moderate',
+            }
+            if nearest:
+                entry['nearest_hazard'] = {
+                    'type': nearest.hazard_type,
+                    'distance_m': round(nearest_dist),
+                    'barangay': nearest.user.barangay if nearest.user else '',
+                }
+            result.append(entry)
+        result.sort(key=lambda x: x['risk_score'], reverse=True)
+        return result
+
+    @property
+    def high_risk_roads(self) -> list:
+        """Segments with risk >= 0.30 (highest first) with their nearest approved hazard."""
+        return self._payload('high_risk_roads', self._build_high_risk_roads)
+
+
+def _apply_stored_bridges(graph, edges: list):
+    """Resolve stored [from_key, to_key, distance] bridges to node ids, or None if any no longer matches."""
+    bridges = []
+    for from_key, to_key, distance in edges:
+        ids = []
+        for key in (from_key, to_key):
+            lat, lng = (float(x) for x in key.split(','))
+            node = graph.nearest_node(lat, lng)
+            if node is None or graph.key(node) != key:
+                return None
+            ids.append(node)
+        bridges.append((ids[0], ids[1], float(distance), ModifiedDijkstraService.BRIDGE_RISK))
+    return bridges
+
+
+def _bridge_edges(graph) -> list:
+    """Find the gap-bridging edges of graph as stored [from_key, to_key, distance] triples."""
+    return [[graph.key(u), graph.key(v), dist] for u, v, dist, _ in ModifiedDijkstraService()._find_bridges(graph)]
+
+
+def store_bridges() -> int:
+    """
+    Compute the bridges of the current road network and store them as the
+    RoadBridgeSet for its road_network_version, dropping rows of older versions.
+    Run wherever the road network changes (manage.py build_road_bridges, called by
+    load_mock_data and the deploy build); request paths only read the row.
+    Returns the number of bridges stored.
+    """
+    from apps.routing.models import RoadBridgeSet
+
+    road_version = road_network_version()
+    graph = ModifiedDijkstraService().build_graph(list(RoadSegment.objects.all()))
+    edges = _bridge_edges(graph)
+    with transaction.atomic():
+        RoadBridgeSet.objects.exclude(road_version=road_version).delete()
+        RoadBridgeSet.objects.update_or_create(road_version=road_version, defaults={'edges': edges})
+    _unstored_bridges.clear()
+    return len(edges)
+
+
+def bridged_graph(road_version: str, segments: list):
+    """
+    Build the RoadGraph for segments and append the gap-bridging edges. Bridges
+    depend only on geometry: they are stored per road_version by store_bridges()
+    and re-applied here with one node lookup per bridge instead of a component
+    search. Without a matching row (roads changed but build_road_bridges has not
+    run yet) the bridges are found in memory for this process only — nothing is
+    written from the request path.
+    """
+    from apps.routing.models import RoadBridgeSet
+
+    service = ModifiedDijkstraService()
+    with route_metrics.timer('graph_build'):
+        graph = service.build_graph(segments)
+    t0 = time.perf_counter()
+    stored = RoadBridgeSet.objects.filter(road_version=road_version).values_list('edges', flat=True).first()
+    if stored is None:
+        stored = _unstored_bridges.get(road_version)
+    bridges = _apply_stored_bridges(graph, stored) if stored is not None else None
+    if bridges is None:
+        logger.warning(
+            'No stored bridges for road network %s; run manage.py build_road_bridges', road_version,
+        )
+        edges = _bridge_edges(graph)
+        _unstored_bridges.clear()
+        _unstored_bridges[road_version] = edges
+        bridges = _apply_stored_bridges(graph, edges)
+    graph = graph.with_extra_edges(bridges)
+    route_metrics.record('bridge', time.perf_counter() - t0)
+    return graph
+
+
+def _attach_hierarchy(graph) -> None:
+    """
+    Give graph the contraction hierarchy of its topology: reuse the one built for
+    the previous snapshot when the topology is unchanged (hazard changes only
+    re-customize weights), otherwise preprocess once and keep it for later snapshots.
+    """
+    global _hierarchy
+    if not graph.attach_hierarchy(_hierarchy):
+        _hierarchy = graph.contraction_hierarchy
+
+
+def _build_snapshot(road_version: str, hazard_version: str) -> NetworkSnapshot:
+    from apps.mobile_sync.services.route_service import _get_approved_hazards
+
+    with route_metrics.timer('fetch'):
+        segments = list(RoadSegment.objects.all())
+        approved_hazards = _get_approved_hazards()
+    return NetworkSnapshot(road_version, hazard_version, segments, approved_hazards)
+
+
+def get_network_snapshot() -> NetworkSnapshot:
+    """
+    Return the current NetworkSnapshot, rebuilding it only when the road network
+    or the approved-hazard state has changed since the last build.
+    """
+    global _snapshot
+    road_v = road_network_version()
+    hazard_v = hazard_state_version()
+    snap = _snapshot
+    if snap is not None and snap.road_version == road_v and snap.hazard_version == hazard_v:
+        return snap
+    with _snapshot_lock:
+        snap = _snapshot
+        if snap is None or snap.road_version != road_v or snap.hazard_version != hazard_v:
+            snap = _build_snapshot(road_v, hazard_v)
+            _snapshot = snap
+            _remember_layer(snap)
+            request_warmup()
+    return snap
+
+
+def center_tree(snap: NetworkSnapshot, lat: float, lng: float, risk_multiplier: float):
+    """
+    Return the snapshot's ShortestPathTree rooted at the node nearest (lat, lng)
+    for risk_multiplier (None only for an empty graph).
+
+    A miss builds just that tree inline — about the cost of the on-demand k-route
+    search it replaces (benchmark_alternatives) — so calculate_safest_routes always
+    answers from the same tree-driven engine, whether or not the warm-up has run.
+    The first miss on a snapshot for a root no build has claimed (new or moved
+    centre) also wakes this process's warm-up thread for the other centres.
+    """
+    root = snap.graph.nearest_node(lat, lng)
+    if root is None:
+        return None
+    key = (root, float(risk_multiplier))
+    tree = snap.center_trees.get(key)
+    if tree is not None:
+        return tree
+    if root not in snap._tree_roots and not snap._trees_requested:
+        snap._trees_requested = True
+        request_warmup()
+    tree = ModifiedDijkstraService(risk_multiplier=risk_multiplier).shortest_path_tree(snap.graph, root)
+    snap.center_trees[key] = tree
+    return tree
+
+
+def ensure_center_trees(snap: NetworkSnapshot) -> None:
+    """Build trees (both routing multipliers) for operational centres not yet built on snap."""
+    from apps.evacuation.models import EvacuationCenter
+
+    graph = snap.graph
+    roots = []
+    for lat, lng in EvacuationCenter.objects.filter(is_operational=True).values_list('latitude', 'longitude'):
+        root = graph.nearest_node(float(lat), float(lng))
+        if root is not None:
+            roots.append(root)
+    with snap._graph_lock:
+        roots = [r for r in dict.fromkeys(roots) if r not in snap._tree_roots]
+        snap._tree_roots.update(roots)
+    if roots:
+        build_center_trees(snap, roots)
+
+
+def warm_snapshot() -> NetworkSnapshot:
+    """
+    Bring this process's caches up to date: the current snapshot with its graph
+    (and contraction hierarchy in search mode 'ch'), the trees of every
+    operational centre and their isochrones.
+    """
+    from apps.mobile_sync.services.isochrones import warm_isochrones
+
+    snap = get_network_snapshot()
+    ensure_center_trees(snap)
+    warm_isochrones(snap, settings.ISOCHRONE_BUDGETS_M)
+    return snap
+
+
+def _warm_loop() -> None:
+    poll = settings.ROUTING_WARM_POLL_SECONDS
+    while True:
+        _warm_event.wait(poll if poll > 0 else None)
+        _warm_event.clear()
+        close_old_connections()
+        try:
+            warm_snapshot()
+        except Exception:
+            logger.exception('Network warm-up failed')
+        finally:
+            close_old_connections()
+
+
+def start_warmup() -> None:
+    """
+    Start this process's warm-up thread and have it warm once. Called by the web
+    entry points (config.wsgi / config.asgi); other processes never start it.
+    """
+    global _warm_thread
+    with _warm_lock:
+        if _warm_thread is None:
+            _warm_thread = threading.Thread(target=_warm_loop, name='network-warmup', daemon=True)
+            _warm_thread.start()
+    _warm_event.set()
+
+
+def request_warmup() -> None:
+    """Wake this process's warm-up thread (no-op where start_warmup was not called)."""
+    if _warm_thread is not None:
+        _warm_event.set()
+
+
+def build_center_trees(snap: NetworkSnapshot, roots) -> None:
+    """Compute and publish one tree per (root, routing multiplier); pure CPU, no DB access."""
+    for multiplier in CENTER_TREE_MULTIPLIERS:
+        service = ModifiedDijkstraService(risk_multiplier=multiplier)
+        for root in roots:
+            if (root, float(multiplier)) not in snap.center_trees:
+                snap.center_trees[(root, float(multiplier))] = service.shortest_path_tree(snap.graph, root)
+
+
+def _cache_layer(version: str, road_version: str, risks: dict) -> None:
+    _layer_history[version] = (road_version, risks)
+    _layer_history.move_to_end(version)
+    while len(_layer_history) > LAYER_HISTORY_SIZE:
+        _layer_history.popitem(last=False)
+
+
+def _remember_layer(snap: NetworkSnapshot) -> None:
+    """
+    Record the snapshot's layer risks so later deltas can be computed against it,
+    here and (RiskLayerVersion) in every other worker process. Only the newest
+    LAYER_HISTORY_SIZE versions are kept.
+    """
+    ids = [seg.id for seg in snap.segments]
+    risks = list(snap.layer_risks)
+    _cache_layer(snap.version, snap.road_version, dict(zip(ids, risks)))
+    try:
+        RiskLayerVersion.objects.bulk_create(
+            [RiskLayerVersion(version=snap.version, road_version=snap.road_version, segment_ids=ids, risks=risks)],
+            ignore_conflicts=True,
+        )
+        stale = list(
+            RiskLayerVersion.objects.order_by('-id').values_list('id', flat=True)[LAYER_HISTORY_SIZE:]
+        )
+        if stale:
+            RiskLayerVersion.objects.filter(id__in=stale).delete()
+    except DatabaseError as exc:
+        logger.warning('Could not persist risk layer %s: %s', snap.version, exc)
+
+
+def _layer_for(version: str):
+    """(road_version, {segment_id: risk}) of a recent layer version, or None."""
+    cached = _layer_history.get(version)
+    if cached is not None:
+        return cached
+    row = RiskLayerVersion.objects.filter(version=version).values_list(
+        'road_version', 'segment_ids', 'risks',
+    ).first()
+    if row is None:
+        return None
+    _cache_layer(version, row[0], dict(zip(row[1], row[2])))
+    return _layer_history.get(version)
+
+
+def risk_layer_delta(snap: NetworkSnapshot, since: str) -> dict:
+    """
+    Layer risks that changed between version `since` and `snap`.
+
+    Returns {'version', 'road_version', 'full', 'ids', 'r'} where ids / r are
+    parallel lists of segment ids and their current layer risk. When `since` is
+    unknown (older than the last LAYER_HISTORY_SIZE versions, or a different road
+    network) every segment is returned with full=True; the client should then
+    replace its risks wholesale (and refetch geometry if road_version changed).
+    """
+    base = _layer_for(since) if since else None
+    ids = []
+    risks = []
+    if base is not None and base[0] == snap.road_version:
+        previous = base[1]
+        for seg, risk in zip(snap.segments, snap.layer_risks):
+            if previous.get(seg.id) != risk:
+                ids.append(seg.id)
+                risks.append(risk)
+        full = False
+    else:
+        ids = [seg.id for seg in snap.segments]
+        risks = list(snap.layer_risks)
+        full = True
+    return {
+        'version': snap.version,
+        'road_version': snap.road_version,
+        'full': full,
+        'ids': ids,
+        'r': risks,
+    }
+
+
+def segment_midpoint_index():
+    """
+    Return (segment_ids, GridIndex) over RoadSegment midpoints — the point RF
+    features are measured from — rebuilt only when the road network changes.
+    Index position i corresponds to segment_ids[i].
+    """
+    global _midpoint_index
+    road_v = road_network_version()
+    cached = _midpoint_index
+    if cached is not None and cached[0] == road_v:
+        return cached[1], cached[2]
+    with _snapshot_lock:
+        cached = _midpoint_index
+        if cached is None or cached[0] != road_v:
+            rows = list(RoadSegment.objects.values_list('id', 'start_lat', 'start_lng', 'end_lat', 'end_lng'))
+            index = GridIndex(
+                [(float(r[1]) + float(r[3])) / 2 for r in rows],
+                [(float(r[2]) + float(r[4])) / 2 for r in rows],
+            )
+            cached = (road_v, [r[0] for r in rows], index)
+            _midpoint_index = cached
+    return cached[1], cached[2]
+
+
+def invalidate_network_cache() -> None:
+    """
+    Drop the cached snapshot, midpoint index, hierarchy, layer history, route
+    results and isochrone searches; the next request rebuilds them.
+    """
+    from apps.mobile_sync.services import isochrones, route_cache
+
+    global _snapshot, _midpoint_index, _hierarchy
+    with _snapshot_lock:
+        _snapshot = None
+        _midpoint_index = None
+        _hierarchy = None
+        _layer_history.clear()
+        _unstored_bridges.clear()
+    route_cache.invalidate()
+    isochrones.invalidate()
@@ -1,19 +1,29 @@
 """
 Service for hazard report submission.
 
-Flow: create report -> if user-hazard distance > 150 m then auto-reject ->
-else Naive Bayes (text features only) + rule scoring (distance weight,
-consensus) -> combined final_validation_score -> PENDING for MDRRMO.
+Flow: create report (PENDING_SCORING) -> if user-hazard distance > 150 m then
+auto-reject -> else, in a queued job (score_pending_report), Naive Bayes (text
+features only) + rule scoring (distance weight, consensus) -> combined
+final_validation_score -> PENDING for MDRRMO. Barangay and municipality come
+from the local boundary polygons at creation; the Nominatim address and the
+MDRRMO push are queued jobs as well, so submission returns without waiting on them.
 
 MDRRMO approves or rejects; no auto-approve.
 
 Random Forest is used only for road segment risk prediction (routing),
 not report validation.
 """
+from django.conf import settings
+
 from apps.hazards.models import HazardReport
-from apps.hazards.location_resolver import resolve_hazard_location
+from apps.hazards.location_resolver import resolve_hazard_location, resolve_local_location
+from apps.jobs import queue as jobs
 from apps.validation.services.naive_bayes import NaiveBayesValidator, nearby_count_to_category
-from apps.validation.services.consensus import ConsensusScoringService
+from apps.validation.services.consensus import (
+    NEARBY_TIME_WINDOW_HOURS,
+    ConsensusScoringService,
+    within_bounding_box,
+)
 from apps.validation.services.rule_scoring import (
     combine_validation_scores,
     consensus_rule_score,
@@ -113,8 +123,11 @@ def process_new_report(
     client_submission_id: str | None = None,
 ) -> HazardReport:
     """
-    Create report, run NB (type + description only) and separate rule scores,
-    combine into final_validation_score, save breakdown for MDRRMO.
+    Accept a new report: block duplicates, store it and auto-reject it when the
+    reporter is more than 150 m from the hazard. The slow steps (reverse
+    geocoding, validation scoring, neighbour re-scoring, MDRRMO push) are queued
+    jobs (apps.mobile_sync.tasks); until score_pending_report runs, the report
+    is PENDING_SCORING.
     """
     latitude_f = float(latitude)
     longitude_f = float(longitude)
@@ -159,28 +172,25 @@ def process_new_report(
             has_user_confirmed=has_confirmed,
         )
 
-    location = resolve_hazard_location(latitude_f, longitude_f)
-
     report = HazardReport.objects.create(
         user=user,
         hazard_type=hazard_type,
         latitude=latitude,
         longitude=longitude,
-        location_address=location.get('location_address', ''),
-        location_barangay=location.get('location_barangay', ''),
-        location_municipality=location.get('location_municipality', ''),
         description=description or '',
         photo_url=photo_url or '',
         video_url=video_url or '',
-        status=HazardReport.Status.PENDING,
+        status=HazardReport.Status.PENDING_SCORING,
         user_latitude=user_latitude,
         user_longitude=user_longitude,
         client_submission_id=client_submission_id or None,
+        **resolve_local_location(latitude, longitude),
     )
 
-    # Step 1: Proximity check — auto-reject if user is > 150 m from hazard.
+    # Proximity check — auto-reject if user is > 150 m from hazard.
+    rejected = False
     if user_latitude is not None and user_longitude is not None:
-        should_reject, reason, distance_km = should_auto_reject_report(
+        should_reject, reason, _ = should_auto_reject_report(
             float(user_latitude), float(user_longitude),
             float(latitude), float(longitude),
         )
@@ -197,7 +207,62 @@ def process_new_report(
                 'status', 'auto_rejected', 'admin_comment',
                 'rejected_at', 'deletion_scheduled_at',
             ])
-            return report
+            rejected = True
+
+    if settings.REVERSE_GEOCODE_NOMINATIM:
+        jobs.enqueue('hazards.geocode_report', {'report_id': report.id}, dedupe_key=str(report.id))
+    if not rejected:
+        jobs.enqueue('hazards.score_report', {'report_id': report.id}, dedupe_key=str(report.id))
+    if jobs.is_eager():
+        report.refresh_from_db()
+    return report
+
+
+def geocode_report(report_id: int) -> None:
+    """
+    Fill the report's full address by Nominatim reverse geocoding (queued job).
+    Barangay / municipality are only filled when the local polygons had no match.
+    """
+    report = HazardReport.objects.filter(pk=report_id).only(
+        'latitude', 'longitude', 'location_address', 'location_barangay', 'location_municipality',
+    ).first()
+    if report is None or report.location_address:
+        return
+    location = resolve_hazard_location(float(report.latitude), float(report.longitude))
+    if not location['location_address']:
+        # resolve_hazard_location swallows lookup errors; let the queue retry later.
+        raise RuntimeError(f'Reverse geocoding returned no location for report {report_id}')
+    HazardReport.objects.filter(pk=report_id).update(
+        location_address=location['location_address'],
+        location_barangay=report.location_barangay or location['location_barangay'],
+        location_municipality=report.location_municipality or location['location_municipality'],
+    )
+
+
+def score_pending_report(report_id: int) -> HazardReport | None:
+    """
+    Validation scoring for an accepted report (queued job): NB (type +
+    description only) and separate rule scores, combined into
+    final_validation_score with a breakdown for MDRRMO. Moves the report from
+    PENDING_SCORING to PENDING, re-scores its pending neighbours and queues the
+    MDRRMO push. A report that is no longer PENDING_SCORING is left alone, so
+    running the job twice is harmless.
+    """
+    report = HazardReport.objects.filter(
+        pk=report_id, status=HazardReport.Status.PENDING_SCORING, is_deleted=False,
+    ).first()
+    if report is None:
+        return None
+    consensus = ConsensusScoringService()
+    hazard_type = report.hazard_type
+    description = report.description
+
+    # Step 1: Reporter proximity (reports > 150 m away were auto-rejected on submission).
+    if report.user_latitude is not None and report.user_longitude is not None:
+        _, _, distance_km = should_auto_reject_report(
+            float(report.user_latitude), float(report.user_longitude),
+            float(report.latitude), float(report.longitude),
+        )
         distance_km_val = float(distance_km)
         distance_m_val = distance_km_val * 1000
         distance_category = distance_km_to_category(distance_km_val)
@@ -294,4 +359,112 @@ def process_new_report(
         'status',
         'validation_breakdown',
     ])
+    # The new report is corroboration for pending same-type reports around it.
+    rescore_consensus_neighbourhood(report, include_changed=False)
+    jobs.enqueue('notifications.new_report', {'report_id': report.id}, dedupe_key=str(report.id))
     return report
+
+
+def mark_report_unscored(report_id: int) -> HazardReport | None:
+    """
+    Failure path of the scoring job: move a report still in PENDING_SCORING to
+    PENDING without scores, flagged 'unscored' in its breakdown, so it reaches
+    the MDRRMO review queue for a manual decision instead of waiting forever.
+    """
+    report = HazardReport.objects.filter(
+        pk=report_id, status=HazardReport.Status.PENDING_SCORING, is_deleted=False,
+    ).first()
+    if report is None:
+        return None
+    report.status = HazardReport.Status.PENDING
+    report.validation_breakdown = {
+        'unscored': True,
+        'system_decision': 'pending',
+        'explanation': 'Automatic validation scoring failed for this report; review it manually.',
+    }
+    report.save(update_fields=['status', 'validation_breakdown'])
+    jobs.enqueue('notifications.new_report', {'report_id': report.id}, dedupe_key=str(report.id))
+    return report
+
+
+def rescore_consensus_neighbourhood(changed_report, include_changed: bool = True) -> int:
+    """
+    Recompute consensus_score and final_validation_score for every PENDING
+    report whose nearby support can include changed_report: the non-deleted
+    same-type reports within the consensus radius of it (and changed_report
+    itself when it is pending and include_changed). Naive Bayes and distance
+    scores are kept; support uses the same window and clustering as
+    process_new_report.
+
+    One query loads every report that can appear in any of those supports
+    (same type, pending / approved, within twice the radius, confirmation
+    counts annotated) and one bulk_update writes the results. Returns the
+    number of reports updated.
+    """
+    from datetime import timedelta
+    from django.db.models import Count
+    from django.utils import timezone
+    from core.utils.geo import within_radius
+
+    consensus = ConsensusScoringService()
+    radius = consensus.radius_m
+    lat, lng = float(changed_report.latitude), float(changed_report.longitude)
+    candidates = list(
+        within_bounding_box(
+            HazardReport.objects.filter(
+                is_deleted=False,
+                hazard_type=changed_report.hazard_type,
+                status__in=[
+                    HazardReport.Status.PENDING,
+                    HazardReport.Status.PENDING_SCORING,
+                    HazardReport.Status.APPROVED,
+                ],
+            ),
+            lat, lng, 2 * radius,
+        ).annotate(n_confirmations=Count('confirmations'))
+    )
+    since = timezone.now() - timedelta(hours=NEARBY_TIME_WINDOW_HOURS)
+    in_window = [r for r in candidates if r.created_at >= since]
+    affected = [
+        r for r in candidates
+        if r.status == HazardReport.Status.PENDING
+        and (r.id != changed_report.id or include_changed)
+        and within_radius(lat, lng, float(r.latitude), float(r.longitude), radius)
+    ]
+
+    for report in affected:
+        r_lat, r_lng = float(report.latitude), float(report.longitude)
+        support = consensus.summarize(
+            [
+                other for other in in_window
+                if other.id != report.id and within_radius(r_lat, r_lng, float(other.latitude), float(other.longitude), radius)
+            ],
+            NEARBY_TIME_WINDOW_HOURS,
+        )
+        nearby = support.nearby_cluster_count
+        confirmation_count = report.n_confirmations
+        consensus_score_val = consensus_rule_score(nearby, confirmation_count)
+        final_score = combine_validation_scores(
+            report.naive_bayes_score if report.naive_bayes_score is not None else 0.5,
+            report.distance_weight if report.distance_weight is not None else 0.5,
+            consensus_score_val,
+        )
+        report.consensus_score = consensus_score_val
+        report.final_validation_score = final_score
+        if report.validation_breakdown:
+            report.validation_breakdown.update({
+                'confirmation_count': confirmation_count,
+                'nearby_count': nearby,
+                'nearby_raw_reports': support.nearby_raw_reports,
+                'nearby_unique_user_count': support.nearby_unique_user_count,
+                'nearby_cluster_count': support.nearby_cluster_count,
+                'nearby_category': nearby_count_to_category(nearby),
+                'consensus_score': round(consensus_score_val, 4),
+                'final_validation_score': round(final_score, 4),
+            })
+
+    if affected:
+        HazardReport.objects.bulk_update(
+            affected, ['consensus_score', 'final_validation_score', 'validation_breakdown'],
+        )
+    return len(affected)
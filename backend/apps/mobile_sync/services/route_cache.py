@@ -0,0 +1,125 @@
+"""
+Process-wide LRU/TTL cache of calculate_safest_routes results.
+
+During an evacuation many residents of one barangay request routes to the same
+centre within minutes, and their GPS fixes snap to the same road node. Routing
+depends on the raw coordinates only through that snapped node, so a result is
+keyed by
+
+    (snapped start node, evacuation_center_id, k, include_alternative_centers,
+     road-network version, hazard-state version, evacuation-centre version)
+
+The two network versions are the NetworkSnapshot fingerprints, so approving,
+rejecting, restoring or deleting a hazard changes the key on the very next
+request in every worker. Entries for older versions can never hit again and are
+dropped as soon as a result for a newer version is stored. The centre version
+covers centre edits (name, location, deactivation) that change the response
+without touching the road graph.
+
+Entries hold the uncompacted result; callers get a copy (get) so per-request
+post-processing (compact polylines, snap diagnostics) never leaks into the cache.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from apps.evacuation.models import EvacuationCenter
+from apps.mobile_sync.services.network_cache import _fingerprint
+
+_lock = threading.Lock()
+_entries: 'OrderedDict[tuple, tuple]' = OrderedDict()  # key -> (expires_at, result)
+_versions = None  # (road_version, hazard_version) of the entries held
+_stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evictions': 0, 'invalidations': 0}
+
+
+def evacuation_center_version() -> str:
+    """Fingerprint of the evacuation-centre table (any create / edit / delete changes it)."""
+    agg = EvacuationCenter.objects.aggregate(n=Count('id'), max_id=Max('id'), updated=Max('updated_at'))
+    return _fingerprint(agg['n'], agg['max_id'], agg['updated'])
+
+
+def make_key(start_node, evacuation_center_id, k, include_alternative_centers, snapshot, center_version) -> tuple:
+    return (
+        start_node, int(evacuation_center_id), int(k), bool(include_alternative_centers),
+        snapshot.road_version, snapshot.hazard_version, center_version,
+    )
+
+
+def _copy(result: dict) -> dict:
+    out = dict(result)
+    if 'routes' in out:
+        out['routes'] = [dict(r) for r in out['routes']]
+    return out
+
+
+def get(key: tuple):
+    """Return a copy of the cached result for key, or None on a miss."""
+    if settings.ROUTE_CACHE_SIZE <= 0:
+        return None
+    now = time.monotonic()
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            _stats['misses'] += 1
+            return None
+        expires_at, result = entry
+        if expires_at <= now:
+            del _entries[key]
+            _stats['expired'] += 1
+            _stats['misses'] += 1
+            return None
+        _entries.move_to_end(key)
+        _stats['hits'] += 1
+    return _copy(result)
+
+
+def put(key: tuple, result: dict) -> None:
+    """Store a copy of result; a newer network version drops every older entry."""
+    global _versions
+    size = settings.ROUTE_CACHE_SIZE
+    if size <= 0:
+        return
+    versions = key[4:6]
+    expires_at = time.monotonic() + settings.ROUTE_CACHE_TTL_SECONDS
+    with _lock:
+        if versions != _versions:
+            if _entries:
+                _stats['invalidations'] += 1
+            _entries.clear()
+            _versions = versions
+        _entries[key] = (expires_at, _copy(result))
+        _entries.move_to_end(key)
+        while len(_entries) > size:
+            _entries.popitem(last=False)
+            _stats['evictions'] += 1
+
+
+def invalidate() -> None:
+    """Drop every cached result (counters are kept)."""
+    global _versions
+    with _lock:
+        if _entries:
+            _stats['invalidations'] += 1
+        _entries.clear()
+        _versions = None
+
+
+def stats() -> dict:
+    """Hit / miss counters since process start plus current occupancy."""
+    with _lock:
+        out = dict(_stats)
+        out['entries'] = len(_entries)
+    lookups = out['hits'] + out['misses']
+    out['hit_rate'] = round(out['hits'] / lookups, 4) if lookups else 0.0
+    out['max_entries'] = settings.ROUTE_CACHE_SIZE
+    out['ttl_seconds'] = settings.ROUTE_CACHE_TTL_SECONDS
+    return out
+
+
+def reset_stats() -> None:
+    with _lock:
+        for name in _stats:
+            _stats[name] = 0
@@ -0,0 +1,127 @@
+"""
+In-process timing histograms for the routing pipeline.
+
+Every route request records how long each stage took into a fixed-size,
+log-bucketed histogram (four buckets per doubling, so a reported percentile is
+within ~19 % of the true value and memory never grows with traffic):
+
+  db         : evacuation-centre lookup + snapshot version check (and fetch on a rebuild)
+  fetch      : loading segments and approved hazards for a new snapshot
+  risk       : effective risk of every segment for a new snapshot
+  graph_build: building the CSR road graph for a new snapshot
+  bridge     : finding or re-applying the gap-bridging edges
+  search     : safest + distance-only searches (k routes)
+  post       : hazard diagnostics, ranking, length caps, explanations
+  serialize  : compact polylines / road-risk overlay for the response
+  total      : calculate_safest_routes end to end (cache hits included)
+
+Stages that only run on a snapshot rebuild or a cache miss have fewer samples
+than total. Verbose per-request diagnostics (hazards along each route, ranked
+candidates, per-stage breakdown) are logged on the 'routing.diagnostics' logger
+for a random ROUTE_DIAGNOSTICS_SAMPLE_RATE fraction of computed requests
+instead of printed for every one.
+
+Histograms are per worker process; read them with mdrrmo/route-timings/.
+"""
+import math
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Sequence
+
+from django.conf import settings
+
+STAGES = ('db', 'fetch', 'risk', 'graph_build', 'bridge', 'search', 'post', 'serialize', 'total')
+
+_BUCKETS_PER_OCTAVE = 4
+_MIN_MS = 0.01
+_BUCKETS = _BUCKETS_PER_OCTAVE * 24  # 0.01 ms .. ~168 s
+
+_lock = threading.Lock()
+
+
+class _Histogram:
+    __slots__ = ('counts', 'count', 'sum', 'min', 'max')
+
+    def __init__(self):
+        self.counts = [0] * _BUCKETS
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, ms: float) -> None:
+        if ms <= _MIN_MS:
+            i = 0
+        else:
+            i = min(_BUCKETS - 1, math.ceil(math.log2(ms / _MIN_MS) * _BUCKETS_PER_OCTAVE))
+        self.counts[i] += 1
+        self.count += 1
+        self.sum += ms
+        if ms < self.min:
+            self.min = ms
+        if ms > self.max:
+            self.max = ms
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile, clamped to [min, max]."""
+        rank = max(1, math.ceil(q / 100.0 * self.count))
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                return min(self.max, max(self.min, _MIN_MS * 2 ** (i / _BUCKETS_PER_OCTAVE)))
+        return self.max
+
+
+_histograms: Dict[str, _Histogram] = {}
+
+
+def record(stage: str, seconds: float) -> None:
+    ms = seconds * 1000.0
+    with _lock:
+        hist = _histograms.get(stage)
+        if hist is None:
+            hist = _histograms[stage] = _Histogram()
+        hist.add(ms)
+
+
+@contextmanager
+def timer(stage: str):
+    """Record the duration of the with-block under stage (also when it raises)."""
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - t0)
+
+
+def sampled() -> bool:
+    """True for the fraction of requests that should log verbose diagnostics."""
+    rate = settings.ROUTE_DIAGNOSTICS_SAMPLE_RATE
+    return rate > 0 and (rate >= 1 or random.random() < rate)
+
+
+def summary(percentiles: Sequence[float] = (50, 90, 95, 99)) -> dict:
+    """{stage: {count, mean_ms, min_ms, max_ms, p50_ms, ...}} for every stage with samples."""
+    out = {}
+    with _lock:
+        ordered = [s for s in STAGES if s in _histograms] + sorted(set(_histograms) - set(STAGES))
+        for stage in ordered:
+            hist = _histograms[stage]
+            row = {
+                'count': hist.count,
+                'mean_ms': round(hist.sum / hist.count, 3),
+                'min_ms': round(hist.min, 3),
+                'max_ms': round(hist.max, 3),
+            }
+            for q in percentiles:
+                row[f'p{q:g}_ms'] = round(hist.percentile(q), 3)
+            out[stage] = row
+    return out
+
+
+def reset() -> None:
+    with _lock:
+        _histograms.clear()
@@ -15,18 +15,32 @@ Hazard-to-road influence uses GRADUATED proximity, not a binary radius:
 Effective segment risk = (base_RF × 0.6) + (dynamic × 0.4), clamped to [0, 1].
 road_blocked within its tight radius forces segment risk to 1.0 (impassable).
 """
+import logging
 import math
 import time
 from decimal import Decimal
 
+from django.conf import settings
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy ships with scikit-learn
+    np = None
+
 from apps.evacuation.models import EvacuationCenter
 from apps.hazards.models import HazardReport
+from apps.mobile_sync.services import route_cache, route_metrics
+from apps.mobile_sync.services.network_cache import center_tree, get_network_snapshot
 from apps.routing.models import RoadSegment
 from apps.routing.services import ModifiedDijkstraService
 from apps.risk_prediction.services import RoadRiskPredictor
 from apps.validation.services.rule_scoring import combine_validation_scores
+from core.utils import polyline
 from core.utils.geo import haversine_meters
 
+# Per-request route diagnostics, logged only for sampled requests (route_metrics.sampled).
+diagnostics_log = logging.getLogger('routing.diagnostics')
+
 # Risk evaluation layer (after Dijkstra): thresholds for warnings and labels
 HIGH_RISK_THRESHOLD = 0.7
 EXTREME_RISK_THRESHOLD = 0.9  # "Possibly Blocked" tag
@@ -332,6 +346,97 @@ def calculate_segment_risk(segment, hazards) -> float:
         return base * NO_HAZARD_RF_WEIGHT
 
 
+# Decay profile codes for the batch engine.
+_PROFILE_CODES = {'sharp': 0, 'moderate': 1, 'gradual': 2}
+
+
+def calculate_segment_risks(segments, hazards) -> list:
+    """
+    Batch version of calculate_segment_risk(): effective risk for every segment.
+
+    Per-hazard scalars (normalised type, radius, decay profile, type weight,
+    severity, blocker flag) are resolved once; then each hazard is applied to
+    all segments at once with NumPy. Hazards are accumulated in list order and
+    every arithmetic step mirrors the scalar code (same flat-earth projection,
+    blocker short-circuit, per-type radius, decay profile, on-segment bonus,
+    cap and RF blend), so results equal calculate_segment_risk() exactly.
+    Falls back to the scalar loop when NumPy is unavailable.
+    """
+    segments = list(segments)
+    hazards = list(hazards)
+    if np is None:
+        return [calculate_segment_risk(seg, hazards) for seg in segments]
+    n = len(segments)
+    if n == 0:
+        return []
+
+    M = 111_319.9  # metres per degree latitude (as in _perpendicular_distance_m)
+    a_lat = np.fromiter((_float(s.start_lat) for s in segments), dtype=float, count=n)
+    a_lng = np.fromiter((_float(s.start_lng) for s in segments), dtype=float, count=n)
+    b_lat = np.fromiter((_float(s.end_lat) for s in segments), dtype=float, count=n)
+    b_lng = np.fromiter((_float(s.end_lng) for s in segments), dtype=float, count=n)
+    base = np.fromiter(
+        (min(1.0, max(0.0, _float(getattr(s, 'predicted_risk_score', 0)))) for s in segments),
+        dtype=float, count=n,
+    )
+    # math.cos per segment (not np.cos) so the projection matches the scalar bit for bit.
+    cos_lat = np.fromiter(
+        (math.cos(math.radians((la + lb) / 2.0)) for la, lb in zip(a_lat.tolist(), b_lat.tolist())),
+        dtype=float, count=n,
+    )
+    bx = (b_lng - a_lng) * cos_lat * M
+    by = (b_lat - a_lat) * M
+    ab2 = bx * bx + by * by
+    degenerate = ab2 < 1e-6
+    safe_ab2 = np.where(degenerate, 1.0, ab2)
+
+    dynamic = np.zeros(n)
+    blocked = np.zeros(n, dtype=bool)
+    for hazard in hazards:
+        ht = (getattr(hazard, 'hazard_type', '') or 'other').lower().replace(' ', '_')
+        h_lat = _float(hazard.latitude)
+        h_lng = _float(hazard.longitude)
+
+        px = (h_lng - a_lng) * cos_lat * M
+        py = (h_lat - a_lat) * M
+        t = (px * bx + py * by) / safe_ab2
+        on_segment = (t >= 0.0) & (t <= 1.0) & ~degenerate
+        t_clamped = np.clip(t, 0.0, 1.0)
+        dx = px - t_clamped * bx
+        dy = py - t_clamped * by
+        dist = np.where(degenerate, np.sqrt(px * px + py * py), np.sqrt(dx * dx + dy * dy))
+
+        if _is_blocking(ht):
+            blocked |= dist <= HAZARD_INFLUENCE_RADIUS.get(ht, 25)
+
+        radius = HAZARD_INFLUENCE_RADIUS.get(ht, DEFAULT_INFLUENCE_RADIUS)
+        if radius <= 0:
+            continue
+        inside = dist < radius
+        if not inside.any():
+            continue
+        profile = _PROFILE_CODES.get(HAZARD_DECAY_PROFILE.get(ht, 'moderate'), 1)
+        tr = dist / radius
+        if profile == 0:
+            decay = np.maximum(0.0, 1.0 - tr * tr)
+        elif profile == 2:
+            decay = np.maximum(0.0, 1.0 - np.sqrt(tr))
+        else:
+            decay = np.maximum(0.0, 1.0 - tr)
+        decay = np.where(inside, decay, 0.0)
+        decay = np.where(on_segment & (decay > 0.0), decay * ON_SEGMENT_BONUS_MULTIPLIER, decay)
+        dynamic += decay * _hazard_type_weight(ht) * _hazard_routing_impact(hazard)
+
+    dynamic = np.minimum(dynamic, HAZARD_RISK_CAP)
+    risk = np.where(
+        dynamic > 0,
+        np.minimum(1.0, (base * WITH_HAZARD_RF_WEIGHT) + (dynamic * WITH_HAZARD_DYNAMIC_WEIGHT)),
+        base * NO_HAZARD_RF_WEIGHT,
+    )
+    risk = np.where(blocked, 1.0, risk)
+    return risk.tolist()
+
+
 def _recency_factor(hazard) -> float:
     """
     Weight a hazard report by how recently it was approved.
@@ -381,6 +486,12 @@ _TYPE_SEVERITY: dict = {
 }
 
 
+# Hazards within 200 m of a segment midpoint feed that segment's RF features, so
+# adding or removing one hazard can only change segments whose midpoint lies
+# within this radius of it (see recompute_segment_risks_near).
+SEGMENT_FEATURE_RADIUS_M = 200
+
+
 def _compute_segment_rf_features(segment, approved_hazards: list) -> dict:
     """
     Compute Random Forest input features for a single road segment.
@@ -397,8 +508,6 @@ def _compute_segment_rf_features(segment, approved_hazards: list) -> dict:
     # Using synthetic training data (temporary)
     # Replace with MDRRMO historical data when available
     """
-    SEGMENT_FEATURE_RADIUS_M = 200  # hazards within 200 m of segment midpoint
-
     TYPE_TO_FEATURE = {
         'flooded_road':               'flooded_road_count',
         'flood':                      'flooded_road_count',
@@ -485,31 +594,101 @@ def _ensure_segment_risk_scores(force: bool = False):
         return
 
     predictor = RoadRiskPredictor()
-    approved_hazards = list(HazardReport.objects.filter(
+    approved_hazards = _get_feature_hazards()
+
+    # One feature matrix, one model call for the whole network.
+    risks = _predict_segment_risks(
+        predictor, [_compute_segment_rf_features(seg, approved_hazards) for seg in segments],
+    )
+    for seg, risk in zip(segments, risks):
+        seg.predicted_risk_score = risk
+
+    RoadSegment.objects.bulk_update(segments, ['predicted_risk_score'])
+
+
+def recompute_segment_risks_near(lat, lng) -> int:
+    """
+    Re-predict predicted_risk_score only for segments an approved hazard at
+    (lat, lng) can influence — i.e. whose midpoint is within SEGMENT_FEATURE_RADIUS_M.
+
+    Call after one hazard enters or leaves the approved set (approve, reject,
+    delete, restore). Affected segments are found through the cached midpoint
+    grid index, and their features are rebuilt from the approved hazards within
+    2 × SEGMENT_FEATURE_RADIUS_M of (lat, lng) — every hazard that can reach an
+    affected midpoint — so the scores match a full recompute for those segments.
+    Recency decay on untouched segments is refreshed by the full recompute
+    (update_segment_risks command / recompute_all_segment_risks).
+
+    Returns the number of segments updated.
+    """
+    from apps.mobile_sync.services.network_cache import segment_midpoint_index
+
+    lat = _float(lat)
+    lng = _float(lng)
+    segment_ids, index = segment_midpoint_index()
+    # Grid distances are projected metres; pad slightly, then apply the exact
+    # haversine test _compute_segment_rf_features uses.
+    candidate_ids = [
+        segment_ids[i] for i, _ in index.within(lat, lng, SEGMENT_FEATURE_RADIUS_M * 1.01 + 1.0)
+    ]
+    if not candidate_ids:
+        return 0
+    segments = [
+        seg for seg in RoadSegment.objects.filter(id__in=candidate_ids)
+        if haversine_meters(
+            (_float(seg.start_lat) + _float(seg.end_lat)) / 2,
+            (_float(seg.start_lng) + _float(seg.end_lng)) / 2,
+            lat, lng,
+        ) <= SEGMENT_FEATURE_RADIUS_M
+    ]
+    if not segments:
+        return 0
+
+    nearby_hazards = [
+        h for h in _get_feature_hazards()
+        if haversine_meters(lat, lng, _float(h.latitude), _float(h.longitude)) <= 2 * SEGMENT_FEATURE_RADIUS_M + 1.0
+    ]
+    risks = _predict_segment_risks(
+        RoadRiskPredictor(), [_compute_segment_rf_features(seg, nearby_hazards) for seg in segments],
+    )
+    for seg, risk in zip(segments, risks):
+        seg.predicted_risk_score = risk
+    RoadSegment.objects.bulk_update(segments, ['predicted_risk_score'])
+    return len(segments)
+
+
+def _get_feature_hazards() -> list:
+    """Approved, non-deleted hazards with just the fields RF feature extraction reads."""
+    return list(HazardReport.objects.filter(
         status=HazardReport.Status.APPROVED,
         is_deleted=False,
-    ).only('latitude', 'longitude', 'hazard_type',
+    ).only('latitude', 'longitude', 'hazard_type', 'created_at',
            'final_validation_score', 'naive_bayes_score'))
 
-    bulk_update = []
-    for seg in segments:
-        f = _compute_segment_rf_features(seg, approved_hazards)
-        risk = predictor.predict_risk(
-            flooded_road_count=f['flooded_road_count'],
-            landslide_count=f['landslide_count'],
-            fallen_tree_count=f['fallen_tree_count'],
-            road_damage_count=f['road_damage_count'],
-            fallen_electric_post_count=f['fallen_electric_post_count'],
-            road_blocked_count=f['road_blocked_count'],
-            bridge_damage_count=f['bridge_damage_count'],
-            storm_surge_count=f['storm_surge_count'],
-            avg_severity=f['avg_severity'],
-        )
-        seg.predicted_risk_score = risk
-        bulk_update.append(seg)
 
-    if bulk_update:
-        RoadSegment.objects.bulk_update(bulk_update, ['predicted_risk_score'])
+# Column order of the RF feature matrix (ml_data.train_random_forest.FEATURE_COLUMNS).
+_RF_FEATURE_ORDER = (
+    'flooded_road_count',
+    'landslide_count',
+    'fallen_tree_count',
+    'road_damage_count',
+    'fallen_electric_post_count',
+    'road_blocked_count',
+    'bridge_damage_count',
+    'storm_surge_count',
+    'avg_severity',
+)
+
+
+def _predict_segment_risks(predictor, features: list) -> list:
+    """
+    Run the RF road-risk model once over feature dicts from
+    _compute_segment_rf_features; returns one float per dict.
+    """
+    if not features:
+        return []
+    matrix = [[f[name] for name in _RF_FEATURE_ORDER] for f in features]
+    return [float(r) for r in predictor.predict_road_risk_batch(matrix)]
 
 
 def _get_approved_hazards():
@@ -556,7 +735,71 @@ def _distance_to_route_polyline_m(path_points, hazard_lat: float, hazard_lng: fl
     return best, best
 
 
-def _route_hazard_diagnostics(path_points, hazards):
+# Hazard × path-segment distance pairs evaluated per NumPy block (bounds memory on long routes).
+_DISTANCE_BLOCK_PAIRS = 250_000
+
+
+def _route_bbox_mask(path_points, hazard_lats: list, hazard_lngs: list, margin_m: float) -> list:
+    """
+    Prefilter: True for hazards inside the route's bounding box grown by margin_m.
+    A hazard outside it is farther than margin_m from every point of the route.
+    """
+    lats = [_float(p[0]) for p in path_points]
+    lngs = [_float(p[1]) for p in path_points]
+    M = 111_319.9
+    dlat = margin_m / M
+    # Longitude degrees shrink with latitude; use the widest (highest |lat|) edge of the box.
+    max_abs_lat = min(89.0, max(abs(min(lats)), abs(max(lats))) + dlat)
+    dlng = margin_m / (M * math.cos(math.radians(max_abs_lat)))
+    lat_lo, lat_hi = min(lats) - dlat, max(lats) + dlat
+    lng_lo, lng_hi = min(lngs) - dlng, max(lngs) + dlng
+    return [
+        lat_lo <= la <= lat_hi and lng_lo <= ln <= lng_hi
+        for la, ln in zip(hazard_lats, hazard_lngs)
+    ]
+
+
+def _route_hazard_distances(path_points, hazard_lats: list, hazard_lngs: list) -> list:
+    """
+    Distance (m) from each hazard point to the route polyline; equals
+    _distance_to_route_polyline_m() per hazard. With NumPy all hazard × segment
+    pairs are evaluated in blocks, each arithmetic step in the scalar order (and
+    math.cos per segment), so the values match the scalar loop bit for bit.
+    """
+    if np is None or len(path_points) < 2 or any(len(p) < 2 for p in path_points):
+        return [_distance_to_route_polyline_m(path_points, la, ln)[0] for la, ln in zip(hazard_lats, hazard_lngs)]
+    if not hazard_lats:
+        return []
+    M = 111_319.9  # metres per degree latitude (as in _perpendicular_distance_m)
+    lat = np.fromiter((_float(p[0]) for p in path_points), dtype=float, count=len(path_points))
+    lng = np.fromiter((_float(p[1]) for p in path_points), dtype=float, count=len(path_points))
+    a_lat, a_lng, b_lat, b_lng = lat[:-1], lng[:-1], lat[1:], lng[1:]
+    cos_lat = np.fromiter(
+        (math.cos(math.radians((la + lb) / 2.0)) for la, lb in zip(a_lat.tolist(), b_lat.tolist())),
+        dtype=float, count=len(a_lat),
+    )
+    bx = (b_lng - a_lng) * cos_lat * M
+    by = (b_lat - a_lat) * M
+    ab2 = bx * bx + by * by
+    degenerate = ab2 < 1e-6
+    safe_ab2 = np.where(degenerate, 1.0, ab2)
+
+    h_lat = np.asarray(hazard_lats, dtype=float)[:, None]
+    h_lng = np.asarray(hazard_lngs, dtype=float)[:, None]
+    block = max(1, _DISTANCE_BLOCK_PAIRS // len(a_lat))
+    out = []
+    for i in range(0, len(h_lat), block):
+        px = (h_lng[i:i + block] - a_lng) * cos_lat * M
+        py = (h_lat[i:i + block] - a_lat) * M
+        t = np.clip((px * bx + py * by) / safe_ab2, 0.0, 1.0)
+        dx = px - t * bx
+        dy = py - t * by
+        dist = np.where(degenerate, np.sqrt(px * px + py * py), np.sqrt(dx * dx + dy * dy))
+        out.extend(dist.min(axis=1).tolist())
+    return out
+
+
+def _route_hazard_diagnostics(path_points, hazards, near_only: bool = False):
     """
     Compute per-hazard inclusion diagnostics against the ACTUAL route polyline.
 
@@ -564,20 +807,32 @@ def _route_hazard_diagnostics(path_points, hazards):
       hazard_id, hazard_type, hazard_lat/lng,
       distance_to_route_meters, distance_to_nearest_segment_meters,
       allowed_radius_meters, included, reason_included
+
+    All hazard-to-polyline distances come from one vectorized pass
+    (_route_hazard_distances). With near_only=True hazards outside the route's
+    bounding box grown by their type radius are dropped before that pass; they
+    could never be included, so callers that only use included entries
+    (_path_based_hazard_risk, _hazards_along_path) get identical results.
     """
     if not path_points or not hazards:
         return []
 
-    diagnostics = []
+    rows = []
     for hazard in hazards:
-        hazard_id = getattr(hazard, 'id', id(hazard))
         hazard_type = (getattr(hazard, 'hazard_type', 'other') or 'other').lower().replace(' ', '_')
-        hazard_lat = _float(hazard.latitude)
-        hazard_lng = _float(hazard.longitude)
-        allowed_radius = _path_radius_for_hazard(hazard_type)
-        distance_to_route, distance_to_segment = _distance_to_route_polyline_m(
-            path_points, hazard_lat, hazard_lng,
+        rows.append((hazard, hazard_type, _float(hazard.latitude), _float(hazard.longitude),
+                     _path_radius_for_hazard(hazard_type)))
+    if near_only:
+        keep = _route_bbox_mask(
+            path_points, [r[2] for r in rows], [r[3] for r in rows], max(r[4] for r in rows),
         )
+        rows = [r for r, k in zip(rows, keep) if k]
+    distances = _route_hazard_distances(path_points, [r[2] for r in rows], [r[3] for r in rows])
+
+    diagnostics = []
+    for (hazard, hazard_type, hazard_lat, hazard_lng, allowed_radius), distance_to_route in zip(rows, distances):
+        hazard_id = getattr(hazard, 'id', id(hazard))
+        distance_to_segment = distance_to_route
         included = distance_to_route <= allowed_radius
         if included:
             reason = (
@@ -610,7 +865,7 @@ def _path_based_hazard_risk(path_points, hazards, diagnostics=None) -> float:
     """
     if not path_points or not hazards:
         return 0.0
-    diag = diagnostics if diagnostics is not None else _route_hazard_diagnostics(path_points, hazards)
+    diag = diagnostics if diagnostics is not None else _route_hazard_diagnostics(path_points, hazards, near_only=True)
     total = 0.0
     for d in diag:
         if not d.get('included'):
@@ -677,7 +932,7 @@ def _hazards_along_path(path_points, hazards, diagnostics=None):
     """
     if not path_points or not hazards:
         return []
-    diag = diagnostics if diagnostics is not None else _route_hazard_diagnostics(path_points, hazards)
+    diag = diagnostics if diagnostics is not None else _route_hazard_diagnostics(path_points, hazards, near_only=True)
     result = []
     for d in diag:
         if not d.get('included'):
@@ -814,21 +1069,103 @@ def _build_contributing_factors(hazards_along_route: list) -> list:
     return out
 
 
-def _get_alternative_centers(start_lat: float, start_lng: float, exclude_ec_id: int, limit: int = 5):
+def _normalize_route_risk(r: dict) -> None:
+    """
+    Fill total_distance and replace Dijkstra's summed segment risk in r with the
+    normalized route risk in [0, 1] (and its risk_level).
+    """
+    path = r.get('path') or []
+    total_dist = r.get('total_distance') or 0.0
+    if total_dist <= 0 and path:
+        total_dist = _path_length_meters(path)
+    r['total_distance'] = total_dist
+
+    # Get segment-level risk sum from Dijkstra
+    segment_risk_sum = r.get('total_risk') or 0.0
+
+    # Normalize route risk: use square root to prevent long routes from inflating
+    # but still reflect hazard concentration. This balances:
+    # - Short route (5 segments) with 1 hazard: √0.5 ≈ 0.71 (High)
+    # - Long route (20 segments) with 1 hazard: √0.5 ≈ 0.71 (High)
+    # - Long route (20 segments) with 4 hazards: √2.0 ≈ 1.41 → capped to 1.0 (High)
+    # - Short route (5 segments) with no hazards: √0.1 ≈ 0.32 (Moderate)
+    num_segments = len(path) - 1 if len(path) > 1 else 1
+    # Adjust the sum by segment count factor: longer routes get mild discount
+    adjusted_sum = segment_risk_sum * math.sqrt(5.0 / max(5, num_segments))
+    normalized_risk = math.sqrt(max(0.0, adjusted_sum))
+
+    # Normalize to [0, 1] - this is the actual route risk
+    r['total_risk'] = min(1.0, max(0.0, normalized_risk))
+    r['risk_level'] = _risk_level_from_total(normalized_risk)
+
+
+def _promote_practical_route(routes: list) -> None:
+    """
+    Distance guardrail on risk-sorted routes (in place): if the top-ranked route is
+    >2× longer than the shortest available route AND the shorter route is not fully
+    blocked, promote the shorter one to first place.
+    """
+    if len(routes) >= 2:
+        min_dist = min((r.get('total_distance') or float('inf')) for r in routes)
+        if min_dist > 0:
+            best_dist = routes[0].get('total_distance') or 0.0
+            if best_dist > 2.0 * min_dist:
+                practical = next(
+                    (r for r in routes
+                     if (r.get('total_distance') or 0.0) <= 2.0 * min_dist
+                     and (r.get('total_risk') or 0.0) < EXTREME_RISK_THRESHOLD),
+                    None,
+                )
+                if practical is not None and practical is not routes[0]:
+                    routes.remove(practical)
+                    routes.insert(0, practical)
+
+
+def _best_center_route(safe, short):
+    """
+    The route calculate_safest_routes(k=1) would rank first, from the best
+    risk-weighted and the best distance-only route to one centre (either may be
+    None). Returns the normalized route dict, or None if the centre is unreachable.
+    """
+    routes = []
+    for r in (safe, short):
+        if r and r['path_keys'] and all(r['path_keys'] != o['path_keys'] for o in routes):
+            routes.append(r)
+    for r in routes:
+        _normalize_route_risk(r)
+    routes.sort(key=lambda x: x.get('total_risk') or 0.0)
+    _promote_practical_route(routes)
+    return routes[0] if routes else None
+
+
+def _get_alternative_centers(start_lat: float, start_lng: float, exclude_ec_id: int, limit: int = 5, graph=None):
     """
     Return list of other evacuation centers with has_safe_route and best_route_risk.
     Used when no_safe_route for the selected center. Does not recurse into alternatives.
+
+    best_route_risk is the risk of the route calculate_safest_routes(k=1) would rank
+    first, but all centers share one risk-weighted and one distance-only
+    one-to-many search over the cached graph instead of a full request each.
+    Pass the snapshot graph the caller already routed on as graph.
     """
     others = list(
         EvacuationCenter.objects.filter(is_operational=True).exclude(pk=exclude_ec_id).order_by('name')[:limit]
     )
+    if not others:
+        return []
+    if graph is None:
+        graph = get_network_snapshot().graph
+    destinations = [(float(ec.latitude), float(ec.longitude)) for ec in others]
+    safest = ModifiedDijkstraService(risk_multiplier=150.0).get_routes_to_many_on_graph(
+        graph, start_lat, start_lng, destinations,
+    )
+    shortest = ModifiedDijkstraService(risk_multiplier=0.0).get_routes_to_many_on_graph(
+        graph, start_lat, start_lng, destinations,
+    )
     result = []
-    for ec in others:
-        res = calculate_safest_routes(
-            start_lat, start_lng, ec.id, k=1,
-            include_alternative_centers=False,
-        )
-        if not res or not res.get('routes'):
+    for ec, safe, short in zip(others, safest, shortest):
+        best = _best_center_route(safe, short)
+        if best is None:
             result.append({
                 'center_id': ec.id,
                 'center_name': ec.name,
@@ -836,7 +1173,6 @@ def _get_alternative_centers(start_lat: float, start_lng: float, exclude_ec_id:
                 'best_route_risk': None,
             })
             continue
-        best = res['routes'][0]
         risk = _float(best.get('total_risk'))
         result.append({
             'center_id': ec.id,
@@ -847,13 +1183,29 @@ def _get_alternative_centers(start_lat: float, start_lng: float, exclude_ec_id:
     return result
 
 
-def calculate_safest_routes(start_lat, start_lng, evacuation_center_id: int, k: int = 3, include_alternative_centers: bool = True):
+def calculate_safest_routes(
+    start_lat, start_lng, evacuation_center_id: int, k: int = 3,
+    include_alternative_centers: bool = True, compact: bool = False, snapshot=None,
+):
     """
     Return list of up to k safest routes from (start_lat, start_lng) to the evacuation center.
     Each route has path, total_risk, total_distance, risk_level, risk_label, possibly_blocked, contributing_factors.
     Response includes no_safe_route, message, recommended_action, alternative_centers when applicable.
     Uses base segment risk (RF) + proximity-based risk from approved hazard reports; safety layer applied after.
+
+    The response always carries risk_layer_version (see road-risk-layer/). With
+    compact=True the road_risk_segments overlay is omitted — clients resolve the
+    version against their cached layer — and each route's path / path_keys are
+    replaced by a single encoded polyline (precision 6, see core.utils.polyline).
+
+    Results are cached per snapped start node, centre, k and network / centre
+    version (see route_cache), so residents whose GPS fixes snap to the same road
+    node share one computation until the hazard state changes.
+
+    Callers that already hold the current NetworkSnapshot pass it as snapshot to
+    skip the version-fingerprint queries.
     """
+    t0 = time.perf_counter()
     try:
         ec = EvacuationCenter.objects.get(pk=evacuation_center_id)
     except EvacuationCenter.DoesNotExist:
@@ -864,8 +1216,44 @@ def calculate_safest_routes(start_lat, start_lng, evacuation_center_id: int, k:
     # first request with a slow RF training cycle. Scores are pre-computed at deploy
     # time via `python manage.py update_segment_risks`. Segments with score=0 still
     # route correctly — effective_risk falls back to dynamic hazard signals only.
-    t0 = time.time()
-    segments = list(RoadSegment.objects.all())
+    # Segments, effective risks and the bridged graph are cached per
+    # (road-network version, hazard-state version); see network_cache.
+    if snapshot is None:
+        snapshot = get_network_snapshot()
+    start_node = snapshot.graph.nearest_node(float(start_lat), float(start_lng)) if snapshot.segments else None
+    key = route_cache.make_key(
+        start_node, ec.id, k, include_alternative_centers, snapshot, route_cache.evacuation_center_version(),
+    )
+    route_metrics.record('db', time.perf_counter() - t0)
+    result = route_cache.get(key)
+    if result is None:
+        result = _compute_safest_routes(snapshot, ec, start_lat, start_lng, k, include_alternative_centers)
+        route_cache.put(key, result)
+    if snapshot.segments:
+        with route_metrics.timer('serialize'):
+            _finish_response(result, snapshot, compact)
+    route_metrics.record('total', time.perf_counter() - t0)
+    return result
+
+
+def _finish_response(result: dict, snapshot, compact: bool) -> None:
+    """Per-request shaping of a (cached) result: compact polylines or the road-risk overlay."""
+    if compact:
+        for r in result['routes']:
+            r['polyline'] = polyline.encode(r.pop('path', None) or [])
+            r.pop('path_keys', None)
+    else:
+        # Road Risk Layer data: compact segment list so Flutter can draw a coloured
+        # road-risk overlay without a separate API call.  Only includes segments that
+        # have a non-trivial effective_risk (> 0.05) to keep payload small; built once
+        # per network snapshot and shared by every route response.
+        result['road_risk_segments'] = snapshot.route_risk_segments
+
+
+def _compute_safest_routes(snapshot, ec, start_lat, start_lng, k: int, include_alternative_centers: bool) -> dict:
+    """Uncached body of calculate_safest_routes (without the compact / overlay step)."""
+    verbose = route_metrics.sampled()
+    segments = snapshot.segments
     segment_count = len(segments)
     if not segments:
         return {
@@ -877,33 +1265,37 @@ def calculate_safest_routes(start_lat, start_lng, evacuation_center_id: int, k:
             'recommended_action': 'Road segment data must be seeded via: python manage.py migrate',
             'alternative_centers': [],
             'segment_count': 0,
+            'risk_layer_version': snapshot.version,
         }
-    t1 = time.time()
-    approved_hazards = _get_approved_hazards()
-    for seg in segments:
-        seg.effective_risk = calculate_segment_risk(seg, approved_hazards)
-    t2 = time.time()
+    approved_hazards = snapshot.approved_hazards
+    t_search = time.perf_counter()
     # 1–4) Up to k routes by reusing Dijkstra: run once → penalize used edges → run again.
-    dijkstra_safe = ModifiedDijkstraService(risk_multiplier=150.0)
-    safest_routes = dijkstra_safe.get_safest_routes(
-        segments,
+    # The first route is read from the centre's shortest-path tree and the penalised
+    # reruns are A* guided by it. center_tree builds a missing tree inline, so the
+    # routes never depend on whether the background warm-up has finished.
+    dijkstra_safe = ModifiedDijkstraService(risk_multiplier=150.0, search_mode=settings.ROUTING_SEARCH_MODE)
+    safest_routes = dijkstra_safe.get_safest_routes_on_graph(
+        snapshot.graph,
         float(start_lat), float(start_lng),
         float(ec.latitude), float(ec.longitude),
         k=k,
+        tree=center_tree(snapshot, float(ec.latitude), float(ec.longitude), 150.0),
     )
     for i, r in enumerate(safest_routes):
         r['_src'] = f'safe_r{i + 1}'  # safe_r1 = primary; safe_r2/r3 = penalized reruns
     # Optional: add shortest (distance-only) if it is a different path.
-    dijkstra_short = ModifiedDijkstraService(risk_multiplier=0.0)
-    shortest_routes = dijkstra_short.get_safest_routes(
-        segments,
+    dijkstra_short = ModifiedDijkstraService(risk_multiplier=0.0, search_mode=settings.ROUTING_SEARCH_MODE)
+    shortest_routes = dijkstra_short.get_safest_routes_on_graph(
+        snapshot.graph,
         float(start_lat), float(start_lng),
         float(ec.latitude), float(ec.longitude),
         k=1,
+        tree=center_tree(snapshot, float(ec.latitude), float(ec.longitude), 0.0),
     )
     for r in shortest_routes:
         r['_src'] = 'dist_only'
-    t3 = time.time()
+    t_post = time.perf_counter()
+    route_metrics.record('search', t_post - t_search)
     # 6–8) Unique routes only; do not duplicate; return only available routes.
     seen_path_keys = set()
     routes = []
@@ -924,29 +1316,8 @@ def calculate_safest_routes(start_lat, start_lng, evacuation_center_id: int, k:
     # Per-route risk must come only from hazards that are actually close to that
     # route's geometry. No global/straight-line hazard floor is applied.
     for r in routes:
+        _normalize_route_risk(r)
         path = r.get('path') or []
-        total_dist = r.get('total_distance') or 0.0
-        if total_dist <= 0 and path:
-            total_dist = _path_length_meters(path)
-        r['total_distance'] = total_dist
-
-        # Get segment-level risk sum from Dijkstra
-        segment_risk_sum = r.get('total_risk') or 0.0
-
-        # Normalize route risk: use square root to prevent long routes from inflating
-        # but still reflect hazard concentration. This balances:
-        # - Short route (5 segments) with 1 hazard: √0.5 ≈ 0.71 (High)
-        # - Long route (20 segments) with 1 hazard: √0.5 ≈ 0.71 (High)
-        # - Long route (20 segments) with 4 hazards: √2.0 ≈ 1.41 → capped to 1.0 (High)
-        # - Short route (5 segments) with no hazards: √0.1 ≈ 0.32 (Moderate)
-        num_segments = len(path) - 1 if len(path) > 1 else 1
-        # Adjust the sum by segment count factor: longer routes get mild discount
-        adjusted_sum = segment_risk_sum * math.sqrt(5.0 / max(5, num_segments))
-        normalized_risk = math.sqrt(max(0.0, adjusted_sum))
-
-        # Normalize to [0, 1] - this is the actual route risk
-        r['total_risk'] = min(1.0, max(0.0, normalized_risk))
-        r['risk_level'] = _risk_level_from_total(normalized_risk)
 
         diagnostics = _route_hazard_diagnostics(path, approved_hazards)
         r['hazards_along_route'] = _hazards_along_path(path, approved_hazards, diagnostics=diagnostics)
@@ -967,48 +1338,35 @@ def calculate_safest_routes(start_lat, start_lng, evacuation_center_id: int, k:
             for d in diagnostics
         ]
 
-        included_logs = [d for d in diagnostics if d.get('included')]
-        for d in included_logs:
-            print(
-                '[ROUTE_HAZARD] '
-                f"hazard_id={d['hazard_id']} "
-                f"type={d['hazard_type']} "
-                f"lat={d['hazard_lat']:.6f} lng={d['hazard_lng']:.6f} "
-                f"distance_to_route_m={d['distance_to_route_meters']} "
-                f"distance_to_nearest_segment_m={d['distance_to_nearest_segment_meters']} "
-                f"reason_included=\"{d['reason_included']}\""
-            )
+        if verbose:
+            for d in diagnostics:
+                if d.get('included'):
+                    diagnostics_log.info(
+                        '[ROUTE_HAZARD] hazard_id=%s type=%s lat=%.6f lng=%.6f distance_to_route_m=%s '
+                        'distance_to_nearest_segment_m=%s reason_included="%s"',
+                        d['hazard_id'], d['hazard_type'], d['hazard_lat'], d['hazard_lng'],
+                        d['distance_to_route_meters'], d['distance_to_nearest_segment_meters'],
+                        d['reason_included'],
+                    )
 
     # Safest first (lowest total_risk)
     routes.sort(key=lambda x: x.get('total_risk') or 0.0)
 
     # Log all candidates after risk-sort so we can trace why routes ended up in a given order.
-    print(f'[ROUTE_CANDIDATES] ec={ec.id} candidates={len(routes)} after risk-sort:')
-    for _i, _r in enumerate(routes):
-        print(
-            f'  cand={_i + 1} src={_r.get("_src", "?")} '
-            f'dist={_r.get("total_distance", 0):.0f}m '
-            f'risk={_r.get("total_risk", 0):.3f}'
+    if verbose:
+        diagnostics_log.info(
+            '[ROUTE_CANDIDATES] ec=%s candidates=%d after risk-sort: %s', ec.id, len(routes), ' '.join(
+                f'cand={i + 1}:src={r.get("_src", "?")}:dist={r.get("total_distance", 0):.0f}m'
+                f':risk={r.get("total_risk", 0):.3f}'
+                for i, r in enumerate(routes)
+            ),
         )
 
     # Distance guardrail: if the top-ranked route is >2× longer than the shortest
     # available route AND the shorter route is not fully blocked, promote the shorter
     # one to first place.  Prevents the algorithm from choosing a 10-14 km detour
     # to avoid moderate-risk segments when a 1-2 km route with manageable risk exists.
-    if len(routes) >= 2:
-        min_dist = min((r.get('total_distance') or float('inf')) for r in routes)
-        if min_dist > 0:
-            best_dist = routes[0].get('total_distance') or 0.0
-            if best_dist > 2.0 * min_dist:
-                practical = next(
-                    (r for r in routes
-                     if (r.get('total_distance') or 0.0) <= 2.0 * min_dist
-                     and (r.get('total_risk') or 0.0) < EXTREME_RISK_THRESHOLD),
-                    None,
-                )
-                if practical is not None and practical is not routes[0]:
-                    routes.remove(practical)
-                    routes.insert(0, practical)
+    _promote_practical_route(routes)
 
     # Alternative-route length cap — two-tier:
     #   Tight (1.25×): default; no benefit from extra distance ← main filter
@@ -1088,18 +1446,17 @@ def calculate_safest_routes(start_lat, start_lng, evacuation_center_id: int, k:
                     _alts.sort(key=lambda _r: (_r.get('total_distance') or 0.0) * (1.0 + (_r.get('total_risk') or 0.0)))
                     routes = [_primary] + _alts
 
-                for i, r in enumerate(routes):
-                    keys = r.get('path_keys') or []
-                    overlap = _edge_overlap(keys) if i > 0 else 1.0
-                    prac = (r.get('total_distance') or 0.0) * (1.0 + (r.get('total_risk') or 0.0))
-                    print(
-                        f'[ROUTE_DEBUG] route={i + 1} '
-                        f'src={r.get("_src", "?")} '
-                        f'dist={r.get("total_distance", 0):.0f}m '
-                        f'risk={r.get("total_risk", 0):.3f} '
-                        f'practical_score={prac:.0f} '
-                        f'overlap_r1={overlap:.0%}'
-                    )
+                if verbose:
+                    for i, r in enumerate(routes):
+                        keys = r.get('path_keys') or []
+                        overlap = _edge_overlap(keys) if i > 0 else 1.0
+                        prac = (r.get('total_distance') or 0.0) * (1.0 + (r.get('total_risk') or 0.0))
+                        diagnostics_log.info(
+                            '[ROUTE_DEBUG] route=%d src=%s dist=%.0fm risk=%.3f practical_score=%.0f '
+                            'overlap_r1=%.0f%%',
+                            i + 1, r.get('_src', '?'), r.get('total_distance', 0), r.get('total_risk', 0),
+                            prac, overlap * 100,
+                        )
 
     # Strip internal source tag before API response
     for r in routes:
@@ -1131,18 +1488,18 @@ def calculate_safest_routes(start_lat, start_lng, evacuation_center_id: int, k:
     alternative_centers = []
     if no_safe_route and include_alternative_centers:
         alternative_centers = _get_alternative_centers(
-            start_lat_f, start_lng_f, ec.id, limit=5,
+            start_lat_f, start_lng_f, ec.id, limit=5, graph=snapshot.graph,
         )
 
-    t4 = time.time()
-    print(
-        f'[ROUTE_TIMING] ec={ec.id} segs={segment_count} hazards={len(approved_hazards)} '
-        f'routes={len(routes)} | '
-        f'db={t1-t0:.2f}s risks={t2-t1:.2f}s dijkstra={t3-t2:.2f}s post={t4-t3:.2f}s '
-        f'total={t4-t0:.2f}s'
-    )
+    t_end = time.perf_counter()
+    route_metrics.record('post', t_end - t_post)
+    if verbose:
+        diagnostics_log.info(
+            '[ROUTE_TIMING] ec=%s segs=%d hazards=%d routes=%d | search=%.3fs post=%.3fs',
+            ec.id, segment_count, len(approved_hazards), len(routes), t_post - t_search, t_end - t_post,
+        )
 
-    return {
+    result = {
         'evacuation_center_id': ec.id,
         'evacuation_center_name': ec.name,
         'routes': routes,
@@ -1151,16 +1508,6 @@ def calculate_safest_routes(start_lat, start_lng, evacuation_center_id: int, k:
         'recommended_action': recommended_action,
         'alternative_centers': alternative_centers,
         'segment_count': segment_count,
-        # Road Risk Layer data: compact segment list so Flutter can draw a coloured
-        # road-risk overlay without a separate API call.  Only includes segments that
-        # have a non-trivial effective_risk (> 0.05) to keep payload small.
-        'road_risk_segments': [
-            {
-                's': [float(seg.start_lat), float(seg.start_lng)],
-                'e': [float(seg.end_lat),   float(seg.end_lng)],
-                'r': round(getattr(seg, 'effective_risk', 0.0), 3),
-            }
-            for seg in segments
-            if getattr(seg, 'effective_risk', 0.0) > 0.05
-        ],
+        'risk_layer_version': snapshot.version,
     }
+    return result
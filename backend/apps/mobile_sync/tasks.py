@@ -0,0 +1,98 @@
+"""
+Background job handlers for the mobile API (registered with apps.jobs.queue).
+
+Payloads carry ids, not model instances or push tokens: each handler reloads
+what it needs, so a job that runs late (retry, separate run_jobs process) acts
+on current data.
+"""
+import logging
+
+from apps.hazards.models import HazardReport
+from apps.jobs.queue import register
+from apps.mobile_sync.services.report_service import (
+    geocode_report,
+    mark_report_unscored,
+    score_pending_report,
+)
+from apps.notifications import fcm_service
+
+logger = logging.getLogger(__name__)
+
+
+@register('hazards.geocode_report', max_attempts=3)
+def geocode_report_job(report_id):
+    geocode_report(report_id)
+
+
+@register('hazards.score_report', on_failure=mark_report_unscored)
+def score_report_job(report_id):
+    score_pending_report(report_id)
+
+
+@register('notifications.new_report', max_attempts=3)
+def notify_mdrrmo_new_report(report_id):
+    """Send FCM push to all MDRRMO users about a newly scored report."""
+    report = HazardReport.objects.select_related('user').filter(pk=report_id).first()
+    if report is None or report.auto_rejected or report.is_deleted:
+        return
+    hazard_label = report.hazard_type.replace('_', ' ').title()
+    barangay = getattr(report.user, 'barangay', '') or 'Unknown Location'
+    fcm_service.send_to_role(
+        role='mdrrmo',
+        title='New Hazard Report Submitted',
+        body=f'{hazard_label} reported near Barangay {barangay}',
+        data={
+            'type': 'new_report',
+            'target': 'mdrrmo_reports',   # Flutter uses this to navigate to reports screen
+            'report_id': str(report.id),
+            'hazard_type': report.hazard_type,
+        },
+    )
+
+
+@register('notifications.report_status_push', max_attempts=3)
+def push_report_status(action, report_id):
+    """Tell the reporter their report was approved or rejected (FCM)."""
+    report = HazardReport.objects.select_related('user').filter(pk=report_id).first()
+    fcm_token = report.user.fcm_token if report is not None and report.user_id else None
+    if not fcm_token:
+        logger.debug(f'No FCM token for report {report_id} — push notification skipped')
+        return
+    if action == 'approve':
+        title, body, kind = 'Report Approved', 'Your reported hazard has been verified and approved.', 'report_approved'
+    else:
+        title, body, kind = 'Report Rejected', 'Your reported hazard was reviewed and rejected.', 'report_rejected'
+    success = fcm_service.send_push(
+        token=fcm_token,
+        title=title,
+        body=body,
+        data={
+            'type': kind,
+            'target': 'resident_notifications',
+            'report_id': str(report_id),
+        },
+    )
+    if not success:
+        logger.warning(f'FCM push failed for report {report_id} {action} (token: {fcm_token[:12]}...)')
+
+
+@register('routing.refresh_segment_risks')
+def refresh_segment_risks(latitude=None, longitude=None):
+    """
+    Refresh risk scores for road segments within SEGMENT_FEATURE_RADIUS_M of a
+    hazard that just entered or left the approved set (approve, reject, delete,
+    restore), or all segments when no point is given. Falls back to the full
+    recompute if the incremental path fails, then queues the centre-tree warm-up.
+    """
+    from apps.mobile_sync.services.route_service import (
+        recompute_all_segment_risks,
+        recompute_segment_risks_near,
+    )
+    if latitude is None or longitude is None:
+        recompute_all_segment_risks(force=True)
+    else:
+        try:
+            recompute_segment_risks_near(latitude, longitude)
+        except Exception as exc:
+            logger.warning('Incremental segment refresh failed, recomputing all: %s', exc)
+            recompute_all_segment_risks(force=True)
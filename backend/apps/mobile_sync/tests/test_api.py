@@ -250,6 +250,27 @@ class CalculateRouteAPITests(TestCase):
         # With graph that has alternative paths, backend can return multiple routes
         self.assertGreaterEqual(len(response.data['routes']), 1)
 
+    def test_calculate_route_compact(self):
+        """Compact mode encodes paths and references the risk layer by version."""
+        from core.utils import polyline
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+        data = {
+            'start_lat': 14.5995,
+            'start_lng': 120.9842,
+            'evacuation_center_id': self.center.id,
+        }
+        full = self.client.post('/api/calculate-route/', data, format='json').data
+        compact = self.client.post('/api/calculate-route/', {**data, 'compact': True}, format='json').data
+        self.assertIn('road_risk_segments', full)
+        self.assertNotIn('road_risk_segments', compact)
+        self.assertEqual(compact['risk_layer_version'], full['risk_layer_version'])
+        self.assertEqual(len(compact['routes']), len(full['routes']))
+        for c, f in zip(compact['routes'], full['routes']):
+            self.assertNotIn('path', c)
+            self.assertNotIn('path_keys', c)
+            self.assertEqual(polyline.decode(c['polyline']), f['path'])
+
     def test_calculate_route_without_auth(self):
         """Test that authentication is required."""
         data = {
@@ -343,6 +364,16 @@ class MDRRMOPendingReportsAPITests(TestCase):
         response = self.client.get('/api/mdrrmo/pending-reports/')
         self.assertEqual(response.status_code, 401)
 
+    def test_mdrrmo_can_view_route_cache_stats(self):
+        """Route cache counters are MDRRMO-only and can be reset."""
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.resident_token.key}')
+        self.assertEqual(self.client.get('/api/mdrrmo/route-cache-stats/').status_code, 403)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.mdrrmo_token.key}')
+        response = self.client.get('/api/mdrrmo/route-cache-stats/?reset=1')
+        self.assertEqual(response.status_code, 200)
+        for key in ('hits', 'misses', 'entries', 'hit_rate'):
+            self.assertIn(key, response.data)
+
 
 class MDRRMOApproveReportAPITests(TestCase):
     """Test cases for POST /api/mdrrmo/approve-report/"""
@@ -529,3 +560,91 @@ class CheckSimilarReportsAPITests(TestCase):
         returned_ids = [item.get('id') for item in response.data.get('similar_reports', [])]
         self.assertIn(fresh_report.id, returned_ids)
         self.assertNotIn(old_report.id, returned_ids)
+
+
+class RoadRiskLayerAPITests(TestCase):
+    """Test cases for the versioned road-risk-layer endpoints."""
+
+    def setUp(self):
+        from apps.mobile_sync.services import network_cache
+
+        network_cache.invalidate_network_cache()
+        self.addCleanup(network_cache.invalidate_network_cache)
+        self.client = APIClient()
+        self.user = User.objects.create_user(
+            username='layeruser',
+            email='layer@example.com',
+            password='testpass123',
+            role=User.Role.RESIDENT,
+        )
+        self.user.is_active = True
+        self.user.save(update_fields=['is_active'])
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        RoadSegment.objects.all().delete()
+        self.near = RoadSegment.objects.create(
+            start_lat=12.7000, start_lng=123.9000, end_lat=12.7010, end_lng=123.9000,
+            base_distance=111.0, predicted_risk_score=0.0,
+        )
+        self.far = RoadSegment.objects.create(
+            start_lat=12.7300, start_lng=123.9000, end_lat=12.7310, end_lng=123.9000,
+            base_distance=111.0, predicted_risk_score=0.0,
+        )
+
+    def test_layer_etag_and_not_modified(self):
+        response = self.client.get('/api/road-risk-layer/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['segment_count'], 2)
+        etag = response['ETag']
+        self.assertEqual(etag, f'"{response.json()["version"]}"')
+        again = self.client.get('/api/road-risk-layer/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b'')
+
+    def test_geometry_versioned_by_road_network(self):
+        response = self.client.get('/api/road-risk-layer/geometry/')
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(sorted(s[0] for s in body['segments']), sorted([self.near.id, self.far.id]))
+        HazardReport.objects.create(
+            user=self.user, hazard_type='road_blocked', latitude=12.7005, longitude=123.9000,
+            status=HazardReport.Status.APPROVED, final_validation_score=0.9,
+        )
+        # A hazard changes risk, not geometry.
+        again = self.client.get('/api/road-risk-layer/geometry/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, 304)
+
+    def test_delta_returns_only_changed_segments(self):
+        version = self.client.get('/api/road-risk-layer/').json()['version']
+        unchanged = self.client.get('/api/road-risk-layer/delta/', {'since': version}).json()
+        self.assertFalse(unchanged['full'])
+        self.assertEqual(unchanged['ids'], [])
+
+        HazardReport.objects.create(
+            user=self.user, hazard_type='road_blocked', latitude=12.7005, longitude=123.9000,
+            status=HazardReport.Status.APPROVED, final_validation_score=0.9,
+        )
+        delta = self.client.get('/api/road-risk-layer/delta/', {'since': version}).json()
+        self.assertNotEqual(delta['version'], version)
+        self.assertFalse(delta['full'])
+        self.assertEqual(delta['ids'], [self.near.id])
+        self.assertEqual(delta['r'], [1.0])
+
+    def test_delta_against_version_served_by_another_worker(self):
+        from apps.mobile_sync.services import network_cache
+
+        version = self.client.get('/api/road-risk-layer/').json()['version']
+        # A fresh worker process: no in-memory layer history.
+        network_cache._layer_history.clear()
+        HazardReport.objects.create(
+            user=self.user, hazard_type='road_blocked', latitude=12.7005, longitude=123.9000,
+            status=HazardReport.Status.APPROVED, final_validation_score=0.9,
+        )
+        delta = self.client.get('/api/road-risk-layer/delta/', {'since': version}).json()
+        self.assertFalse(delta['full'])
+        self.assertEqual(delta['ids'], [self.near.id])
+
+    def test_delta_unknown_version_returns_full_layer(self):
+        delta = self.client.get('/api/road-risk-layer/delta/', {'since': 'stale'}).json()
+        self.assertTrue(delta['full'])
+        self.assertEqual(len(delta['ids']), 2)
+        self.assertEqual(len(delta['r']), 2)
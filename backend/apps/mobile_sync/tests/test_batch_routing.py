@@ -0,0 +1,142 @@
+"""
+Tests for batch reachability routing (batch_routing + mdrrmo/batch-routes/).
+"""
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.evacuation.models import EvacuationCenter
+from apps.hazards.models import HazardReport
+from apps.mobile_sync.services import network_cache, route_service
+from apps.mobile_sync.services.batch_routing import resolve_barangay_origins, route_batch
+from apps.routing.models import RoadSegment
+
+
+class BatchRoutingTests(TestCase):
+    def setUp(self):
+        network_cache.invalidate_network_cache()
+        self.addCleanup(network_cache.invalidate_network_cache)
+        RoadSegment.objects.all().delete()
+        # 5 x 5 grid with distinct lengths and mixed base risks.
+        step = 0.001
+        n = 0
+        for i in range(5):
+            for j in range(5):
+                lat, lng = 12.70 + i * step, 123.90 + j * step
+                for dlat, dlng in ((step, 0), (0, step)):
+                    if i + dlat / step < 5 and j + dlng / step < 5:
+                        n += 1
+                        RoadSegment.objects.create(
+                            start_lat=lat, start_lng=lng, end_lat=lat + dlat, end_lng=lng + dlng,
+                            base_distance=111.0 + n * 0.41, predicted_risk_score=(n * 3 % 10) / 20,
+                        )
+        self.centers = [
+            EvacuationCenter.objects.create(
+                name='North', latitude=12.704, longitude=123.904, address='x',
+                municipality='Sorsogon City', barangay='Bibincahan',
+            ),
+            EvacuationCenter.objects.create(name='West', latitude=12.704, longitude=123.900, address='x'),
+        ]
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username='batch_routes_user', email='batch.routes@test.local', password='testpass123',
+            role=User.Role.MDRRMO,
+        )
+        self.user.is_active = True
+        self.user.save(update_fields=['is_active'])
+        HazardReport.objects.create(
+            user=self.user, hazard_type='flooded_road', latitude=12.7025, longitude=123.9020,
+            description='flood', status=HazardReport.Status.APPROVED, final_validation_score=0.9,
+            location_barangay='Bibincahan', location_municipality='Sorsogon City',
+        )
+        self.origins = [{'id': 'a', 'lat': 12.7001, 'lng': 123.9001}, {'lat': 12.7003, 'lng': 123.9041}]
+
+    def test_rows_match_single_route_ranking(self):
+        rows = list(route_batch(self.origins))
+        self.assertEqual(len(rows), len(self.origins) * len(self.centers))
+        self.assertEqual([r['origin_id'] for r in rows], ['a', 'a', 1, 1])
+        for row in rows:
+            origin = next(o for o in self.origins if o.get('id', 1) == row['origin_id'])
+            res = route_service.calculate_safest_routes(
+                origin['lat'], origin['lng'], row['center_id'], k=1, include_alternative_centers=False,
+            )
+            expected = round(route_service._float(res['routes'][0]['total_risk']), 4)
+            self.assertTrue(row['reachable'])
+            self.assertEqual(row['total_risk'], expected)
+            self.assertEqual(row['has_safe_route'], expected < route_service.HIGH_RISK_THRESHOLD)
+
+    def test_process_pool_matches_in_process(self):
+        origins = [{'lat': 12.700 + i * 0.0004, 'lng': 123.900 + i * 0.0003} for i in range(10)]
+        serial = list(route_batch(origins, include_polyline=True))
+        pooled = list(route_batch(origins, workers=2, include_polyline=True))
+        self.assertEqual(serial, pooled)
+        self.assertIn('polyline', serial[0])
+
+    def test_center_filter(self):
+        rows = list(route_batch(self.origins[:1], center_ids=[self.centers[1].id]))
+        self.assertEqual([r['center_name'] for r in rows], ['West'])
+
+    def test_barangay_resolution(self):
+        found, missing = resolve_barangay_origins(['bibincahan', 'Cambulaga'], 'sorsogon city')
+        self.assertEqual(found['barangay'], 'Bibincahan')
+        self.assertEqual(found['source'], 'records')
+        self.assertEqual(found['resolved_from'], 2)  # one centre + one hazard report
+        self.assertAlmostEqual(found['lat'], (12.704 + 12.7025) / 2, places=6)
+        self.assertIn('error', missing)
+        rows = list(route_batch([found, missing]))
+        self.assertEqual(len(rows), len(self.centers) + 1)
+        self.assertEqual(rows[-1]['origin_id'], 'Cambulaga')
+        self.assertIn('error', rows[-1])
+
+    def test_barangay_resolved_to_boundary_centroid(self):
+        square = [[123.90, 12.70], [123.91, 12.70], [123.91, 12.71], [123.90, 12.71], [123.90, 12.70]]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'barangays.geojson')
+            with open(path, 'w', encoding='utf-8') as fh:
+                json.dump({'type': 'FeatureCollection', 'features': [{
+                    'type': 'Feature',
+                    'properties': {'barangay': 'Bibincahan', 'municipality': 'Sorsogon City'},
+                    'geometry': {'type': 'Polygon', 'coordinates': [square]},
+                }]}, fh)
+            with override_settings(BARANGAY_BOUNDARIES_PATH=path):
+                found, fallback = resolve_barangay_origins(['bibincahan', 'Cambulaga'], 'sorsogon city')
+        self.assertEqual(found['source'], 'boundary')
+        self.assertAlmostEqual(found['lat'], 12.705, places=6)
+        self.assertAlmostEqual(found['lng'], 123.905, places=6)
+        self.assertIn('error', fallback)
+
+    def test_endpoint_streams_ndjson(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        response = client.post(
+            '/api/mdrrmo/batch-routes/',
+            {'origins': self.origins, 'barangays': ['Bibincahan']},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), 3 * len(self.centers))
+
+    def test_endpoint_requires_origins(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        response = client.post('/api/mdrrmo/batch-routes/', {}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(BATCH_ROUTE_MAX_ORIGINS=2)
+    def test_endpoint_rejects_batches_over_http_cap(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        response = client.post(
+            '/api/mdrrmo/batch-routes/',
+            {'origins': self.origins, 'barangays': ['Bibincahan']},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('batch_routes', str(response.data))
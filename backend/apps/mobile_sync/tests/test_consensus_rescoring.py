@@ -0,0 +1,91 @@
+"""
+Tests for batched consensus re-scoring of neighbouring pending reports
+(report_service.rescore_consensus_neighbourhood + confirm-hazard-report/).
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.hazards.models import HazardReport
+from apps.mobile_sync.services.report_service import rescore_consensus_neighbourhood
+from apps.validation.services.consensus import ConsensusScoringService
+from apps.validation.services.rule_scoring import combine_validation_scores, consensus_rule_score
+
+# ~100 m of longitude at this latitude.
+STEP = 0.00092
+
+
+class ConsensusRescoringTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.users = [
+            User.objects.create_user(
+                username=f'rescore_user_{i}', email=f'rescore{i}@test.local', password='testpass123',
+                role=User.Role.RESIDENT,
+            )
+            for i in range(4)
+        ]
+        User.objects.filter(pk__in=[u.pk for u in self.users]).update(is_active=True)
+        # A — B — C in a row, 100 m apart; D far away; E same spot as B but another type.
+        self.a, self.b, self.c = (self._report(self.users[i], 12.97, 124.0 + i * STEP) for i in range(3))
+        self.d = self._report(self.users[0], 12.99, 124.02)
+        self.e = self._report(self.users[1], 12.97, 124.0 + STEP, hazard_type='fallen_tree')
+
+    def _report(self, user, lat, lng, hazard_type='flooded_road'):
+        return HazardReport.objects.create(
+            user=user, hazard_type=hazard_type, latitude=f'{lat:.7f}', longitude=f'{lng:.7f}',
+            description='water on road', status=HazardReport.Status.PENDING,
+            naive_bayes_score=0.6, distance_weight=0.0, consensus_score=0.0, final_validation_score=0.3,
+            validation_breakdown={'nearby_count': 0, 'confirmation_count': 0},
+        )
+
+    def _expected(self, report):
+        support = ConsensusScoringService().get_support_summary(
+            float(report.latitude), float(report.longitude),
+            HazardReport.objects.filter(is_deleted=False).exclude(id=report.id),
+            exclude_report_id=report.id, time_window_hours=1, hazard_type=report.hazard_type,
+        )
+        consensus = consensus_rule_score(support.nearby_cluster_count, report.confirmation_count)
+        return support.nearby_cluster_count, consensus, combine_validation_scores(0.6, 0.0, consensus)
+
+    def test_neighbourhood_rescored_in_two_queries(self):
+        with self.assertNumQueries(2):
+            updated = rescore_consensus_neighbourhood(self.b)
+        self.assertEqual(updated, 3)
+        for report in (self.a, self.b, self.c):
+            report.refresh_from_db()
+            nearby, consensus, final = self._expected(report)
+            self.assertEqual(report.validation_breakdown['nearby_count'], nearby)
+            self.assertAlmostEqual(report.consensus_score, consensus)
+            self.assertAlmostEqual(report.final_validation_score, final)
+        self.assertEqual(self.b.validation_breakdown['nearby_count'], 2)
+        for untouched in (self.d, self.e):
+            untouched.refresh_from_db()
+            self.assertEqual(untouched.consensus_score, 0.0)
+
+    def test_approved_reports_support_but_are_not_rescored(self):
+        self.a.status = HazardReport.Status.APPROVED
+        self.a.save(update_fields=['status'])
+        self.assertEqual(rescore_consensus_neighbourhood(self.b), 2)
+        self.a.refresh_from_db()
+        self.assertEqual(self.a.consensus_score, 0.0)
+        self.b.refresh_from_db()
+        self.assertEqual(self.b.validation_breakdown['nearby_count'], 2)
+
+    def test_exclude_changed_report(self):
+        self.assertEqual(rescore_consensus_neighbourhood(self.a, include_changed=False), 1)
+        self.a.refresh_from_db()
+        self.assertEqual(self.a.consensus_score, 0.0)
+
+    def test_confirmation_rescores_report_and_neighbours(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.users[3]).key}')
+        response = client.post('/api/confirm-hazard-report/', {'report_id': self.a.id}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.a.refresh_from_db()
+        self.assertEqual(self.a.validation_breakdown['confirmation_count'], 1)
+        self.assertAlmostEqual(response.data['final_validation_score'], self.a.final_validation_score)
+        self.assertAlmostEqual(self.a.consensus_score, self._expected(self.a)[1])
+        self.b.refresh_from_db()
+        self.assertAlmostEqual(self.b.consensus_score, self._expected(self.b)[1])
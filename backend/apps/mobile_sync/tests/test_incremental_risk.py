@@ -0,0 +1,95 @@
+"""
+Tests for incremental segment-risk refresh after a hazard changes state.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.hazards.models import HazardReport
+from apps.mobile_sync.services import network_cache
+from apps.mobile_sync.services.route_service import (
+    recompute_all_segment_risks,
+    recompute_segment_risks_near,
+)
+from apps.routing.models import RoadSegment
+
+
+class IncrementalSegmentRiskTests(TestCase):
+    def setUp(self):
+        network_cache.invalidate_network_cache()
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username='incremental_risk_user',
+            email='incremental.risk@test.local',
+            password='testpass123',
+            role=User.Role.RESIDENT,
+        )
+        RoadSegment.objects.all().delete()
+        # A north-south street of ~111 m segments, plus one segment 2 km away.
+        for i in range(8):
+            RoadSegment.objects.create(
+                start_lat=12.7000 + i * 0.001, start_lng=123.9000,
+                end_lat=12.7010 + i * 0.001, end_lng=123.9000,
+                base_distance=111.0, predicted_risk_score=0.0,
+            )
+        self.far = RoadSegment.objects.create(
+            start_lat=12.7200, start_lng=123.9000,
+            end_lat=12.7210, end_lng=123.9000,
+            base_distance=111.0, predicted_risk_score=0.0,
+        )
+        self._hazard(12.7015, 'flooded_road')
+
+    def tearDown(self):
+        network_cache.invalidate_network_cache()
+
+    def _hazard(self, lat, hazard_type):
+        return HazardReport.objects.create(
+            user=self.user,
+            hazard_type=hazard_type,
+            latitude=lat,
+            longitude=123.9000,
+            description=hazard_type,
+            status=HazardReport.Status.APPROVED,
+            final_validation_score=0.8,
+        )
+
+    def _scores(self):
+        return dict(RoadSegment.objects.values_list('id', 'predicted_risk_score'))
+
+    def test_matches_full_recompute(self):
+        recompute_all_segment_risks()
+        before = self._scores()
+        hazard = self._hazard(12.7035, 'landslide')
+
+        updated = recompute_segment_risks_near(hazard.latitude, hazard.longitude)
+        incremental = self._scores()
+        recompute_all_segment_risks()
+        full = self._scores()
+
+        self.assertGreater(updated, 0)
+        self.assertLess(updated, RoadSegment.objects.count())
+        for seg_id, score in full.items():
+            self.assertAlmostEqual(incremental[seg_id], score, places=9)
+        self.assertNotEqual(before, full)
+
+    def test_removed_hazard_restores_scores(self):
+        recompute_all_segment_risks()
+        before = self._scores()
+        hazard = self._hazard(12.7045, 'road_blocked')
+        recompute_segment_risks_near(hazard.latitude, hazard.longitude)
+        self.assertNotEqual(before, self._scores())
+
+        hazard.is_deleted = True
+        hazard.save(update_fields=['is_deleted'])
+        recompute_segment_risks_near(hazard.latitude, hazard.longitude)
+        for seg_id, score in before.items():
+            self.assertAlmostEqual(self._scores()[seg_id], score, places=9)
+
+    def test_far_segments_untouched(self):
+        RoadSegment.objects.filter(pk=self.far.pk).update(predicted_risk_score=0.42)
+        hazard = self._hazard(12.7035, 'landslide')
+        recompute_segment_risks_near(hazard.latitude, hazard.longitude)
+        self.far.refresh_from_db()
+        self.assertEqual(self.far.predicted_risk_score, 0.42)
+
+    def test_hazard_far_from_network_updates_nothing(self):
+        self.assertEqual(recompute_segment_risks_near(13.5, 124.5), 0)
@@ -0,0 +1,112 @@
+"""
+Tests for evacuation-centre isochrones (isochrones service + isochrones/ endpoint).
+"""
+import base64
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.evacuation.models import EvacuationCenter
+from apps.hazards.models import HazardReport
+from apps.mobile_sync.services import isochrones, network_cache
+from apps.routing.models import RoadSegment
+from core.utils.geo import convex_hull
+
+
+class ConvexHullTests(SimpleTestCase):
+    def test_square_with_interior_points(self):
+        pts = [[0, 0], [0, 2], [2, 2], [2, 0], [1, 1], [1, 0], [0.5, 1.5]]
+        ring = convex_hull(pts)
+        self.assertEqual(ring[0], ring[-1])
+        self.assertEqual(sorted(map(tuple, ring[:-1])), [(0, 0), (0, 2), (2, 0), (2, 2)])
+
+    def test_degenerate(self):
+        self.assertEqual(convex_hull([[1, 1], [1, 1]]), [[1.0, 1.0]])
+
+
+class IsochroneTests(TestCase):
+    def setUp(self):
+        network_cache.invalidate_network_cache()
+        self.addCleanup(network_cache.invalidate_network_cache)
+        RoadSegment.objects.all().delete()
+        # A 20-segment north-south street of 100 m segments; the centre sits at its south end.
+        for i in range(20):
+            RoadSegment.objects.create(
+                start_lat=12.7000 + i * 0.001, start_lng=123.9000,
+                end_lat=12.7010 + i * 0.001, end_lng=123.9000,
+                base_distance=100.0, predicted_risk_score=0.0,
+            )
+        self.ec = EvacuationCenter.objects.create(name='South', latitude=12.7000, longitude=123.9000, address='x')
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username='isochrone_user', email='isochrone@test.local', password='testpass123',
+            role=User.Role.RESIDENT,
+        )
+        self.user.is_active = True
+        self.user.save(update_fields=['is_active'])
+
+    def _hazard(self, lat, hazard_type='flooded_road'):
+        return HazardReport.objects.create(
+            user=self.user, hazard_type=hazard_type, latitude=lat, longitude=123.9000,
+            description=hazard_type, status=HazardReport.Status.APPROVED, final_validation_score=0.9,
+        )
+
+    def _isochrone(self, metric, budgets=(500.0, 1000.0)):
+        snap = network_cache.get_network_snapshot()
+        return isochrones.center_isochrone(snap, self.ec, metric, budgets), snap
+
+    def test_distance_budgets(self):
+        entry, snap = self._isochrone(isochrones.METRIC_DISTANCE)
+        first, second = entry['budgets']
+        self.assertEqual((first['node_count'], first['segment_count']), (6, 5))
+        self.assertEqual((second['node_count'], second['segment_count']), (11, 10))
+        bits = base64.b64decode(first['segments'])
+        covered = [i for i in range(len(snap.segments)) if bits[i >> 3] & (1 << (i & 7))]
+        lats = sorted(float(snap.segments[i].end_lat) for i in covered)
+        self.assertAlmostEqual(lats[-1], 12.705, places=6)
+        # Collinear street: the closed ring collapses to its two ends.
+        self.assertEqual(sorted(map(tuple, second['polygon'])), [(12.7, 123.9), (12.7, 123.9), (12.71, 123.9)])
+
+    def test_hazard_inside_region_recomputes_cost(self):
+        before, _ = self._isochrone(isochrones.METRIC_COST)
+        computed = isochrones.stats()['computed']
+        self._hazard(12.7025, 'road_blocked')
+        after, _ = self._isochrone(isochrones.METRIC_COST)
+        self.assertEqual(isochrones.stats()['computed'], computed + 1)
+        self.assertLess(after['budgets'][1]['node_count'], before['budgets'][1]['node_count'])
+        isochrones.invalidate()
+        fresh, _ = self._isochrone(isochrones.METRIC_COST)
+        self.assertEqual(after, fresh)
+
+    def test_hazard_outside_region_reuses_cost(self):
+        before, _ = self._isochrone(isochrones.METRIC_COST)
+        computed = isochrones.stats()['computed']
+        self._hazard(12.7185, 'road_blocked')
+        after, _ = self._isochrone(isochrones.METRIC_COST)
+        self.assertEqual(isochrones.stats()['computed'], computed)
+        self.assertEqual(after, before)
+
+    def test_distance_ignores_hazards(self):
+        before, _ = self._isochrone(isochrones.METRIC_DISTANCE)
+        computed = isochrones.stats()['computed']
+        self._hazard(12.7025, 'road_blocked')
+        after, _ = self._isochrone(isochrones.METRIC_DISTANCE)
+        self.assertEqual(isochrones.stats()['computed'], computed)
+        self.assertEqual(after, before)
+
+    def test_endpoint(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        response = client.get('/api/isochrones/?metric=cost&budgets=300,800')
+        self.assertEqual(response.status_code, 200)
+        body = json.loads(response.content)
+        self.assertEqual(body['budgets'], [300.0, 800.0])
+        self.assertEqual(body['centers'][0]['center_id'], self.ec.id)
+        self.assertIn('risk_layer_version', body)
+        again = client.get('/api/isochrones/?metric=cost&budgets=300,800', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(client.get('/api/isochrones/?metric=time').status_code, 400)
+        self.assertEqual(client.get('/api/isochrones/?budgets=0').status_code, 400)
@@ -0,0 +1,217 @@
+"""
+Tests for the process-wide road graph cache (network_cache).
+"""
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from apps.hazards.models import HazardReport
+from apps.mobile_sync.services import network_cache
+from apps.routing.models import RoadSegment
+
+
+class NetworkSnapshotCacheTests(TestCase):
+    def setUp(self):
+        network_cache.invalidate_network_cache()
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username='network_cache_user',
+            email='network.cache@test.local',
+            password='testpass123',
+            role=User.Role.RESIDENT,
+        )
+        # Replace the seeded Bulan network with a tiny, predictable one.
+        RoadSegment.objects.all().delete()
+        RoadSegment.objects.create(
+            start_lat=12.7000, start_lng=123.9000,
+            end_lat=12.7010, end_lng=123.9000,
+            base_distance=111.0, predicted_risk_score=0.1,
+        )
+        RoadSegment.objects.create(
+            start_lat=12.7010, start_lng=123.9000,
+            end_lat=12.7020, end_lng=123.9000,
+            base_distance=111.0, predicted_risk_score=0.1,
+        )
+
+    def tearDown(self):
+        network_cache.invalidate_network_cache()
+
+    def _approved_hazard(self):
+        return HazardReport.objects.create(
+            user=self.user,
+            hazard_type='road_blocked',
+            latitude=12.7005,
+            longitude=123.9000,
+            description='blocked',
+            status=HazardReport.Status.APPROVED,
+            final_validation_score=0.9,
+        )
+
+    def test_snapshot_reused_when_nothing_changes(self):
+        first = network_cache.get_network_snapshot()
+        second = network_cache.get_network_snapshot()
+        self.assertIs(first, second)
+        self.assertEqual(len(first.segments), 2)
+
+    def test_graph_built_once_and_weights_cached_per_multiplier(self):
+        snap = network_cache.get_network_snapshot()
+        self.assertIs(snap.graph, snap.graph)
+        self.assertIs(snap.graph.weights(150.0), snap.graph.weights(150.0))
+        self.assertIsNot(snap.graph.weights(150.0), snap.graph.weights(0.0))
+
+    def test_approved_hazard_rebuilds_snapshot(self):
+        before = network_cache.get_network_snapshot()
+        self._approved_hazard()
+        after = network_cache.get_network_snapshot()
+        self.assertIsNot(before, after)
+        self.assertNotEqual(before.hazard_version, after.hazard_version)
+        self.assertEqual(before.road_version, after.road_version)
+        self.assertEqual(max(s.effective_risk for s in after.segments), 1.0)
+
+    def test_hazard_type_change_rebuilds_snapshot(self):
+        hazard = self._approved_hazard()
+        before = network_cache.get_network_snapshot()
+        HazardReport.objects.filter(pk=hazard.pk).update(hazard_type='flood')
+        after = network_cache.get_network_snapshot()
+        self.assertIsNot(before, after)
+        self.assertNotEqual(before.hazard_version, after.hazard_version)
+
+    def test_pending_hazard_does_not_rebuild(self):
+        before = network_cache.get_network_snapshot()
+        HazardReport.objects.create(
+            user=self.user,
+            hazard_type='flood',
+            latitude=12.7005,
+            longitude=123.9000,
+            description='pending flood',
+        )
+        self.assertIs(before, network_cache.get_network_snapshot())
+
+    def test_new_segment_changes_road_version(self):
+        before = network_cache.get_network_snapshot()
+        RoadSegment.objects.create(
+            start_lat=12.7020, start_lng=123.9000,
+            end_lat=12.7030, end_lng=123.9000,
+            base_distance=111.0, predicted_risk_score=0.1,
+        )
+        after = network_cache.get_network_snapshot()
+        self.assertNotEqual(before.road_version, after.road_version)
+        self.assertEqual(len(after.segments), 3)
+
+    def test_risk_payloads_shared_and_counts_match_risks(self):
+        self._approved_hazard()
+        snap = network_cache.get_network_snapshot()
+        self.assertEqual(snap.risks, [s.effective_risk for s in snap.segments])
+        self.assertEqual(sum(snap.risk_counts), 2)
+        self.assertEqual(snap.risk_counts[0], sum(1 for r in snap.risks if r >= 0.70))
+        self.assertIs(snap.route_risk_segments, snap.route_risk_segments)
+        self.assertIs(snap.risk_layer_json, snap.risk_layer_json)
+        self.assertIs(snap.high_risk_roads, snap.high_risk_roads)
+
+    def test_risk_layer_json_covers_every_segment(self):
+        import json
+
+        body = json.loads(network_cache.get_network_snapshot().risk_layer_json)
+        self.assertEqual(body['segment_count'], 2)
+        self.assertEqual(len(body['road_risk_segments']), 2)
+        self.assertTrue(all(s['r'] >= 0.04 for s in body['road_risk_segments']))
+
+    def test_high_risk_roads_name_nearest_hazard(self):
+        self._approved_hazard()
+        roads = network_cache.get_network_snapshot().high_risk_roads
+        self.assertTrue(roads)
+        self.assertEqual(roads[0]['risk_level'], 'high')
+        self.assertEqual(roads[0]['nearest_hazard']['type'], 'road_blocked')
+
+    def test_center_trees_built_per_snapshot(self):
+        from apps.evacuation.models import EvacuationCenter
+
+        EvacuationCenter.objects.create(name='Tree Center', latitude=12.7020, longitude=123.9000, address='x')
+        snap = network_cache.get_network_snapshot()
+        network_cache.ensure_center_trees(snap)
+        tree = network_cache.center_tree(snap, 12.7020, 123.9000, 150.0)
+        self.assertIsNotNone(tree)
+        self.assertIsNotNone(network_cache.center_tree(snap, 12.7020, 123.9000, 0.0))
+        self.assertEqual(tree.root, snap.graph.nearest_node(12.7020, 123.9000))
+
+        # A hazard change produces a new snapshot with no trees yet.
+        self._approved_hazard()
+        fresh = network_cache.get_network_snapshot()
+        self.assertEqual(fresh.center_trees, {})
+
+    def test_tree_miss_builds_tree_and_wakes_warmup_once(self):
+        from apps.evacuation.models import EvacuationCenter
+
+        EvacuationCenter.objects.create(name='Tree Center', latitude=12.7020, longitude=123.9000, address='x')
+        with mock.patch.object(network_cache, 'request_warmup') as wake:
+            snap = network_cache.get_network_snapshot()
+            self.assertEqual(wake.call_count, 1)  # new snapshot
+            tree = network_cache.center_tree(snap, 12.7020, 123.9000, 150.0)
+            self.assertIsNotNone(tree)
+            self.assertIs(network_cache.center_tree(snap, 12.7020, 123.9000, 150.0), tree)
+            self.assertIsNotNone(network_cache.center_tree(snap, 12.7020, 123.9000, 0.0))
+        self.assertEqual(len(snap.center_trees), 2)
+        self.assertEqual(wake.call_count, 2)
+
+    def test_warm_snapshot_builds_every_centre_tree(self):
+        from apps.evacuation.models import EvacuationCenter
+
+        EvacuationCenter.objects.create(name='North', latitude=12.7020, longitude=123.9000, address='x')
+        EvacuationCenter.objects.create(name='South', latitude=12.7000, longitude=123.9000, address='y')
+        EvacuationCenter.objects.create(
+            name='Closed', latitude=12.7010, longitude=123.9000, address='z', is_operational=False,
+        )
+        snap = network_cache.warm_snapshot()
+        self.assertIs(snap, network_cache.get_network_snapshot())
+        self.assertEqual(len(snap.center_trees), 2 * len(network_cache.CENTER_TREE_MULTIPLIERS))
+        with self.assertNumQueries(0):
+            network_cache.center_tree(snap, 12.7000, 123.9000, 0.0)
+
+    def _add_disconnected_street(self):
+        # A second, disconnected street (in a neighbouring bridge-grid cell) needs one bridge.
+        RoadSegment.objects.create(
+            start_lat=12.7300, start_lng=123.9300,
+            end_lat=12.7310, end_lng=123.9300,
+            base_distance=111.0, predicted_risk_score=0.1,
+        )
+
+    def test_stored_bridges_reapplied_with_one_query(self):
+        from apps.routing.models import RoadBridgeSet
+
+        self._add_disconnected_street()
+        self.assertEqual(network_cache.store_bridges(), 1)
+        first = network_cache.get_network_snapshot()
+        graph = first.graph
+        stored = RoadBridgeSet.objects.get(road_version=first.road_version)
+        self.assertEqual(len(stored.edges), 1)
+        self.assertEqual(len(graph.und_u), 4)
+
+        network_cache.invalidate_network_cache()
+        with self.assertNumQueries(1):
+            rebuilt = network_cache.bridged_graph(first.road_version, first.segments)
+        self.assertEqual(list(rebuilt.und_u), list(graph.und_u))
+        self.assertEqual(list(rebuilt.und_v), list(graph.und_v))
+        self.assertEqual(list(rebuilt.und_dist), list(graph.und_dist))
+
+    def test_missing_bridge_row_computed_without_writing(self):
+        from apps.routing.models import RoadBridgeSet
+
+        self._add_disconnected_street()
+        RoadBridgeSet.objects.create(road_version='old', edges=[['1.000000,1.000000', '2.000000,2.000000', 5.0]])
+        with self.assertLogs('apps.mobile_sync.services.network_cache', 'WARNING'):
+            graph = network_cache.get_network_snapshot().graph
+        self.assertEqual(len(graph.und_u), 4)
+        self.assertEqual(list(RoadBridgeSet.objects.values_list('road_version', flat=True)), ['old'])
+
+    def test_store_bridges_replaces_stale_rows(self):
+        from django.core.management import call_command
+        from apps.routing.models import RoadBridgeSet
+
+        RoadBridgeSet.objects.create(road_version='old', edges=[['1.000000,1.000000', '2.000000,2.000000', 5.0]])
+        call_command('build_road_bridges', stdout=StringIO())
+        self.assertEqual(
+            list(RoadBridgeSet.objects.values_list('road_version', flat=True)),
+            [network_cache.road_network_version()],
+        )
@@ -0,0 +1,157 @@
+"""
+Tests for the queued report pipeline: submission stores the report as
+PENDING_SCORING and queues geocoding + scoring; the jobs move it to PENDING.
+"""
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.hazards.models import HazardReport
+from apps.jobs import queue
+from apps.jobs.models import Job
+from apps.users.models import User
+
+LOCATION = {
+    'location_address': 'Main St, Zone 1',
+    'location_barangay': 'Zone 1',
+    'location_municipality': 'Bulan',
+}
+
+
+class QueuedReportFlowTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='jobs_resident', email='jobs_resident@test.local', password='testpass123',
+            role=User.Role.RESIDENT,
+        )
+        User.objects.filter(pk=self.user.pk).update(is_active=True)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+
+    def _submit(self, user_lng=120.9842):
+        return self.client.post('/api/report-hazard/', {
+            'hazard_type': 'flooded_road',
+            'latitude': 14.5995,
+            'longitude': 120.9842,
+            'description': 'Knee-deep flood water on the main road',
+            'user_latitude': 14.5995,
+            'user_longitude': user_lng,
+        }, format='json')
+
+    @override_settings(JOB_QUEUE_BACKEND='thread')
+    def test_submission_queues_scoring(self):
+        response = self._submit()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['status'], HazardReport.Status.PENDING)
+        self.assertTrue(response.data['scoring_pending'])
+        self.assertEqual(
+            HazardReport.objects.get(pk=response.data['id']).status, HazardReport.Status.PENDING_SCORING,
+        )
+        names = set(Job.objects.filter(payload__report_id=response.data['id']).values_list('name', flat=True))
+        self.assertEqual(names, {'hazards.geocode_report', 'hazards.score_report'})
+
+        with mock.patch('apps.mobile_sync.services.report_service.resolve_hazard_location', return_value=LOCATION), \
+                mock.patch('apps.notifications.fcm_service.send_to_role') as send_to_role:
+            queue.run_pending()
+
+        report = HazardReport.objects.get(pk=response.data['id'])
+        self.assertEqual(report.status, HazardReport.Status.PENDING)
+        self.assertEqual(report.location_barangay, 'Zone 1')
+        self.assertGreater(report.final_validation_score, 0)
+        self.assertIn('system_decision', report.validation_breakdown)
+        send_to_role.assert_called_once()
+        self.assertFalse(Job.objects.exclude(status=Job.Status.DONE).exists())
+
+    @override_settings(JOB_QUEUE_BACKEND='thread')
+    def test_report_awaiting_scoring_counts_as_pending(self):
+        response = self._submit()
+        mine = self.client.get('/api/my-reports/')
+        self.assertEqual(mine.data[0]['status'], HazardReport.Status.PENDING)
+
+        mdrrmo = User.objects.create_user(
+            username='jobs_mdrrmo', email='jobs_mdrrmo@test.local', password='testpass123',
+            role=User.Role.MDRRMO,
+        )
+        User.objects.filter(pk=mdrrmo.pk).update(is_active=True)
+        admin = APIClient()
+        admin.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=mdrrmo).key}')
+        detail = admin.get(f'/api/mdrrmo/users/{self.user.pk}/')
+        self.assertEqual(detail.status_code, 200)
+        self.assertEqual(detail.data['total_reports'], 1)
+        self.assertEqual(detail.data['pending_reports'], 1)
+        self.assertEqual(response.data['id'], mine.data[0]['id'])
+
+    @override_settings(JOB_QUEUE_BACKEND='thread')
+    def test_far_reporter_rejected_without_scoring_job(self):
+        response = self._submit(user_lng=120.9942)
+        self.assertEqual(response.status_code, 201)
+        report = HazardReport.objects.get(pk=response.data['id'])
+        self.assertEqual(report.status, HazardReport.Status.REJECTED)
+        self.assertTrue(report.auto_rejected)
+        self.assertFalse(Job.objects.filter(name='hazards.score_report').exists())
+
+    @override_settings(JOB_QUEUE_BACKEND='sync')
+    def test_sync_backend_scores_before_response(self):
+        with mock.patch('apps.mobile_sync.services.report_service.resolve_hazard_location', return_value=LOCATION), \
+                mock.patch('apps.notifications.fcm_service.send_to_role'):
+            response = self._submit()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['status'], HazardReport.Status.PENDING)
+        self.assertFalse(response.data['scoring_pending'])
+        self.assertEqual(response.data['location_barangay'], 'Zone 1')
+
+    @override_settings(JOB_QUEUE_BACKEND='thread')
+    def test_failed_geocode_is_retried(self):
+        response = self._submit()
+        with mock.patch(
+            'apps.mobile_sync.services.report_service.resolve_hazard_location',
+            return_value={k: '' for k in LOCATION},
+        ), mock.patch('apps.notifications.fcm_service.send_to_role'):
+            queue.run_pending()
+        job = Job.objects.get(name='hazards.geocode_report', payload__report_id=response.data['id'])
+        self.assertEqual(job.status, Job.Status.PENDING)
+        self.assertEqual(job.attempts, 1)
+        self.assertEqual(
+            HazardReport.objects.get(pk=response.data['id']).status, HazardReport.Status.PENDING,
+        )
+
+    @override_settings(JOB_QUEUE_BACKEND='thread', JOB_QUEUE_RETRY_SECONDS=0)
+    def test_failed_scoring_hands_report_to_mdrrmo_unscored(self):
+        response = self._submit()
+        with mock.patch(
+            'apps.mobile_sync.services.report_service.NaiveBayesValidator', side_effect=RuntimeError('model'),
+        ), mock.patch(
+            'apps.mobile_sync.services.report_service.resolve_hazard_location', return_value=LOCATION,
+        ), mock.patch('apps.notifications.fcm_service.send_to_role') as send_to_role:
+            while queue.run_pending():
+                pass
+        job = Job.objects.get(name='hazards.score_report', payload__report_id=response.data['id'])
+        self.assertEqual(job.status, Job.Status.FAILED)
+        report = HazardReport.objects.get(pk=response.data['id'])
+        self.assertEqual(report.status, HazardReport.Status.PENDING)
+        self.assertTrue(report.validation_breakdown['unscored'])
+        self.assertIsNone(report.final_validation_score)
+        send_to_role.assert_called_once()
+
+    @override_settings(JOB_QUEUE_BACKEND='thread', REVERSE_GEOCODE_NOMINATIM=False)
+    def test_barangay_resolved_offline_at_submission(self):
+        square = [[120.98, 14.59], [120.99, 14.59], [120.99, 14.60], [120.98, 14.60], [120.98, 14.59]]
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'barangays.geojson')
+            with open(path, 'w', encoding='utf-8') as fh:
+                json.dump({'type': 'FeatureCollection', 'features': [{
+                    'type': 'Feature',
+                    'properties': {'barangay': 'Zone 1', 'municipality': 'Bulan'},
+                    'geometry': {'type': 'Polygon', 'coordinates': [square]},
+                }]}, fh)
+            with override_settings(BARANGAY_BOUNDARIES_PATH=path):
+                response = self._submit()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['location_barangay'], 'Zone 1 (Pob.)')
+        self.assertEqual(response.data['location_municipality'], 'Bulan')
+        self.assertFalse(Job.objects.filter(name='hazards.geocode_report').exists())
@@ -0,0 +1,109 @@
+"""
+Tests for the calculate_safest_routes result cache (route_cache).
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from apps.evacuation.models import EvacuationCenter
+from apps.hazards.models import HazardReport
+from apps.mobile_sync.services import network_cache, route_cache
+from apps.mobile_sync.services.route_service import calculate_safest_routes
+from apps.routing.models import RoadSegment
+
+
+class RouteResultCacheTests(TestCase):
+    def setUp(self):
+        network_cache.invalidate_network_cache()
+        self.addCleanup(network_cache.invalidate_network_cache)
+        route_cache.reset_stats()
+        RoadSegment.objects.all().delete()
+        # 4 x 4 grid of ~111 m segments.
+        step = 0.001
+        for i in range(4):
+            for j in range(4):
+                lat, lng = 12.70 + i * step, 123.90 + j * step
+                if i < 3:
+                    RoadSegment.objects.create(
+                        start_lat=lat, start_lng=lng, end_lat=lat + step, end_lng=lng,
+                        base_distance=111.0 + i + j, predicted_risk_score=0.0,
+                    )
+                if j < 3:
+                    RoadSegment.objects.create(
+                        start_lat=lat, start_lng=lng, end_lat=lat, end_lng=lng + step,
+                        base_distance=109.0 + i * 2 + j, predicted_risk_score=0.0,
+                    )
+        self.ec = EvacuationCenter.objects.create(
+            name='Cache Center', latitude=12.703, longitude=123.903, address='x',
+        )
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username='route_cache_user', email='route.cache@test.local', password='testpass123',
+            role=User.Role.RESIDENT,
+        )
+
+    def _route(self, lat=12.70001, lng=123.90001, **kwargs):
+        return calculate_safest_routes(lat, lng, self.ec.id, k=3, **kwargs)
+
+    def test_points_snapping_to_same_node_share_result(self):
+        first = self._route(12.70001, 123.90001)
+        second = self._route(12.70003, 123.89998)
+        self.assertEqual(first['routes'], second['routes'])
+        stats = route_cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+
+    def test_other_start_node_or_k_misses(self):
+        self._route()
+        self._route(12.702, 123.900)
+        calculate_safest_routes(12.70001, 123.90001, self.ec.id, k=1)
+        self.assertEqual(route_cache.stats()['hits'], 0)
+
+    def test_hazard_approval_invalidates(self):
+        before = self._route()
+        HazardReport.objects.create(
+            user=self.user, hazard_type='road_blocked', latitude=12.7005, longitude=123.9000,
+            description='blocked', status=HazardReport.Status.APPROVED, final_validation_score=0.9,
+        )
+        after = self._route()
+        stats = route_cache.stats()
+        self.assertEqual(stats['hits'], 0)
+        self.assertEqual(stats['entries'], 1)  # the old version's entry was dropped
+        self.assertNotEqual(before['risk_layer_version'], after['risk_layer_version'])
+
+    def test_center_edit_invalidates(self):
+        self._route()
+        self.ec.name = 'Renamed Center'
+        self.ec.save()
+        result = self._route()
+        self.assertEqual(route_cache.stats()['hits'], 0)
+        self.assertEqual(result['evacuation_center_name'], 'Renamed Center')
+
+    def test_compact_hit_does_not_alter_cached_result(self):
+        full = self._route()
+        compact = self._route(compact=True)
+        again = self._route()
+        self.assertEqual(route_cache.stats()['hits'], 2)
+        self.assertIn('polyline', compact['routes'][0])
+        self.assertNotIn('path', compact['routes'][0])
+        self.assertEqual(again['routes'], full['routes'])
+        self.assertIn('road_risk_segments', again)
+
+    @override_settings(ROUTE_CACHE_SIZE=1)
+    def test_lru_eviction(self):
+        self._route()
+        self._route(12.702, 123.900)
+        self._route()
+        stats = route_cache.stats()
+        self.assertEqual((stats['hits'], stats['evictions'], stats['entries']), (0, 2, 1))
+
+    @override_settings(ROUTE_CACHE_TTL_SECONDS=0)
+    def test_expired_entry_misses(self):
+        self._route()
+        self._route()
+        stats = route_cache.stats()
+        self.assertEqual((stats['hits'], stats['expired']), (0, 1))
+
+    @override_settings(ROUTE_CACHE_SIZE=0)
+    def test_disabled(self):
+        self._route()
+        self._route()
+        self.assertEqual(route_cache.stats()['entries'], 0)
@@ -0,0 +1,106 @@
+"""
+Tests for routing stage timings and sampled diagnostics (route_metrics).
+"""
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from apps.evacuation.models import EvacuationCenter
+from apps.hazards.models import HazardReport
+from apps.mobile_sync.services import network_cache, route_cache, route_metrics
+from apps.mobile_sync.services.route_service import calculate_safest_routes
+from apps.routing.models import RoadSegment
+
+
+class HistogramTests(SimpleTestCase):
+    def setUp(self):
+        route_metrics.reset()
+        self.addCleanup(route_metrics.reset)
+
+    def test_percentiles_within_bucket_error(self):
+        for ms in range(1, 1001):
+            route_metrics.record('search', ms / 1000.0)
+        row = route_metrics.summary()['search']
+        self.assertEqual(row['count'], 1000)
+        self.assertAlmostEqual(row['mean_ms'], 500.5)
+        self.assertEqual((row['min_ms'], row['max_ms']), (1.0, 1000.0))
+        for q, exact in ((50, 500), (90, 900), (99, 990)):
+            self.assertGreaterEqual(row[f'p{q}_ms'], exact)
+            self.assertLessEqual(row[f'p{q}_ms'], exact * 1.19)
+
+    def test_timer_and_stage_order(self):
+        with route_metrics.timer('total'):
+            pass
+        route_metrics.record('db', 0.002)
+        self.assertEqual(list(route_metrics.summary()), ['db', 'total'])
+
+    @override_settings(ROUTE_DIAGNOSTICS_SAMPLE_RATE=0)
+    def test_sampling_disabled(self):
+        self.assertFalse(any(route_metrics.sampled() for _ in range(100)))
+
+
+class RouteStageTimingTests(TestCase):
+    def setUp(self):
+        network_cache.invalidate_network_cache()
+        self.addCleanup(network_cache.invalidate_network_cache)
+        route_metrics.reset()
+        self.addCleanup(route_metrics.reset)
+        RoadSegment.objects.all().delete()
+        step = 0.001
+        for i in range(3):
+            for j in range(3):
+                lat, lng = 12.70 + i * step, 123.90 + j * step
+                if i < 2:
+                    RoadSegment.objects.create(
+                        start_lat=lat, start_lng=lng, end_lat=lat + step, end_lng=lng,
+                        base_distance=111.0 + j, predicted_risk_score=0.0,
+                    )
+                if j < 2:
+                    RoadSegment.objects.create(
+                        start_lat=lat, start_lng=lng, end_lat=lat, end_lng=lng + step,
+                        base_distance=109.0 + i, predicted_risk_score=0.0,
+                    )
+        self.ec = EvacuationCenter.objects.create(name='Timing Center', latitude=12.702, longitude=123.902, address='x')
+        User = get_user_model()
+        self.user = User.objects.create_user(
+            username='route_timing_user', email='route.timing@test.local', password='testpass123',
+            role=User.Role.MDRRMO,
+        )
+        self.user.is_active = True
+        self.user.save(update_fields=['is_active'])
+        HazardReport.objects.create(
+            user=self.user, hazard_type='flooded_road', latitude=12.7005, longitude=123.9000,
+            description='flood', status=HazardReport.Status.APPROVED, final_validation_score=0.9,
+        )
+
+    @override_settings(ROUTE_DIAGNOSTICS_SAMPLE_RATE=0)
+    def test_stages_recorded_and_cache_hit_skips_search(self):
+        route_cache.invalidate()
+        with self.assertNoLogs('routing.diagnostics'):
+            calculate_safest_routes(12.7001, 123.9001, self.ec.id, k=3)
+            calculate_safest_routes(12.7001, 123.9001, self.ec.id, k=3)
+        stages = route_metrics.summary()
+        for stage in ('db', 'fetch', 'risk', 'graph_build', 'bridge', 'search', 'post', 'serialize', 'total'):
+            self.assertIn(stage, stages)
+        self.assertEqual(stages['total']['count'], 2)
+        self.assertEqual(stages['search']['count'], 1)
+
+    @override_settings(ROUTE_DIAGNOSTICS_SAMPLE_RATE=1)
+    def test_sampled_request_logs_diagnostics(self):
+        route_cache.invalidate()
+        with self.assertLogs('routing.diagnostics', level='INFO') as logs:
+            calculate_safest_routes(12.7001, 123.9001, self.ec.id, k=3)
+        output = '\n'.join(logs.output)
+        self.assertIn('[ROUTE_HAZARD]', output)
+        self.assertIn('[ROUTE_CANDIDATES]', output)
+        self.assertIn('[ROUTE_TIMING]', output)
+
+    def test_endpoint(self):
+        calculate_safest_routes(12.7001, 123.9001, self.ec.id, k=1)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        response = client.get('/api/mdrrmo/route-timings/?reset=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('p99_ms', response.data['stages']['total'])
+        self.assertEqual(route_metrics.summary(), {})
@@ -1,4 +1,5 @@
 from types import SimpleNamespace
+from unittest import mock
 
 from django.contrib.auth import get_user_model
 from django.test import SimpleTestCase
@@ -130,6 +131,114 @@ class SegmentRiskComputationTests(SimpleTestCase):
         self.assertEqual(risk, 1.0)
 
 
+class BatchSegmentRiskTests(SimpleTestCase):
+    """calculate_segment_risks() must equal calculate_segment_risk() per segment."""
+
+    def test_batch_matches_scalar(self):
+        import random
+
+        rnd = random.Random(11)
+        segments = [
+            SimpleNamespace(
+                start_lat=12.70 + i * 0.0007, start_lng=123.90 + (i % 5) * 0.0004,
+                end_lat=12.7006 + i * 0.0007, end_lng=123.9003 + (i % 5) * 0.0004,
+                predicted_risk_score=rnd.choice([0.0, 0.2, 0.6, 1.3]),
+            )
+            for i in range(40)
+        ]
+        # Degenerate (zero-length) segment.
+        segments.append(SimpleNamespace(
+            start_lat=12.71, start_lng=123.90, end_lat=12.71, end_lng=123.90, predicted_risk_score=0.4,
+        ))
+        types = list(route_service.HAZARD_INFLUENCE_RADIUS) + ['Road Blocked', 'Flooded Road', 'unknown', None]
+        hazards = [
+            SimpleNamespace(
+                hazard_type=rnd.choice(types),
+                latitude=12.70 + rnd.random() * 0.03,
+                longitude=123.90 + rnd.random() * 0.002,
+                final_validation_score=rnd.choice([None, rnd.random()]),
+                status=rnd.choice(['approved', 'pending']),
+            )
+            for _ in range(30)
+        ]
+        hazards.append(SimpleNamespace(
+            hazard_type='flood', latitude=12.7101, longitude=123.90,
+            final_validation_score=0.9, status='approved',
+        ))
+
+        expected = [route_service.calculate_segment_risk(seg, hazards) for seg in segments]
+        self.assertEqual(route_service.calculate_segment_risks(segments, hazards), expected)
+        self.assertIn(1.0, expected)
+        self.assertTrue(any(0.0 < r < 1.0 for r in expected))
+
+    def test_empty_inputs(self):
+        segment = SegmentRiskComputationTests._segment()
+        self.assertEqual(route_service.calculate_segment_risks([], []), [])
+        self.assertEqual(
+            route_service.calculate_segment_risks([segment], []),
+            [route_service.calculate_segment_risk(segment, [])],
+        )
+
+
+class VectorizedRouteDiagnosticsTests(SimpleTestCase):
+    """Vectorized hazard-to-route distances must equal the scalar per-segment loop."""
+
+    def setUp(self):
+        import random
+
+        rnd = random.Random(19)
+        self.path = [[12.70, 123.90]]
+        for _ in range(120):
+            lat, lng = self.path[-1]
+            self.path.append([round(lat + rnd.uniform(-0.0003, 0.0009), 6), round(lng + rnd.uniform(-0.0003, 0.0009), 6)])
+        self.path.append(list(self.path[-1]))  # degenerate last segment
+        types = list(route_service.HAZARD_INFLUENCE_RADIUS) + ['Road Blocked', 'unknown', None]
+        self.hazards = [
+            SimpleNamespace(
+                id=i, hazard_type=rnd.choice(types),
+                latitude=12.70 + rnd.uniform(-0.005, 0.09), longitude=123.90 + rnd.uniform(-0.005, 0.09),
+                final_validation_score=rnd.random(), status='approved',
+            )
+            for i in range(150)
+        ]
+        for i, (lat, lng) in enumerate(self.path[::10]):
+            self.hazards.append(SimpleNamespace(
+                id=1000 + i, hazard_type=rnd.choice(types),
+                latitude=lat + rnd.uniform(-0.0004, 0.0004), longitude=lng + rnd.uniform(-0.0004, 0.0004),
+                final_validation_score=rnd.random(), status='approved',
+            ))
+
+    def test_distances_match_scalar(self):
+        lats = [h.latitude for h in self.hazards]
+        lngs = [h.longitude for h in self.hazards]
+        expected = [route_service._distance_to_route_polyline_m(self.path, la, ln)[0] for la, ln in zip(lats, lngs)]
+        self.assertEqual(route_service._route_hazard_distances(self.path, lats, lngs), expected)
+
+    def test_small_blocks_match(self):
+        lats = [h.latitude for h in self.hazards]
+        lngs = [h.longitude for h in self.hazards]
+        expected = route_service._route_hazard_distances(self.path, lats, lngs)
+        with mock.patch.object(route_service, '_DISTANCE_BLOCK_PAIRS', 500):
+            self.assertEqual(route_service._route_hazard_distances(self.path, lats, lngs), expected)
+
+    def test_prefilter_keeps_every_included_hazard(self):
+        full = route_service._route_hazard_diagnostics(self.path, self.hazards)
+        near = route_service._route_hazard_diagnostics(self.path, self.hazards, near_only=True)
+        self.assertEqual(len(full), len(self.hazards))
+        self.assertLess(len(near), len(full))
+        included = [d for d in full if d['included']]
+        self.assertTrue(included)
+        self.assertEqual([d for d in near if d['included']], included)
+        self.assertEqual(
+            route_service._path_based_hazard_risk(self.path, self.hazards),
+            route_service._path_based_hazard_risk(self.path, self.hazards, diagnostics=full),
+        )
+        self.assertEqual(
+            route_service._hazards_along_path(self.path, self.hazards),
+            route_service._hazards_along_path(self.path, self.hazards, diagnostics=full),
+        )
+
+
 class ApprovedHazardFilteringTests(TestCase):
     def setUp(self):
         User = get_user_model()
@@ -166,3 +275,54 @@ class ApprovedHazardFilteringTests(TestCase):
 
         self.assertIn(approved_kept.id, ids)
         self.assertEqual(ids, {approved_kept.id})
+
+
+class AlternativeCentersTests(TestCase):
+    """One-to-many alternatives must rank centres exactly like per-centre requests."""
+
+    def setUp(self):
+        from apps.evacuation.models import EvacuationCenter
+        from apps.mobile_sync.services import network_cache
+        from apps.routing.models import RoadSegment
+
+        network_cache.invalidate_network_cache()
+        self.addCleanup(network_cache.invalidate_network_cache)
+        RoadSegment.objects.all().delete()
+        # 6 x 6 grid with distinct lengths so every shortest path is unique.
+        step = 0.001
+        n = 0
+        for i in range(6):
+            for j in range(6):
+                lat, lng = 12.70 + i * step, 123.90 + j * step
+                for dlat, dlng in ((step, 0), (0, step)):
+                    if lat + dlat < 12.70 + 6 * step - 1e-9 and lng + dlng < 123.90 + 6 * step - 1e-9:
+                        n += 1
+                        RoadSegment.objects.create(
+                            start_lat=lat, start_lng=lng, end_lat=lat + dlat, end_lng=lng + dlng,
+                            base_distance=111.0 + n * 0.37, predicted_risk_score=(n * 7 % 10) / 20,
+                        )
+        self.centers = [
+            EvacuationCenter.objects.create(name=f'Center {c}', latitude=lat, longitude=lng, address='x')
+            for c, (lat, lng) in enumerate([(12.700, 123.905), (12.705, 123.900), (12.705, 123.905), (12.703, 123.902)])
+        ]
+        User = get_user_model()
+        user = User.objects.create_user(
+            username='alt_centers_user', email='alt.centers@test.local', password='testpass123',
+            role=User.Role.RESIDENT,
+        )
+        HazardReport.objects.create(
+            user=user, hazard_type='flooded_road', latitude=12.7025, longitude=123.9020,
+            description='flood', status=HazardReport.Status.APPROVED, final_validation_score=0.9,
+        )
+
+    def test_matches_per_center_route_calculation(self):
+        exclude = self.centers[0].id
+        alternatives = route_service._get_alternative_centers(12.7001, 123.9001, exclude, limit=5)
+        self.assertEqual(len(alternatives), 3)
+        for alt in alternatives:
+            res = route_service.calculate_safest_routes(
+                12.7001, 123.9001, alt['center_id'], k=1, include_alternative_centers=False,
+            )
+            expected = round(route_service._float(res['routes'][0]['total_risk']), 4)
+            self.assertEqual(alt['best_route_risk'], expected, msg=alt['center_name'])
+            self.assertEqual(alt['has_safe_route'], expected < route_service.HIGH_RISK_THRESHOLD)
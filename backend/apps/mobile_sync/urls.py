@@ -25,6 +25,8 @@ urlpatterns = [
     path('mdrrmo/reports/<int:report_id>/', views.mdrrmo_delete_report, name='mdrrmo_delete_report'),
     path('mdrrmo/reports/<int:report_id>/media/', views.admin_report_media, name='admin_report_media'),
     path('mdrrmo/high-risk-roads/', views.mdrrmo_high_risk_roads, name='mdrrmo_high_risk_roads'),
+    path('mdrrmo/route-cache-stats/', views.mdrrmo_route_cache_stats, name='mdrrmo_route_cache_stats'),
+    path('mdrrmo/route-timings/', views.mdrrmo_route_timings, name='mdrrmo_route_timings'),
     
     # Evacuation centers (Public - Read only operational centers)
     path('evacuation-centers/', views.evacuation_centers, name='evacuation_centers'),
@@ -39,7 +41,11 @@ urlpatterns = [
     
     # Routing
     path('calculate-route/', views.calculate_route, name='calculate_route'),
+    path('mdrrmo/batch-routes/', views.mdrrmo_batch_routes, name='mdrrmo_batch_routes'),
     path('road-risk-layer/', views.road_risk_layer, name='road_risk_layer'),
+    path('road-risk-layer/geometry/', views.road_risk_layer_geometry, name='road_risk_layer_geometry'),
+    path('road-risk-layer/delta/', views.road_risk_layer_delta, name='road_risk_layer_delta'),
+    path('isochrones/', views.isochrones, name='isochrones'),
     path('check-road-data/', views.check_road_data, name='check_road_data'),
 
     # FCM push notification token registration
@@ -10,7 +10,6 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 
 import logging
-import threading
 
 logger = logging.getLogger(__name__)
 
@@ -30,16 +29,17 @@ from apps.hazards.serializers import (
     PublicHazardSerializer,
     SimilarReportPublicSerializer,
 )
+from apps.jobs import queue as jobs
 from apps.routing.models import RouteLog
-from apps.routing.serializers import CalculateRouteRequestSerializer
+from apps.routing.serializers import BatchRouteRequestSerializer, CalculateRouteRequestSerializer
 from apps.mobile_sync.services.report_service import (
     process_new_report,
     DuplicateHazardReportError,
 )
-from apps.mobile_sync.services.route_service import calculate_safest_routes
+from apps.mobile_sync.services import route_metrics
+from apps.mobile_sync.services.route_service import calculate_safest_routes, diagnostics_log
 from apps.mobile_sync.services.bootstrap_service import get_bootstrap_data
 from apps.notifications.models import Notification
-from apps.notifications import fcm_service
 from apps.users.serializers import MdrrmoUserListSerializer
 
 
@@ -58,90 +58,48 @@ def _optional_form_float(data, key):
     return v
 
 
-def _sync_recompute_segment_risks():
+def _refresh_segment_risks_async(latitude=None, longitude=None):
     """
-    Synchronously refresh all road segment risk scores.
-    Called inline (before the HTTP response is sent) after any MDRRMO action
-    that changes the approved-hazard set, guaranteeing zero stale-score window.
-    Fast enough for Bulan's ~600-segment road network (<100 ms typical).
+    Queue a segment-risk refresh around a hazard that entered or left the
+    approved set (all segments when no point is given). Web processes warm
+    their centre trees for the new scores themselves (network_cache.start_warmup).
     """
-    try:
-        from apps.mobile_sync.services.route_service import recompute_all_segment_risks
-        recompute_all_segment_risks(force=True)
-    except Exception as exc:  # pragma: no cover
-        import logging
-        logging.getLogger(__name__).warning('Segment recompute failed: %s', exc)
-
-
-def _notify_mdrrmo_new_report_async(report):
-    """Send FCM push to all MDRRMO users in a background thread (non-blocking)."""
-    def _send():
-        hazard_label = report.hazard_type.replace('_', ' ').title()
-        barangay = getattr(report.user, 'barangay', '') or 'Unknown Location'
-        fcm_service.send_to_role(
-            role='mdrrmo',
-            title='New Hazard Report Submitted',
-            body=f'{hazard_label} reported near Barangay {barangay}',
-            data={
-                'type': 'new_report',
-                'target': 'mdrrmo_reports',   # Flutter uses this to navigate to reports screen
-                'report_id': str(report.id),
-                'hazard_type': report.hazard_type,
-            },
+    if latitude is None or longitude is None:
+        jobs.enqueue('routing.refresh_segment_risks', dedupe_key='all')
+    else:
+        jobs.enqueue(
+            'routing.refresh_segment_risks',
+            {'latitude': float(latitude), 'longitude': float(longitude)},
         )
-    threading.Thread(target=_send, daemon=True).start()
 
 
-def _fire_approve_reject_background(action: str, fcm_token: str | None, report_id: int) -> None:
-    """Send resident FCM push and refresh segment risks in a background thread.
+def _warm_center_trees_async():
+    """
+    Wake this process's warm-up thread after an evacuation centre changes; other
+    web processes pick the change up on their next poll (ROUTING_WARM_POLL_SECONDS).
+    """
+    from apps.mobile_sync.services.network_cache import request_warmup
+
+    request_warmup()
+
 
-    Both operations are fire-and-forget: a slow FCM network call or a DB-heavy
-    risk recompute must NOT block the HTTP response that confirms the approve/reject
+def _fire_approve_reject_background(action: str, report_id: int, latitude=None, longitude=None) -> None:
+    """Queue the resident FCM push and the segment-risk refresh.
+
+    Both are fire-and-forget: a slow FCM network call or a DB-heavy risk
+    recompute must NOT block the HTTP response that confirms the approve/reject
     action to the MDRRMO operator.
     """
-    def _work():
-        if fcm_token:
-            try:
-                if action == 'approve':
-                    success = fcm_service.send_push(
-                        token=fcm_token,
-                        title='Report Approved',
-                        body='Your reported hazard has been verified and approved.',
-                        data={
-                            'type': 'report_approved',
-                            'target': 'resident_notifications',
-                            'report_id': str(report_id),
-                        },
-                    )
-                    if not success:
-                        logger.warning(f'FCM push failed for report {report_id} approval (token: {fcm_token[:12]}...)')
-                else:
-                    success = fcm_service.send_push(
-                        token=fcm_token,
-                        title='Report Rejected',
-                        body='Your reported hazard was reviewed and rejected.',
-                        data={
-                            'type': 'report_rejected',
-                            'target': 'resident_notifications',
-                            'report_id': str(report_id),
-                        },
-                    )
-                    if not success:
-                        logger.warning(f'FCM push failed for report {report_id} rejection (token: {fcm_token[:12]}...)')
-            except Exception as e:
-                logger.error(f'FCM push exception for report {report_id}: {e}')
-        else:
-            logger.debug(f'No FCM token for report {report_id} — push notification skipped')
-        _sync_recompute_segment_risks()
-
-    threading.Thread(target=_work, daemon=True).start()
+    jobs.enqueue('notifications.report_status_push', {'action': action, 'report_id': report_id})
+    _refresh_segment_risks_async(latitude, longitude)
 
 
 def _compute_effective_risk_counts():
     """Return (high, moderate, low) segment counts using effective_risk.
 
-    Uses the same calculate_segment_risk() formula as the road-risk-layer endpoint
-    and the routing algorithm, so Dashboard, Analytics, and Map all agree.
+    Read from the shared network snapshot, whose risks come from the same
+    calculate_segment_risk() formula as the road-risk-layer endpoint and the
+    routing algorithm, so Dashboard, Analytics, and Map all agree.
 
     Thresholds (matching the map colour bands):
         high_risk     : effective_risk >= 0.70  (red)
@@ -149,25 +107,8 @@ def _compute_effective_risk_counts():
         low_risk      : effective_risk < 0.30  (green)
     """
     try:
-        from apps.routing.models import RoadSegment
-        from apps.mobile_sync.services.route_service import (
-            calculate_segment_risk,
-            _get_approved_hazards,
-        )
-        segments = list(RoadSegment.objects.all())
-        if not segments:
-            return 0, 0, 0
-        approved_hazards = _get_approved_hazards()
-        high = moderate = low = 0
-        for seg in segments:
-            er = calculate_segment_risk(seg, approved_hazards)
-            if er >= 0.70:
-                high += 1
-            elif er >= 0.30:
-                moderate += 1
-            else:
-                low += 1
-        return high, moderate, low
+        from apps.mobile_sync.services.network_cache import get_network_snapshot
+        return get_network_snapshot().risk_counts
     except Exception:
         return 0, 0, 0
 
@@ -289,10 +230,6 @@ def report_hazard(request):
                 status=status.HTTP_409_CONFLICT,
             )
 
-        # Notify MDRRMO staff via push notification (non-blocking thread)
-        if not report.auto_rejected:
-            _notify_mdrrmo_new_report_async(report)
-
         payload = HazardReportSerializer(report).data
         return Response(payload, status=status.HTTP_201_CREATED)
     except Exception as e:
@@ -326,9 +263,14 @@ def evacuation_centers(request):
 def calculate_route(request):
     """
     POST /api/calculate-route/
-    Body: start_lat, start_lng, evacuation_center_id
+    Body: start_lat, start_lng, evacuation_center_id, compact?
     Returns 3 safest routes with risk level (Green/Yellow/Red).
 
+    Every response carries risk_layer_version. With compact=true each route has
+    an encoded 'polyline' (precision 6) instead of path / path_keys, and
+    road_risk_segments is omitted; resolve risk_layer_version against the
+    cached road-risk layer (road-risk-layer/delta/?since=...) instead.
+
     The response includes a 'snap_info' object with diagnostic details:
       user_lat/lng       - coordinates received from the client
       user_snap_node     - nearest road-graph node to user
@@ -346,10 +288,15 @@ def calculate_route(request):
     data = serializer.validated_data
     ec_id = data['evacuation_center_id']
     try:
+        from apps.mobile_sync.services.network_cache import get_network_snapshot
+
+        snapshot = get_network_snapshot()
         result = calculate_safest_routes(
             data['start_lat'], data['start_lng'],
             ec_id,
             k=3,
+            compact=data['compact'],
+            snapshot=snapshot,
         )
     except Exception as exc:
         import traceback
@@ -363,14 +310,8 @@ def calculate_route(request):
             status=status.HTTP_404_NOT_FOUND,
         )
 
-    # Convert path_keys to path (coordinate arrays) for Flutter
-    for route in result.get('routes', []):
-        path_keys = route.get('path_keys', [])
-        route['path'] = [[float(key.split(',')[0]), float(key.split(',')[1])] for key in path_keys]
-
     # ── Snap-distance diagnostics (helps detect wrong EC coordinates) ──────────
     try:
-        from apps.routing.models import RoadSegment
         from core.utils.geo import haversine_meters
         from apps.evacuation.models import EvacuationCenter as _EC
 
@@ -378,10 +319,13 @@ def calculate_route(request):
         start_lng_f = float(data['start_lng'])
         ec_obj = _EC.objects.filter(pk=ec_id).first()
 
-        # Road-graph bounding box from the 3 247 stored segments
-        # (computed once; values match mock_road_network.json bounds)
-        GRAPH_MIN_LAT, GRAPH_MAX_LAT = 12.6407702, 12.7225778
-        GRAPH_MIN_LNG, GRAPH_MAX_LNG = 123.8578030, 123.9422168
+        # Same graph and spatial index that routing just snapped against.
+        graph = snapshot.graph
+        node_index = graph.spatial_index
+        if node_index.bounds is not None:
+            GRAPH_MIN_LAT, GRAPH_MAX_LAT, GRAPH_MIN_LNG, GRAPH_MAX_LNG = node_index.bounds
+        else:
+            GRAPH_MIN_LAT = GRAPH_MAX_LAT = GRAPH_MIN_LNG = GRAPH_MAX_LNG = 0.0
 
         snap_info = {
             'user_lat': start_lat_f,
@@ -392,29 +336,23 @@ def calculate_route(request):
             'ec_lng': float(ec_obj.longitude) if ec_obj else None,
             'ec_snap_node': None,
             'ec_snap_distance_m': None,
-            'ec_in_road_bounds': (
-                GRAPH_MIN_LAT <= float(ec_obj.latitude) <= GRAPH_MAX_LAT and
-                GRAPH_MIN_LNG <= float(ec_obj.longitude) <= GRAPH_MAX_LNG
+            'ec_in_road_bounds': node_index.contains(
+                float(ec_obj.latitude), float(ec_obj.longitude)
             ) if ec_obj else False,
         }
 
         # Find nearest road node for user and EC
-        segs = RoadSegment.objects.values_list(
-            'start_lat', 'start_lng', 'end_lat', 'end_lng'
-        )[:3000]  # sample – enough to find nearest node
         best_user_d = best_ec_d = float('inf')
         best_user_node = best_ec_node = None
-        for sla, slng, ela, elng in segs:
-            for nla, nlng in ((float(sla), float(slng)), (float(ela), float(elng))):
-                du = haversine_meters(start_lat_f, start_lng_f, nla, nlng)
-                if du < best_user_d:
-                    best_user_d = du
-                    best_user_node = [nla, nlng]
-                if ec_obj:
-                    de = haversine_meters(float(ec_obj.latitude), float(ec_obj.longitude), nla, nlng)
-                    if de < best_ec_d:
-                        best_ec_d = de
-                        best_ec_node = [nla, nlng]
+        user_node = graph.nearest_node(start_lat_f, start_lng_f)
+        if user_node is not None:
+            best_user_node = graph.coords(user_node)
+            best_user_d = haversine_meters(start_lat_f, start_lng_f, *best_user_node)
+        if ec_obj:
+            ec_node = graph.nearest_node(float(ec_obj.latitude), float(ec_obj.longitude))
+            if ec_node is not None:
+                best_ec_node = graph.coords(ec_node)
+                best_ec_d = haversine_meters(float(ec_obj.latitude), float(ec_obj.longitude), *best_ec_node)
 
         snap_info['user_snap_node'] = best_user_node
         snap_info['user_snap_distance_m'] = round(best_user_d, 1) if best_user_d < float('inf') else None
@@ -438,19 +376,16 @@ def calculate_route(request):
 
         result['snap_info'] = snap_info
 
-        # Print to server log for debugging
-        print(
-            f'[ROUTE] user=({start_lat_f:.6f},{start_lng_f:.6f}) '
-            f'snap={best_user_d:.1f}m | '
-            f'ec=({snap_info["ec_lat"]},{snap_info["ec_lng"]}) '
-            f'ec_snap={best_ec_d:.1f}m '
-            f'in_bounds={snap_info["ec_in_road_bounds"]} '
-            f'routes={len(result.get("routes", []))}'
-        )
+        if route_metrics.sampled():
+            diagnostics_log.info(
+                '[ROUTE] user=(%.6f,%.6f) snap=%.1fm | ec=(%s,%s) ec_snap=%.1fm in_bounds=%s routes=%d',
+                start_lat_f, start_lng_f, best_user_d, snap_info['ec_lat'], snap_info['ec_lng'],
+                best_ec_d, snap_info['ec_in_road_bounds'], len(result.get('routes', [])),
+            )
     except Exception as diag_exc:
         # Never let diagnostics break routing
         result['snap_info'] = {'error': str(diag_exc)}
-        print(f'[ROUTE] snap diagnostic failed: {diag_exc}')
+        logger.warning('[ROUTE] snap diagnostic failed: %s', diag_exc)
     # Log selected route for analytics in background (non-blocking)
     first_route = result['routes'][0] if result['routes'] else None
     if first_route:
@@ -470,6 +405,44 @@ def calculate_route(request):
     return Response(result)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsMDRRMO])
+def mdrrmo_batch_routes(request):
+    """
+    POST /api/mdrrmo/batch-routes/
+    Body: origins? [{id?, lat, lng}], barangays? [name], municipality?,
+          center_ids? [int] (default: all operational), include_polyline?
+    Streams NDJSON (one JSON object per line), one row per (origin, centre):
+    origin_id, center_id, center_name, reachable, has_safe_route, total_risk,
+    risk_level, total_distance, snap_distance_m (+ polyline). Barangays are
+    resolved by batch_routing.resolve_barangay_origins; unresolved ones yield a
+    row with 'error'. The graph is loaded once for the whole batch and the
+    searches run in this worker (no process pool is forked from the web
+    process); at most BATCH_ROUTE_MAX_ORIGINS origins per request, larger runs
+    go to `python manage.py batch_routes`.
+    """
+    import json
+    from django.http import StreamingHttpResponse
+    from apps.mobile_sync.services.batch_routing import resolve_barangay_origins, route_batch
+
+    serializer = BatchRouteRequestSerializer(data=request.data)
+    if not serializer.is_valid():
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    data = serializer.validated_data
+    origins = [dict(o) for o in data['origins']]
+    origins += resolve_barangay_origins(data['barangays'], data['municipality'])
+    rows = route_batch(
+        origins,
+        center_ids=data['center_ids'],
+        workers=1,
+        include_polyline=data['include_polyline'],
+    )
+    return StreamingHttpResponse(
+        (json.dumps(row) + '\n' for row in rows),
+        content_type='application/x-ndjson',
+    )
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, IsMDRRMO])
 def mdrrmo_high_risk_roads(request):
@@ -479,60 +452,9 @@ def mdrrmo_high_risk_roads(request):
     Includes id, coordinates, risk_score, risk_level, and nearby hazard info.
     """
     try:
-        from apps.routing.models import RoadSegment
-        from apps.mobile_sync.services.route_service import (
-            calculate_segment_risk,
-            _get_approved_hazards,
-            HAZARD_INFLUENCE_RADIUS,
-        )
-        from math import radians, cos, sin, asin, sqrt
-
-        def _haversine_m(lat1, lng1, lat2, lng2):
-            r = 6_371_000
-            dlat = radians(lat2 - lat1)
-            dlng = radians(lng2 - lng1)
-            a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlng / 2) ** 2
-            return 2 * r * asin(sqrt(a))
-
-        segments = list(RoadSegment.objects.all())
-        approved_hazards = _get_approved_hazards()
-        result = []
-
-        for seg in segments:
-            risk = calculate_segment_risk(seg, approved_hazards)
-            if risk < 0.30:
-                continue
-            mid_lat = (float(seg.start_lat) + float(seg.end_lat)) / 2
-            mid_lng = (float(seg.start_lng) + float(seg.end_lng)) / 2
-
-            # Find nearest approved hazard causing this elevation
-            nearest = None
-            nearest_dist = float('inf')
-            for h in approved_hazards:
-                d = _haversine_m(mid_lat, mid_lng, float(h.latitude), float(h.longitude))
-                if d < nearest_dist:
-                    nearest_dist = d
-                    nearest = h
-
-            level = 'high' if risk >= 0.70 else 'moderate'
-            entry = {
-                'id': seg.id,
-                'start_lat': float(seg.start_lat),
-                'start_lng': float(seg.start_lng),
-                'end_lat': float(seg.end_lat),
-                'end_lng': float(seg.end_lng),
-                'risk_score': round(risk, 3),
-                'risk_level': level,
-            }
-            if nearest:
-                entry['nearest_hazard'] = {
-                    'type': nearest.hazard_type,
-                    'distance_m': round(nearest_dist),
-                    'barangay': nearest.user.barangay if nearest.user else '',
-                }
-            result.append(entry)
-
-        result.sort(key=lambda x: x['risk_score'], reverse=True)
+        from apps.mobile_sync.services.network_cache import get_network_snapshot
+
+        result = get_network_snapshot().high_risk_roads
         return Response({'count': len(result), 'segments': result})
 
     except Exception as exc:
@@ -741,9 +663,9 @@ def mdrrmo_approve_report(request):
 
     report.save()  # status persisted — return the response immediately
 
-    # FCM push + segment risk recompute run in a background thread so they
-    # never block or timeout the HTTP response.  Status is already saved above.
-    _fire_approve_reject_background(action, report.user.fcm_token, report.id)
+    # FCM push + segment risk recompute are queued jobs so they never block
+    # or timeout the HTTP response.  Status is already saved above.
+    _fire_approve_reject_background(action, report.id, report.latitude, report.longitude)
 
     return Response(PendingReportSerializer(report).data)
 
@@ -804,7 +726,7 @@ def delete_my_report(request, report_id):
         )
     
     # Only allow deletion of pending reports
-    if report.status != HazardReport.Status.PENDING:
+    if report.status not in (HazardReport.Status.PENDING, HazardReport.Status.PENDING_SCORING):
         return Response(
             {'error': 'Can only delete pending reports'},
             status=status.HTTP_400_BAD_REQUEST
@@ -886,14 +808,23 @@ def check_similar_reports(request):
     # from the same recent incident window.
     from datetime import timedelta
     from django.utils import timezone
-    from apps.validation.services.consensus import NEARBY_TIME_WINDOW_HOURS
+    from apps.validation.services.consensus import NEARBY_TIME_WINDOW_HOURS, within_bounding_box
 
     since = timezone.now() - timedelta(hours=NEARBY_TIME_WINDOW_HOURS)
 
-    # Search both PENDING (confirmable) and APPROVED (already verified) reports.
-    candidate_qs = base_qs.filter(
-        status__in=[HazardReport.Status.PENDING, HazardReport.Status.APPROVED],
-        created_at__gte=since,
+    # Search PENDING / PENDING_SCORING (confirmable) and APPROVED (already
+    # verified) reports, only inside the box around the radius; exact distance
+    # is checked below.
+    candidate_qs = within_bounding_box(
+        base_qs.filter(
+            status__in=[
+                HazardReport.Status.PENDING,
+                HazardReport.Status.PENDING_SCORING,
+                HazardReport.Status.APPROVED,
+            ],
+            created_at__gte=since,
+        ),
+        latitude, longitude, radius_meters,
     )
 
     similar_reports = []
@@ -976,45 +907,16 @@ def confirm_hazard_report(request):
     # log and response message below even if score re-calculation fails.
     confirmation_count = report.confirmation_count
 
-    # Only recalculate AI scores for PENDING reports. APPROVED reports have
-    # already been reviewed by MDRRMO — updating their score would be meaningless.
-    if report.status == HazardReport.Status.PENDING:
-        try:
-            from apps.validation.services.consensus import ConsensusScoringService
-            from apps.validation.services.rule_scoring import consensus_rule_score, combine_validation_scores
-
-            consensus = ConsensusScoringService()
-            support = consensus.get_support_summary(
-                float(report.latitude), float(report.longitude),
-                HazardReport.objects.exclude(id=report.id).filter(is_deleted=False),
-                exclude_report_id=report.id,
-                time_window_hours=1,
-                hazard_type=report.hazard_type,
-            )
-            nearby = support.nearby_cluster_count
-
-            consensus_score_val = consensus_rule_score(nearby, confirmation_count)
-            final_score = combine_validation_scores(
-                report.naive_bayes_score or 0.5,
-                report.distance_weight or 0.5,
-                consensus_score_val
-            )
+    # Re-score the pending reports of this incident (this one, if still PENDING,
+    # and its pending same-type neighbours). APPROVED reports have already been
+    # reviewed by MDRRMO — updating their score would be meaningless.
+    try:
+        from apps.mobile_sync.services.report_service import rescore_consensus_neighbourhood
 
-            report.consensus_score = consensus_score_val
-            report.final_validation_score = final_score
-
-            if report.validation_breakdown:
-                report.validation_breakdown['confirmation_count'] = confirmation_count
-                report.validation_breakdown['nearby_count'] = nearby
-                report.validation_breakdown['nearby_raw_reports'] = support.nearby_raw_reports
-                report.validation_breakdown['nearby_unique_user_count'] = support.nearby_unique_user_count
-                report.validation_breakdown['nearby_cluster_count'] = support.nearby_cluster_count
-                report.validation_breakdown['consensus_score'] = round(consensus_score_val, 4)
-                report.validation_breakdown['final_validation_score'] = round(final_score, 4)
-
-            report.save(update_fields=['consensus_score', 'final_validation_score', 'validation_breakdown'])
-        except Exception as e:
-            print(f"Warning: Could not recalculate scores: {e}")
+        if rescore_consensus_neighbourhood(report):
+            report.refresh_from_db(fields=['consensus_score', 'final_validation_score', 'validation_breakdown'])
+    except Exception as e:
+        logger.warning('Could not recalculate scores: %s', e)
     
     # Log the confirmation
     from apps.system_logs.models import SystemLog
@@ -1065,9 +967,9 @@ def restore_report(request):
         )
     
     report.restore(restoration_reason)
-    # Save immediately, then recompute risks in background so response isn't blocked
+    # Save immediately, then queue the risk recompute so response isn't blocked
     response_data = PendingReportSerializer(report).data
-    threading.Thread(target=_sync_recompute_segment_risks, daemon=True).start()
+    _refresh_segment_risks_async(report.latitude, report.longitude)
     return Response(response_data)
 
 
@@ -1103,7 +1005,7 @@ def mdrrmo_delete_report(request, report_id: int):
         report = HazardReport.objects.get(pk=report_id, is_deleted=False)
     except HazardReport.DoesNotExist:
         return Response({'error': 'Report not found'}, status=status.HTTP_404_NOT_FOUND)
-    if report.status == HazardReport.Status.PENDING:
+    if report.status in (HazardReport.Status.PENDING, HazardReport.Status.PENDING_SCORING):
         return Response(
             {'error': 'Cannot delete pending reports. Approve or reject them first.'},
             status=status.HTTP_400_BAD_REQUEST,
@@ -1111,8 +1013,8 @@ def mdrrmo_delete_report(request, report_id: int):
     report.is_deleted = True
     report.deleted_at = tz.now()
     report.save(update_fields=['is_deleted', 'deleted_at'])
-    # Recompute risks in background so response isn't blocked
-    threading.Thread(target=_sync_recompute_segment_risks, daemon=True).start()
+    # Queue the risk recompute so response isn't blocked
+    _refresh_segment_risks_async(report.latitude, report.longitude)
     return Response({'message': 'Report deleted successfully'}, status=status.HTTP_200_OK)
 
 
@@ -1163,6 +1065,7 @@ def create_evacuation_center(request):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
     center = serializer.save()
+    _warm_center_trees_async()
     return Response(
         EvacuationCenterSerializer(center).data,
         status=status.HTTP_201_CREATED
@@ -1214,6 +1117,7 @@ def update_evacuation_center(request, center_id):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
     updated = serializer.save()
+    _warm_center_trees_async()
     return Response(EvacuationCenterSerializer(updated).data)
 
 
@@ -1274,6 +1178,7 @@ def reactivate_evacuation_center(request, center_id):
         )
     
     center.reactivate()
+    _warm_center_trees_async()
     return Response(EvacuationCenterSerializer(center).data)
 
 
@@ -1439,6 +1344,66 @@ def check_road_data(request):
     })
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsMDRRMO])
+def mdrrmo_route_cache_stats(request):
+    """
+    GET /api/mdrrmo/route-cache-stats/
+    calculate-route result cache counters for this worker process (hits, misses,
+    expired, evictions, invalidations, entries, hit_rate). ?reset=1 zeroes the
+    counters after reading them, e.g. at the start of a drill.
+    """
+    from apps.mobile_sync.services import route_cache
+
+    data = route_cache.stats()
+    if request.query_params.get('reset') in ('1', 'true'):
+        route_cache.reset_stats()
+    return Response(data)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsMDRRMO])
+def mdrrmo_route_timings(request):
+    """
+    GET /api/mdrrmo/route-timings/
+    Per-stage routing latency for this worker process (db, fetch, risk,
+    graph_build, bridge, search, post, serialize, total): count, mean, min, max
+    and p50 / p90 / p95 / p99 in milliseconds; see route_metrics.
+    ?reset=1 clears the histograms after reading them.
+    """
+    data = {
+        'stages': route_metrics.summary(),
+        'diagnostics_sample_rate': django_settings.ROUTE_DIAGNOSTICS_SAMPLE_RATE,
+    }
+    if request.query_params.get('reset') in ('1', 'true'):
+        route_metrics.reset()
+    return Response(data)
+
+
+def _etag_matches(request, etag: str) -> bool:
+    """True if the request's If-None-Match header lists etag (or '*')."""
+    header = request.headers.get('If-None-Match', '')
+    return any(tag.strip() in (etag, '*') for tag in header.split(',')) if header else False
+
+
+def _versioned_json(request, body: bytes, version: str):
+    """
+    Serve a pre-serialized JSON body under a strong ETag derived from version;
+    answer 304 Not Modified when the client already holds that version.
+    """
+    from django.http import HttpResponse, HttpResponseNotModified
+
+    etag = f'"{version}"'
+    if _etag_matches(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type='application/json')
+    response['ETag'] = etag
+    # Clients may keep the body but must revalidate (cheap 304) before reuse.
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def road_risk_layer(request):
@@ -1448,37 +1413,62 @@ def road_risk_layer(request):
     Road Risk Layer overlay in the mobile app.
 
     Computes effective_risk = base × 0.20 (no live hazards) or
-    (base × 0.30) + (dynamic × 0.70) (live hazards present) for every segment,
-    then returns only segments with effective_risk > 0.05 to keep payload lean.
+    (base × 0.30) + (dynamic × 0.70) (live hazards present) for every segment.
+    Every segment is included (risk floored at 0.04 so safe roads still draw).
+
+    The body is serialized once per network snapshot version and returned as-is
+    with ETag = version; If-None-Match with the current version returns 304.
+    Bandwidth-sensitive clients should use road-risk-layer/geometry/ once and
+    then poll road-risk-layer/delta/.
     """
-    from apps.routing.models import RoadSegment
-    from apps.mobile_sync.services.route_service import (
-        calculate_segment_risk,
-        _get_approved_hazards,
-    )
+    from apps.mobile_sync.services.network_cache import get_network_snapshot
+
     # Scores are pre-computed at deploy time; skip auto-train to keep this endpoint fast.
-    segments = list(RoadSegment.objects.all())
-    if not segments:
-        return Response({'road_risk_segments': [], 'segment_count': 0})
-
-    approved_hazards = _get_approved_hazards()
-    result = []
-    for seg in segments:
-        risk = calculate_segment_risk(seg, approved_hazards)
-        # Include ALL segments so the road network is always visible when the layer
-        # is toggled on. Segments with risk=0 will appear green (safe) on the map.
-        # Use a small baseline of 0.04 so roads are distinguishable from background.
-        display_risk = max(risk, 0.04)
-        result.append({
-            's': [float(seg.start_lat), float(seg.start_lng)],
-            'e': [float(seg.end_lat),   float(seg.end_lng)],
-            'r': round(display_risk, 3),
-        })
+    snapshot = get_network_snapshot()
+    return _versioned_json(request, snapshot.risk_layer_json, snapshot.version)
 
-    return Response({
-        'road_risk_segments': result,
-        'segment_count': len(segments),
-    })
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def road_risk_layer_geometry(request):
+    """
+    GET /api/road-risk-layer/geometry/
+    Returns segment geometry only: { road_version, segment_count,
+    segments: [[id, start_lat, start_lng, end_lat, end_lng], ...] }.
+
+    Geometry changes only when the road network does, so the ETag is the road
+    version and clients revalidate with If-None-Match (304 when unchanged).
+    """
+    from apps.mobile_sync.services.network_cache import get_network_snapshot
+
+    snapshot = get_network_snapshot()
+    return _versioned_json(request, snapshot.geometry_json, snapshot.road_version)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def road_risk_layer_delta(request):
+    """
+    GET /api/road-risk-layer/delta/?since=<version>
+    Returns the layer risks changed since the client's version:
+    { version, road_version, full, ids: [segment_id, ...], r: [risk, ...] }.
+
+    since is the version from a previous layer or delta response. If the server
+    no longer knows it, full=true and every segment's risk is returned. If
+    road_version differs from the client's geometry, refetch the geometry.
+    If-None-Match with the current version returns 304.
+    """
+    from apps.mobile_sync.services.network_cache import get_network_snapshot, risk_layer_delta
+
+    snapshot = get_network_snapshot()
+    etag = f'"{snapshot.version}"'
+    if _etag_matches(request, etag):
+        return _versioned_json(request, b'', snapshot.version)
+    since = (request.query_params.get('since') or '').strip()
+    response = Response(risk_layer_delta(snapshot, since))
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
 
 
 @api_view(['POST'])
@@ -1496,3 +1486,52 @@ def update_fcm_token(request):
     request.user.fcm_token = token
     request.user.save(update_fields=['fcm_token'])
     return Response({'status': 'ok'})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def isochrones(request):
+    """
+    GET /api/isochrones/?metric=distance|cost&budgets=500,1000,2000&center_id=
+    Reachability per operational evacuation centre: for each budget the road
+    nodes within that distance (metric=distance, metres) or risk-weighted cost
+    (metric=cost) of the centre, as a convex-hull polygon and a base64 bitmap
+    over segments in road-risk-layer/geometry/ row order. Served under an ETag
+    (If-None-Match → 304); distance isochrones change only with the road network.
+    """
+    from apps.mobile_sync.services import isochrones as iso
+    from apps.mobile_sync.services.network_cache import get_network_snapshot
+    from apps.mobile_sync.services.route_cache import evacuation_center_version
+
+    metric = request.query_params.get('metric', iso.METRIC_DISTANCE)
+    if metric not in iso.METRIC_MULTIPLIERS:
+        return Response(
+            {'error': f'metric must be one of: {", ".join(iso.METRIC_MULTIPLIERS)}'},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    budgets = django_settings.ISOCHRONE_BUDGETS_M
+    if request.query_params.get('budgets'):
+        try:
+            budgets = tuple(float(b) for b in request.query_params['budgets'].split(',') if b.strip())
+        except ValueError:
+            budgets = ()
+    if not budgets or any(not 0 < b <= django_settings.ISOCHRONE_MAX_BUDGET_M for b in budgets):
+        return Response(
+            {'error': f'budgets must be comma-separated numbers in (0, {django_settings.ISOCHRONE_MAX_BUDGET_M:g}]'},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    budgets = tuple(sorted(set(budgets)))
+    center_ids = None
+    if request.query_params.get('center_id'):
+        try:
+            center_ids = [int(request.query_params['center_id'])]
+        except ValueError:
+            return Response({'error': 'center_id must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+    snapshot = get_network_snapshot()
+    version = iso.isochrones_version(snapshot, metric, budgets, evacuation_center_version())
+    if center_ids:
+        version = f'{version}.{center_ids[0]}'
+    if _etag_matches(request, f'"{version}"'):
+        return _versioned_json(request, b'', version)
+    return _versioned_json(request, iso.isochrones_json(snapshot, metric, budgets, center_ids), version)
@@ -69,6 +69,18 @@ class RoadRiskPredictor:
         except Exception as e:
             logger.warning('ml_service RF unavailable, using fallback: %s', e)
 
+        return self._fallback_risk(
+            flooded_road_count, landslide_count, fallen_tree_count, road_damage_count,
+            fallen_electric_post_count, road_blocked_count, bridge_damage_count,
+            storm_surge_count, avg_severity,
+        )
+
+    @staticmethod
+    def _fallback_risk(
+        flooded_road_count, landslide_count, fallen_tree_count, road_damage_count,
+        fallen_electric_post_count, road_blocked_count, bridge_damage_count,
+        storm_surge_count, avg_severity,
+    ) -> float:
         # Fallback formula (aligned with HAZARD_TYPE_RISK_WEIGHT in route_service)
         risk = (
             flooded_road_count         * 0.04
@@ -82,3 +94,20 @@ class RoadRiskPredictor:
             + avg_severity             * 0.50
         )
         return max(0.0, min(1.0, risk))
+
+    def predict_road_risk_batch(self, features):
+        """
+        Predict risk scores for many segments with a single model call.
+
+        features: (n, 9) array-like with columns in predict_risk's keyword order
+        (ml_service.RF_FEATURE_COLUMNS). Returns a sequence of n floats in [0, 1].
+
+        # Using synthetic training data (temporary)
+        # Replace with MDRRMO historical data when available
+        """
+        try:
+            from ml_data.ml_service import get_ml_service
+            return get_ml_service().predict_road_risk_batch(features)
+        except Exception as e:
+            logger.warning('ml_service RF batch unavailable, using fallback: %s', e)
+        return [self._fallback_risk(*row) for row in features]
@@ -87,3 +87,40 @@ class RoadRiskPredictorTests(unittest.TestCase):
         self.assertIsInstance(risk, float)
         self.assertGreaterEqual(risk, 0.0)
         self.assertLessEqual(risk, 1.0)
+
+
+class RoadRiskBatchPredictionTests(unittest.TestCase):
+    """Batch prediction must match per-segment prediction."""
+
+    ROWS = [
+        [0, 0, 0, 0, 0, 0, 0, 0, 0.0],
+        [1.0, 0, 0.29, 0, 0, 0, 0, 0, 0.6],
+        [0, 0.71, 0, 0.43, 0, 1.0, 0, 0, 0.85],
+        [2.5, 1.2, 0, 0, 0.57, 3.0, 0.71, 0.71, 0.95],
+    ]
+
+    def test_batch_matches_single_predictions(self):
+        predictor = RoadRiskPredictor()
+        batch = [float(r) for r in predictor.predict_road_risk_batch(self.ROWS)]
+        single = [predictor.predict_risk(*row) for row in self.ROWS]
+        self.assertEqual(batch, single)
+
+    def test_fallback_batch_matches_scalar_formula(self):
+        try:
+            import numpy as np
+            from ml_data.ml_service import road_risk_fallback_batch
+        except ImportError:
+            self.skipTest('numpy not available')
+        batch = road_risk_fallback_batch(np.array(self.ROWS, dtype=float))
+        self.assertEqual(
+            [float(r) for r in batch],
+            [RoadRiskPredictor._fallback_risk(*row) for row in self.ROWS],
+        )
+
+    def test_empty_batch(self):
+        self.assertEqual(len(RoadRiskPredictor().predict_road_risk_batch([])), 0)
+
+    def test_route_service_feature_order_matches_training(self):
+        from ml_data.train_random_forest import FEATURE_COLUMNS
+        from apps.mobile_sync.services.route_service import _RF_FEATURE_ORDER
+        self.assertEqual(list(_RF_FEATURE_ORDER), FEATURE_COLUMNS)
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import RoadSegment, RouteLog
+from .models import RoadBridgeSet, RoadSegment, RouteLog
 
 
 @admin.register(RoadSegment)
@@ -7,6 +7,11 @@ class RoadSegmentAdmin(admin.ModelAdmin):
     list_display = ('id', 'start_lat', 'start_lng', 'end_lat', 'end_lng', 'base_distance', 'predicted_risk_score')
 
 
+@admin.register(RoadBridgeSet)
+class RoadBridgeSetAdmin(admin.ModelAdmin):
+    list_display = ('id', 'road_version', 'created_at')
+
+
 @admin.register(RouteLog)
 class RouteLogAdmin(admin.ModelAdmin):
     list_display = ('id', 'user', 'evacuation_center', 'selected_route_risk', 'created_at')
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-18 01:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('routing', '0005_reseed_road_segments'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RoadBridgeSet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('road_version', models.CharField(max_length=32, unique=True)),
+                ('edges', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'routing_roadbridgeset',
+            },
+        ),
+    ]
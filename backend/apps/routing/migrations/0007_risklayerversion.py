@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('routing', '0006_roadbridgeset'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RiskLayerVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.CharField(max_length=64, unique=True)),
+                ('road_version', models.CharField(max_length=32)),
+                ('segment_ids', models.JSONField(default=list)),
+                ('risks', models.JSONField(default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'routing_risklayerversion',
+            },
+        ),
+    ]
@@ -1,6 +1,8 @@
 """
 Road network and route logging.
-RoadSegment = graph edges; RouteLog = user route history.
+RoadSegment = graph edges; RoadBridgeSet = cached gap-bridging edges;
+RiskLayerVersion = recent road-risk layer versions (for deltas);
+RouteLog = user route history.
 """
 from django.conf import settings
 from django.db import models
@@ -26,6 +28,44 @@ class RoadSegment(models.Model):
         return f"({self.start_lat},{self.start_lng}) -> ({self.end_lat},{self.end_lng})"
 
 
+class RoadBridgeSet(models.Model):
+    """
+    Synthetic edges that stitch disconnected road components together, computed
+    by manage.py build_road_bridges whenever the road network changes (see
+    mobile_sync.services.network_cache.store_bridges).
+    edges: [[from_node_key, to_node_key, distance_m], ...] with "lat,lng" node keys.
+    """
+    road_version = models.CharField(max_length=32, unique=True)
+    edges = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'routing_roadbridgeset'
+
+    def __str__(self):
+        return f"Bridges for {self.road_version} ({len(self.edges)})"
+
+
+class RiskLayerVersion(models.Model):
+    """
+    Layer risks of one network snapshot version, kept for the most recent
+    versions so any worker process can answer road-risk-layer/delta/ against a
+    version another worker served (see mobile_sync.services.network_cache).
+    segment_ids / risks are parallel lists.
+    """
+    version = models.CharField(max_length=64, unique=True)
+    road_version = models.CharField(max_length=32)
+    segment_ids = models.JSONField(default=list)
+    risks = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'routing_risklayerversion'
+
+    def __str__(self):
+        return f"Risk layer {self.version} ({len(self.segment_ids)})"
+
+
 class RouteLog(models.Model):
     """
     Log of a user's selected evacuation route (for analytics/feedback).
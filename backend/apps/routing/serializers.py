@@ -8,6 +8,36 @@ class CalculateRouteRequestSerializer(serializers.Serializer):
     start_lat = serializers.DecimalField(max_digits=10, decimal_places=7)
     start_lng = serializers.DecimalField(max_digits=10, decimal_places=7)
     evacuation_center_id = serializers.IntegerField()
+    # Compact response: encoded polylines, risk_layer_version instead of road_risk_segments.
+    compact = serializers.BooleanField(required=False, default=False)
+
+
+class BatchRouteOriginSerializer(serializers.Serializer):
+    id = serializers.CharField(required=False, max_length=100)
+    lat = serializers.FloatField(min_value=-90, max_value=90)
+    lng = serializers.FloatField(min_value=-180, max_value=180)
+
+
+class BatchRouteRequestSerializer(serializers.Serializer):
+    """POST /api/mdrrmo/batch-routes/ body: origins and/or barangays, optional centre ids."""
+    origins = BatchRouteOriginSerializer(many=True, required=False, default=list)
+    barangays = serializers.ListField(child=serializers.CharField(max_length=100), required=False, default=list)
+    municipality = serializers.CharField(required=False, allow_blank=True, default='')
+    center_ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_null=True, default=None)
+    include_polyline = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs):
+        from django.conf import settings
+
+        count = len(attrs['origins']) + len(attrs['barangays'])
+        if count == 0:
+            raise serializers.ValidationError('Provide at least one origin or barangay.')
+        if count > settings.BATCH_ROUTE_MAX_ORIGINS:
+            raise serializers.ValidationError(
+                f'At most {settings.BATCH_ROUTE_MAX_ORIGINS} origins per request; '
+                'use `python manage.py batch_routes` for larger runs.'
+            )
+        return attrs
 
 
 class RouteLogSerializer(serializers.ModelSerializer):
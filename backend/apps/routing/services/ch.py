@@ -0,0 +1,272 @@
+"""
+Customizable contraction hierarchy (CCH) over a RoadGraph.
+
+Two phases, so hazard changes never redo the expensive part:
+
+  preprocessing (ContractionHierarchy)  — topology only, once per road network.
+      Nodes are ordered by the minimum-degree elimination game; eliminating a
+      node connects its remaining neighbours, so every shortest path has an
+      up-then-down shape over the resulting upward arcs. All lower triangles
+      (v, a, b) with v below a < b are listed once for customization.
+
+  customization (ContractionHierarchy.customize → CHMetric) — per weight vector.
+      Arc weights start at the best original edge between the two nodes and are
+      relaxed over the lower triangles in elimination order. This is a single
+      linear pass, cheap enough to rerun whenever approved hazards change.
+
+Queries run a bidirectional upward Dijkstra and unpack shortcuts through the
+recorded triangles back to original directed edge indices, so the route is
+scored by the same code as every other search mode. Edge weights are symmetric
+(twin edges share base_distance and risk), so one weight per arc suffices.
+"""
+import heapq
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+
+class CHMetric:
+    """Customized arc weights and shortcut unpacking data for one weight vector."""
+
+    __slots__ = ('weight', 'edge', 'via_low', 'via_high')
+
+    def __init__(self, weight, edge, via_low, via_high):
+        self.weight = weight      # arc -> best up-down distance between its endpoints
+        self.edge = edge          # arc -> original directed edge low→high, or -1 for a shortcut
+        self.via_low = via_low    # arc -> arc (mid, low) of the best triangle, or -1
+        self.via_high = via_high  # arc -> arc (mid, high) of the best triangle, or -1
+
+
+class ContractionHierarchy:
+    """
+    Metric-independent hierarchy for one graph topology. Arc i joins
+    arc_low[i] and up_targets[i] (rank low < rank high); the upward arcs of node u
+    are up_offsets[u] .. up_offsets[u + 1] - 1.
+    """
+
+    __slots__ = (
+        'num_nodes', 'rank', 'up_offsets', 'up_targets', 'arc_low',
+        'edge_offsets', 'edge_ids', 'tri_target', 'tri_first', 'tri_second', 'und_u', 'und_v',
+    )
+
+    def __init__(self, graph):
+        n = graph.num_nodes
+        self.num_nodes = n
+        self.und_u = array('l', graph.und_u)
+        self.und_v = array('l', graph.und_v)
+
+        # 1. Simple undirected adjacency (parallel edges merged, self-loops dropped).
+        adj = [set() for _ in range(n)]
+        for u, v in zip(graph.und_u, graph.und_v):
+            if u != v:
+                adj[u].add(v)
+                adj[v].add(u)
+
+        # 2. Minimum-degree elimination game: order nodes and collect fill-in.
+        rank = [-1] * n
+        up: List[list] = [None] * n
+        heap = [(len(adj[u]), u) for u in range(n)]
+        heapq.heapify(heap)
+        r = 0
+        while heap:
+            deg, v = heapq.heappop(heap)
+            if rank[v] != -1 or deg != len(adj[v]):
+                continue  # stale entry
+            rank[v] = r
+            r += 1
+            nbrs = adj[v]
+            up[v] = list(nbrs)
+            for a in nbrs:
+                adj[a].discard(v)
+            for a in nbrs:
+                adj[a].update(b for b in nbrs if b != a)
+                heapq.heappush(heap, (len(adj[a]), a))
+            adj[v] = set()
+        self.rank = array('l', rank)
+
+        # 3. Upward arcs in CSR form, each node's arcs sorted by head rank.
+        offsets = [0] * (n + 1)
+        targets: List[int] = []
+        arc_low: List[int] = []
+        arc_of: Dict[Tuple[int, int], int] = {}
+        for u in range(n):
+            heads = sorted(up[u] or (), key=rank.__getitem__)
+            for w in heads:
+                arc_of[(u, w)] = len(targets)
+                targets.append(w)
+                arc_low.append(u)
+            offsets[u + 1] = len(targets)
+        self.up_offsets = array('l', offsets)
+        self.up_targets = array('l', targets)
+        self.arc_low = array('l', arc_low)
+
+        # 4. Original directed edges low→high behind each arc (parallel edges kept).
+        per_arc: List[list] = [[] for _ in range(len(targets))]
+        for e in range(graph.num_edges):
+            u = graph.targets[graph.twin[e]]
+            v = graph.targets[e]
+            if u != v and rank[u] < rank[v]:
+                per_arc[arc_of[(u, v)]].append(e)
+        edge_offsets = [0]
+        edge_ids: List[int] = []
+        for edges in per_arc:
+            edge_ids.extend(edges)
+            edge_offsets.append(len(edge_ids))
+        self.edge_offsets = array('l', edge_offsets)
+        self.edge_ids = array('l', edge_ids)
+
+        # 5. Lower triangles (v; a, b) in elimination order of v: arc(a, b) can be
+        #    improved by arc(v, a) + arc(v, b) once both of those are final.
+        tri_target: List[int] = []
+        tri_first: List[int] = []
+        tri_second: List[int] = []
+        for v in sorted(range(n), key=rank.__getitem__):
+            lo, hi = offsets[v], offsets[v + 1]
+            for i in range(lo, hi):
+                a = targets[i]
+                for j in range(i + 1, hi):
+                    tri_target.append(arc_of[(a, targets[j])])
+                    tri_first.append(i)
+                    tri_second.append(j)
+        self.tri_target = array('l', tri_target)
+        self.tri_first = array('l', tri_first)
+        self.tri_second = array('l', tri_second)
+
+    @property
+    def num_arcs(self) -> int:
+        return len(self.up_targets)
+
+    @property
+    def num_shortcuts(self) -> int:
+        """Arcs with no original edge behind them."""
+        offs = self.edge_offsets
+        return sum(1 for i in range(self.num_arcs) if offs[i] == offs[i + 1])
+
+    def matches(self, graph) -> bool:
+        """True if graph has exactly the topology this hierarchy was built for."""
+        return (
+            graph.num_nodes == self.num_nodes
+            and graph.und_u == self.und_u
+            and graph.und_v == self.und_v
+        )
+
+    def customize(self, weights) -> CHMetric:
+        """Arc weights for per-directed-edge weights (symmetric across twins)."""
+        m = self.num_arcs
+        inf = float('inf')
+        weight = array('d', [inf]) * m
+        edge = array('l', [-1]) * m
+        via_low = array('l', [-1]) * m
+        via_high = array('l', [-1]) * m
+        offs = self.edge_offsets
+        ids = self.edge_ids
+        for i in range(m):
+            for k in range(offs[i], offs[i + 1]):
+                e = ids[k]
+                if weights[e] < weight[i]:
+                    weight[i] = weights[e]
+                    edge[i] = e
+        for t, first, second in zip(self.tri_target, self.tri_first, self.tri_second):
+            w = weight[first] + weight[second]
+            if w < weight[t]:
+                weight[t] = w
+                via_low[t] = first
+                via_high[t] = second
+        for i in range(m):
+            if via_low[i] != -1:
+                edge[i] = -1  # the best connection is the shortcut, not the original edge
+        return CHMetric(weight, edge, via_low, via_high)
+
+    # ── queries ─────────────────────────────────────────────────────────────
+
+    def _upward(self, metric: CHMetric, dist: dict, parent: dict, pq: list):
+        """Settle the next node of one upward search; return it (or None if exhausted)."""
+        offsets = self.up_offsets
+        targets = self.up_targets
+        weight = metric.weight
+        while pq:
+            d, u = heapq.heappop(pq)
+            if d > dist[u]:
+                continue
+            for i in range(offsets[u], offsets[u + 1]):
+                nd = d + weight[i]
+                v = targets[i]
+                if nd < dist.get(v, float('inf')):
+                    dist[v] = nd
+                    parent[v] = i
+                    heapq.heappush(pq, (nd, v))
+            return u
+        return None
+
+    def query(self, graph, metric: CHMetric, start: int, end: int) -> Tuple[Optional[list], int]:
+        """
+        Bidirectional upward search. Returns (directed edge indices start → end or
+        None if unreachable, nodes settled).
+        """
+        if start == end:
+            return [], 1
+        inf = float('inf')
+        dist = ({start: 0.0}, {end: 0.0})
+        parent = ({}, {})
+        pq = ([(0.0, start)], [(0.0, end)])
+        best = inf
+        meet = -1
+        settled = 0
+        side = 0
+        while pq[0] or pq[1]:
+            # Alternate directions; a direction stops once its queue can't beat best.
+            if not pq[side] or pq[side][0][0] >= best:
+                side ^= 1
+                if not pq[side] or pq[side][0][0] >= best:
+                    break
+            u = self._upward(metric, dist[side], parent[side], pq[side])
+            if u is not None:
+                settled += 1
+                other = dist[side ^ 1].get(u)
+                if other is not None and dist[side][u] + other < best:
+                    best = dist[side][u] + other
+                    meet = u
+            side ^= 1
+        if meet == -1:
+            return None, settled
+
+        edges: List[int] = []
+        # start → meet: forward parent arcs climb from start, walk them low → high.
+        climb = []
+        node = meet
+        while node != start:
+            arc = parent[0][node]
+            climb.append(arc)
+            node = self.arc_low[arc]
+        for arc in reversed(climb):
+            self._unpack(graph, metric, arc, upward=True, out=edges)
+        # meet → end: backward parent arcs climbed from end, walk them high → low.
+        node = meet
+        while node != end:
+            arc = parent[1][node]
+            self._unpack(graph, metric, arc, upward=False, out=edges)
+            node = self.arc_low[arc]
+        return edges, settled
+
+    def _unpack(self, graph, metric: CHMetric, arc: int, upward: bool, out: list) -> None:
+        """Append the original directed edges of arc, walked low→high (upward) or high→low."""
+        twin = graph.twin
+        via_low = metric.via_low
+        via_high = metric.via_high
+        edge = metric.edge
+        stack = [(arc, upward)]
+        while stack:
+            a, up = stack.pop()
+            lo = via_low[a]
+            if lo == -1:
+                e = edge[a]
+                out.append(e if up else twin[e])
+                continue
+            hi = via_high[a]
+            # low → high = (low → mid) + (mid → high); lo = arc(mid, low), hi = arc(mid, high).
+            # The stack is LIFO, so push the second half first.
+            if up:
+                stack.append((hi, True))
+                stack.append((lo, False))
+            else:
+                stack.append((lo, True))
+                stack.append((hi, False))
@@ -2,20 +2,28 @@
 Modified Dijkstra: weight = base_distance + (predicted_risk_score × risk_multiplier).
 Returns up to k distinct routes by reusing Dijkstra multiple times: run once for the best
 path, then penalize edges used in that path and run again to get alternatives. No new
-algorithm; only edge costs are adjusted temporarily via a penalty dict (graph is not mutated).
+algorithm; only edge costs are adjusted temporarily via a penalty array (graph is not mutated).
+
+The graph is an integer-indexed CSR structure (see graph.RoadGraph): nodes are ints,
+edges are flat arrays, and "lat,lng" string keys are only produced for the returned
+path_keys.
 
 Component bridging: OSM road data often has small gaps that split the graph into
-disconnected sub-graphs. After building the main adjacency list, _bridge_components()
+disconnected sub-graphs. After building the main graph, _bridge_components()
 detects all components, then stitches each isolated component to the nearest node in the
-growing connected set via a synthetic edge. This is done once per get_safest_routes() call
-and ensures Dijkstra can always find a path as long as the road network is geographically
-continuous (even if the raw segment data has minor coverage gaps).
+growing connected set via a synthetic edge. The bridges depend only on geometry, so they
+are computed once per road-network version and reused by every search (network_cache,
+RoadBridgeSet); this ensures Dijkstra can always find a path as long as the road network
+is geographically continuous (even if the raw segment data has minor coverage gaps).
 """
 import heapq
 import math
+from array import array
 from collections import defaultdict, deque
 from decimal import Decimal
-from typing import List, Dict, Any, Tuple, Optional
+from typing import List, Dict, Any, Optional
+
+from .graph import RoadGraph
 
 # Risk multiplier to emphasize safety over pure distance.
 # 150 = each risk unit adds 150 m of effective cost; a 100 m segment at risk=1.0
@@ -24,6 +32,17 @@ from typing import List, Dict, Any, Tuple, Optional
 # 4-6× detours for segments with risk≈0.5-0.7).
 DEFAULT_RISK_MULTIPLIER = 150.0
 
+# Single-pair search algorithms. All return the same optimal route; A*,
+# bidirectional and the contraction hierarchy settle fewer nodes (see
+# `manage.py benchmark_routing`). 'ch' answers unpenalised queries over the
+# graph's customized ContractionHierarchy (see ch.py) and runs the penalised
+# reruns of dijkstra_k_routes as A*.
+SEARCH_DIJKSTRA = 'dijkstra'
+SEARCH_ASTAR = 'astar'
+SEARCH_BIDIRECTIONAL = 'bidirectional'
+SEARCH_CH = 'ch'
+SEARCH_MODES = (SEARCH_DIJKSTRA, SEARCH_ASTAR, SEARCH_BIDIRECTIONAL, SEARCH_CH)
+
 
 def _float(x) -> float:
     if isinstance(x, Decimal):
@@ -31,8 +50,37 @@ def _float(x) -> float:
     return float(x)
 
 
-def _key(lat: float, lng: float) -> str:
-    return f"{lat:.6f},{lng:.6f}"
+class ShortestPathTree:
+    """
+    Shortest-path tree rooted at one node (e.g. an evacuation centre) for one risk
+    multiplier. Edge weights are symmetric, so the tree of a search from root
+    also holds the best path from every node to root: route_edges(start) walks
+    parent pointers in O(path length) instead of searching.
+    """
+
+    __slots__ = ('root', 'risk_multiplier', 'dist', 'parent_edge')
+
+    def __init__(self, root: int, risk_multiplier: float, dist, parent_edge):
+        self.root = root
+        self.risk_multiplier = risk_multiplier
+        self.dist = dist
+        self.parent_edge = parent_edge
+
+    def route_edges(self, graph: RoadGraph, start: int) -> Optional[list]:
+        """Directed edge indices start → root, or None if start cannot reach root."""
+        if self.dist[start] == float('inf'):
+            return None
+        edges = []
+        parent_edge = self.parent_edge
+        twin = graph.twin
+        targets = graph.targets
+        cur = start
+        while cur != self.root:
+            # parent_edge[cur] points parent → cur; its twin walks cur → parent.
+            e = twin[parent_edge[cur]]
+            edges.append(e)
+            cur = targets[e]
+        return edges
 
 
 class ModifiedDijkstraService:
@@ -41,116 +89,302 @@ class ModifiedDijkstraService:
     Returns top 3 safest paths with total risk and classification.
     """
 
-    def __init__(self, risk_multiplier: float = DEFAULT_RISK_MULTIPLIER):
+    def __init__(self, risk_multiplier: float = DEFAULT_RISK_MULTIPLIER, search_mode: str = SEARCH_DIJKSTRA):
+        if search_mode not in SEARCH_MODES:
+            raise ValueError(f'Unknown search_mode {search_mode!r}; expected one of {SEARCH_MODES}')
         self.risk_multiplier = risk_multiplier
+        self.search_mode = search_mode
+        # Nodes settled by all searches run through this instance (benchmarking aid).
+        self.settled_nodes = 0
 
-    def build_graph(self, segments) -> Tuple[dict, set]:
+    def build_graph(self, segments) -> RoadGraph:
         """
         segments: queryset or list of RoadSegment-like objects with
         start_lat, start_lng, end_lat, end_lng, base_distance, predicted_risk_score.
-        Returns: (adjacency dict, set of node keys).
+        Returns a RoadGraph; every segment becomes two directed edges (bidirectional).
+        Edge weights for this service's risk_multiplier are computed on first search.
         """
-        adj = defaultdict(list)
-        nodes = set()
-        for seg in segments:
-            s_lat = _float(seg.start_lat)
-            s_lng = _float(seg.start_lng)
-            e_lat = _float(seg.end_lat)
-            e_lng = _float(seg.end_lng)
-            dist = _float(seg.base_distance)
-            # Use effective_risk (base + hazard proximity) when set; else predicted_risk_score
-            risk = _float(getattr(seg, 'effective_risk', getattr(seg, 'predicted_risk_score', 0)))
-            weight = dist + risk * self.risk_multiplier
-            sk, ek = _key(s_lat, s_lng), _key(e_lat, e_lng)
-            nodes.add(sk)
-            nodes.add(ek)
-            adj[sk].append((ek, weight, dist, risk))
-            # Bidirectional
-            adj[ek].append((sk, weight, dist, risk))
-        return dict(adj), nodes
+        return RoadGraph.from_segments(segments, coord=_float)
 
     def _dijkstra_one(
         self,
-        graph: dict,
-        start_key: str,
-        end_key: str,
+        graph: RoadGraph,
+        start: int,
+        end: int,
         forbidden_edges: set = None,
-        edge_penalty: dict = None,
+        edge_penalty=None,
     ) -> Optional[Dict[str, Any]]:
         """
-        Run Dijkstra and return a single route dict, or None if no path.
-        forbidden_edges: set of (u, v) to exclude entirely.
-        edge_penalty: dict (u,v) -> extra weight so next path prefers to avoid those edges (allows shared tail).
+        Run one search and return a single route dict, or None if no path.
+        start / end: node ids in graph.
+        forbidden_edges: set of directed edge indices to exclude entirely.
+        edge_penalty: per-directed-edge extra weight (sequence of length graph.num_edges)
+        so the next path prefers to avoid those edges (allows shared tail).
+        The algorithm is chosen by self.search_mode; all modes return the same route.
         """
-        if start_key not in graph or end_key not in graph:
+        n = graph.num_nodes
+        if not (0 <= start < n and 0 <= end < n):
+            return None
+        if self.search_mode == SEARCH_CH and not forbidden_edges and edge_penalty is None:
+            edges, settled = graph.contraction_hierarchy.query(
+                graph, graph.ch_metric(self.risk_multiplier), start, end,
+            )
+            self.settled_nodes += settled
+        elif self.search_mode in (SEARCH_ASTAR, SEARCH_CH):
+            edges = self._astar_edges(graph, start, end, forbidden_edges, edge_penalty)
+        elif self.search_mode == SEARCH_BIDIRECTIONAL:
+            edges = self._bidirectional_edges(graph, start, end, forbidden_edges, edge_penalty)
+        else:
+            edges = self._dijkstra_edges(graph, start, end, forbidden_edges, edge_penalty)
+        if edges is None:
             return None
-        forbidden_edges = forbidden_edges or set()
-        edge_penalty = edge_penalty or {}
-        dist = {start_key: 0}
-        risk_sum = {start_key: 0}
-        path_dist = {start_key: 0}
-        parent = {}
-        pq = [(0, start_key)]
+        return self._route_from_edges(graph, start, edges, edge_penalty)
+
+    def _dijkstra_edges(self, graph, start, end, forbidden_edges, edge_penalty) -> Optional[list]:
+        """Plain unidirectional Dijkstra; returns the path as directed edge indices."""
+        n = graph.num_nodes
+        weights = graph.weights(self.risk_multiplier)
+        offsets = graph.offsets
+        targets = graph.targets
+        inf = float('inf')
+        dist = [inf] * n
+        parent_edge = [-1] * n
+        dist[start] = 0
+        pq = [(0, start)]
+        settled = 0
         while pq:
             d, u = heapq.heappop(pq)
-            if d > dist.get(u, float('inf')):
+            if d > dist[u]:
                 continue
-            if u == end_key:
-                path = []
-                cur = u
-                while cur:
-                    path.append(cur)
-                    cur = parent.get(cur)
-                path.reverse()
-                return {
-                    'path_keys': path,
-                    'total_distance': path_dist.get(u, 0),
-                    'total_risk': risk_sum.get(u, 0),
-                    'weight': dist[u],
-                    'risk_level': self._risk_level(risk_sum.get(u, 0)),
-                }
-            for v, w, d_edge, r_edge in graph[u]:
-                if (u, v) in forbidden_edges:
+            settled += 1
+            if u == end:
+                self.settled_nodes += settled
+                return self._edges_from_parents(graph, start, end, parent_edge)
+            for e in range(offsets[u], offsets[u + 1]):
+                if forbidden_edges and e in forbidden_edges:
                     continue
-                penalty = edge_penalty.get((u, v), 0)
-                new_d = dist[u] + w + penalty
-                new_risk = risk_sum[u] + r_edge
-                new_path_dist = path_dist[u] + d_edge
-                if new_d < dist.get(v, float('inf')):
+                new_d = d + weights[e]
+                if edge_penalty is not None:
+                    new_d += edge_penalty[e]
+                v = targets[e]
+                if new_d < dist[v]:
                     dist[v] = new_d
-                    risk_sum[v] = new_risk
-                    path_dist[v] = new_path_dist
-                    parent[v] = u
+                    parent_edge[v] = e
                     heapq.heappush(pq, (new_d, v))
+        self.settled_nodes += settled
+        return None
+
+    def _astar_edges(self, graph, start, end, forbidden_edges, edge_penalty) -> Optional[list]:
+        """
+        A* with h(v) = heuristic_scale × chord(v, end). Edge weight >= base_distance and
+        penalties are >= 0, so h is consistent and the first pop of end is optimal.
+        """
+        n = graph.num_nodes
+        weights = graph.weights(self.risk_multiplier)
+        offsets = graph.offsets
+        targets = graph.targets
+        xs, ys, zs = graph.unit_vectors()
+        # Shave a hair off the scale so float rounding can never make h inconsistent.
+        scale = graph.heuristic_scale * (1.0 - 1e-9)
+        tx, ty, tz = xs[end], ys[end], zs[end]
+        sqrt = math.sqrt
+        inf = float('inf')
+        dist = [inf] * n
+        h = [-1.0] * n
+        parent_edge = [-1] * n
+        dist[start] = 0
+        pq = [(0, 0, start)]
+        settled = 0
+        while pq:
+            _, d, u = heapq.heappop(pq)
+            if d > dist[u]:
+                continue
+            settled += 1
+            if u == end:
+                self.settled_nodes += settled
+                return self._edges_from_parents(graph, start, end, parent_edge)
+            for e in range(offsets[u], offsets[u + 1]):
+                if forbidden_edges and e in forbidden_edges:
+                    continue
+                new_d = d + weights[e]
+                if edge_penalty is not None:
+                    new_d += edge_penalty[e]
+                v = targets[e]
+                if new_d < dist[v]:
+                    dist[v] = new_d
+                    parent_edge[v] = e
+                    hv = h[v]
+                    if hv < 0:
+                        hv = scale * sqrt((xs[v] - tx) ** 2 + (ys[v] - ty) ** 2 + (zs[v] - tz) ** 2)
+                        h[v] = hv
+                    heapq.heappush(pq, (new_d + hv, new_d, v))
+        self.settled_nodes += settled
+        return None
+
+    def _potential_edges(self, graph, start, end, edge_penalty, potential) -> Optional[list]:
+        """
+        A* guided by exact distances-to-end from a ShortestPathTree of the same
+        weights. Penalties only raise edge costs, so potential stays a consistent
+        lower bound; with few penalised edges the search walks almost straight down
+        the tree and settles little beyond the detour it has to find.
+        """
+        n = graph.num_nodes
+        weights = graph.weights(self.risk_multiplier)
+        offsets = graph.offsets
+        targets = graph.targets
+        inf = float('inf')
+        if potential[start] == inf:
+            return None
+        dist = [inf] * n
+        parent_edge = [-1] * n
+        dist[start] = 0
+        pq = [(potential[start], 0, start)]
+        settled = 0
+        while pq:
+            _, d, u = heapq.heappop(pq)
+            if d > dist[u]:
+                continue
+            settled += 1
+            if u == end:
+                self.settled_nodes += settled
+                return self._edges_from_parents(graph, start, end, parent_edge)
+            for e in range(offsets[u], offsets[u + 1]):
+                new_d = d + weights[e]
+                if edge_penalty is not None:
+                    new_d += edge_penalty[e]
+                v = targets[e]
+                if new_d < dist[v]:
+                    dist[v] = new_d
+                    parent_edge[v] = e
+                    heapq.heappush(pq, (new_d + potential[v], new_d, v))
+        self.settled_nodes += settled
         return None
 
-    def _path_edges(self, path_keys: list) -> set:
-        """Return set of (u, v) and (v, u) edges for the path."""
-        if not path_keys or len(path_keys) < 2:
+    def _bidirectional_edges(self, graph, start, end, forbidden_edges, edge_penalty) -> Optional[list]:
+        """
+        Bidirectional Dijkstra: alternate forward (from start) and backward (from end)
+        searches and stop once the two queue minima together reach the best meeting cost.
+        The backward search walks edge e = v → u as the forward edge twin[e] = u → v.
+        """
+        n = graph.num_nodes
+        if start == end:
+            return []
+        weights = graph.weights(self.risk_multiplier)
+        offsets = graph.offsets
+        targets = graph.targets
+        twin = graph.twin
+        inf = float('inf')
+        dist = ([inf] * n, [inf] * n)
+        parent_edge = ([-1] * n, [-1] * n)
+        done = (bytearray(n), bytearray(n))
+        dist[0][start] = 0
+        dist[1][end] = 0
+        pqs = ([(0, start)], [(0, end)])
+        best = inf
+        meet = -1
+        settled = 0
+        side = 0
+        while pqs[0] and pqs[1]:
+            if pqs[0][0][0] + pqs[1][0][0] >= best:
+                break
+            # Expand the side with the smaller frontier minimum.
+            side = 0 if pqs[0][0][0] <= pqs[1][0][0] else 1
+            d, u = heapq.heappop(pqs[side])
+            my_dist = dist[side]
+            if d > my_dist[u] or done[side][u]:
+                continue
+            done[side][u] = 1
+            settled += 1
+            other_dist = dist[1 - side]
+            my_parent = parent_edge[side]
+            for e in range(offsets[u], offsets[u + 1]):
+                fe = e if side == 0 else twin[e]  # edge in the start → end direction
+                if forbidden_edges and fe in forbidden_edges:
+                    continue
+                new_d = d + weights[fe]
+                if edge_penalty is not None:
+                    new_d += edge_penalty[fe]
+                v = targets[e]
+                if new_d < my_dist[v]:
+                    my_dist[v] = new_d
+                    my_parent[v] = e
+                    heapq.heappush(pqs[side], (new_d, v))
+                if my_dist[v] + other_dist[v] < best:
+                    best = my_dist[v] + other_dist[v]
+                    meet = v
+            if other_dist[u] < inf and d + other_dist[u] < best:
+                best = d + other_dist[u]
+                meet = u
+        self.settled_nodes += settled
+        if meet < 0:
+            return None
+        fwd = self._edges_from_parents(graph, start, meet, parent_edge[0])
+        bwd = self._edges_from_parents(graph, end, meet, parent_edge[1])
+        return fwd + [twin[e] for e in reversed(bwd)]
+
+    def _edges_from_parents(self, graph: RoadGraph, start: int, end: int, parent_edge: list) -> list:
+        """Walk parent edges back from end to start; return them in start → end order."""
+        edges = []
+        cur = end
+        while cur != start:
+            e = parent_edge[cur]
+            edges.append(e)
+            cur = graph.targets[graph.twin[e]]
+        edges.reverse()
+        return edges
+
+    def _route_from_edges(self, graph: RoadGraph, start: int, edges: list, edge_penalty=None) -> Dict[str, Any]:
+        """Total distance, risk and weight from the start forward, as a single search would."""
+        weights = graph.weights(self.risk_multiplier)
+        path_nodes = [start] + [graph.targets[e] for e in edges]
+        total_distance = 0
+        total_risk = 0
+        weight = 0
+        for e in edges:
+            total_distance += graph.dist[e]
+            total_risk += graph.risk[e]
+            weight += weights[e]
+            if edge_penalty is not None:
+                weight += edge_penalty[e]
+        return {
+            'path_nodes': path_nodes,
+            'total_distance': total_distance,
+            'total_risk': total_risk,
+            'weight': weight,
+            'risk_level': self._risk_level(total_risk),
+        }
+
+    def _path_edges(self, graph: RoadGraph, path_nodes: list) -> set:
+        """Return the directed edge indices (both directions, parallel edges included) along the path."""
+        if not path_nodes or len(path_nodes) < 2:
             return set()
         edges = set()
-        for i in range(len(path_keys) - 1):
-            u, v = path_keys[i], path_keys[i + 1]
-            edges.add((u, v))
-            edges.add((v, u))
+        for i in range(len(path_nodes) - 1):
+            for e in graph.edges_between(path_nodes[i], path_nodes[i + 1]):
+                edges.add(e)
+                edges.add(graph.twin[e])
         return edges
 
     # Penalty added to each edge of a previously used path so next run prefers different edges.
-    # Applied only at query time via edge_penalty dict; graph/segments are never mutated → no reset needed.
+    # Applied only at query time via the edge_penalty array; the graph is never mutated → no reset needed.
     # 100 m: penalized edges cost ~2× a typical 100 m segment — enough to encourage a different path
     # without routing kilometres out of the way (old value 500 created 15 km alternatives on a 9 km route).
     PENALTY_VALUE = 100.0
 
     def dijkstra_k_routes(
         self,
-        graph: dict,
-        start_key: str,
-        end_key: str,
+        graph: RoadGraph,
+        start: int,
+        end: int,
         k: int = 3,
+        tree: Optional[ShortestPathTree] = None,
     ) -> List[Dict[str, Any]]:
         """
         Return up to k distinct routes by reusing Dijkstra: run once, penalize used edges, run again.
-        Does not modify Dijkstra logic or the graph; only adjusts effective edge cost via penalty dict.
+        Does not modify Dijkstra logic or the graph; only adjusts effective edge cost via penalty array.
+        tree: optional precomputed ShortestPathTree rooted at end for this risk
+        multiplier. The first (unpenalised) route is then read from it instead of
+        searched, and the penalised reruns use its distances as an exact A* potential.
 
         Penalty strategy — MIDDLE SECTION ONLY:
           Only the middle 60 % of a completed route's edges are penalized for the next
@@ -163,39 +397,144 @@ class ModifiedDijkstraService:
           completely city-wide different path, producing 9–15 km "alternatives" for a
           7.7 km primary route on a small road network.
         """
-        if start_key not in graph or end_key not in graph:
+        n = graph.num_nodes
+        if start is None or end is None or not (0 <= start < n and 0 <= end < n):
             return []
 
         routes: List[Dict[str, Any]] = []
-        edge_penalty: dict = {}  # (u, v) -> extra cost; temporary, not persisted
-
-        for _ in range(k):
-            best = self._dijkstra_one(
-                graph, start_key, end_key,
-                edge_penalty=edge_penalty if edge_penalty else None,
-            )
+        edge_penalty = None  # directed edge index -> extra cost; temporary, not persisted
+
+        if tree is not None and (tree.root != end or tree.risk_multiplier != float(self.risk_multiplier)):
+            tree = None
+
+        for i in range(k):
+            if tree is None:
+                best = self._dijkstra_one(graph, start, end, edge_penalty=edge_penalty)
+            else:
+                if i == 0:
+                    edges = tree.route_edges(graph, start)
+                else:
+                    edges = self._potential_edges(graph, start, end, edge_penalty, tree.dist)
+                best = None if edges is None else self._route_from_edges(graph, start, edges, edge_penalty)
             if best is None:
                 break
-            path_keys = tuple(best.get('path_keys', []))
-            if not path_keys:
+            path_nodes = tuple(best.get('path_nodes', []))
+            if not path_nodes:
                 break
-            if any(tuple(r.get('path_keys', [])) == path_keys for r in routes):
+            if any(tuple(r.get('path_nodes', [])) == path_nodes for r in routes):
                 break
             routes.append(best)
 
             # Penalise only the MIDDLE section (skip first 20 % and last 20 % of nodes).
             # This keeps approach/departure edges free so next run can share them.
-            pk = list(path_keys)
-            n = len(pk)
-            skip = max(1, n // 5)          # 20 % of path length, minimum 1 node
+            pn = list(path_nodes)
+            n_path = len(pn)
+            skip = max(1, n_path // 5)          # 20 % of path length, minimum 1 node
             mid_start = skip
-            mid_end = max(mid_start + 2, n - skip)  # at least 2 nodes in middle
-            middle = pk[mid_start:mid_end] if n > 2 * skip + 1 else pk
-            for e in self._path_edges(middle):
+            mid_end = max(mid_start + 2, n_path - skip)  # at least 2 nodes in middle
+            middle = pn[mid_start:mid_end] if n_path > 2 * skip + 1 else pn
+            penalised = self._path_edges(graph, middle)
+            if penalised and edge_penalty is None:
+                edge_penalty = [0.0] * graph.num_edges
+            for e in penalised:
                 edge_penalty[e] = self.PENALTY_VALUE
 
         return routes
 
+    def shortest_path_tree(self, graph: RoadGraph, root: int) -> ShortestPathTree:
+        """Full Dijkstra from root over this service's weights (no early exit)."""
+        n = graph.num_nodes
+        weights = graph.weights(self.risk_multiplier)
+        offsets = graph.offsets
+        targets = graph.targets
+        dist = array('d', [float('inf')]) * n
+        parent_edge = array('l', [-1]) * n
+        dist[root] = 0.0
+        pq = [(0.0, root)]
+        settled = 0
+        while pq:
+            d, u = heapq.heappop(pq)
+            if d > dist[u]:
+                continue
+            settled += 1
+            for e in range(offsets[u], offsets[u + 1]):
+                new_d = d + weights[e]
+                v = targets[e]
+                if new_d < dist[v]:
+                    dist[v] = new_d
+                    parent_edge[v] = e
+                    heapq.heappush(pq, (new_d, v))
+        self.settled_nodes += settled
+        return ShortestPathTree(root, float(self.risk_multiplier), dist, parent_edge)
+
+    def bounded_search(self, graph: RoadGraph, root: int, budget: float) -> Dict[int, float]:
+        """
+        Dijkstra from root that settles only nodes within budget (this service's
+        weights). Returns {node: distance} for every settled node.
+        """
+        if root is None or not (0 <= root < graph.num_nodes):
+            return {}
+        weights = graph.weights(self.risk_multiplier)
+        offsets = graph.offsets
+        targets = graph.targets
+        dist = {root: 0.0}
+        settled: Dict[int, float] = {}
+        pq = [(0.0, root)]
+        while pq:
+            d, u = heapq.heappop(pq)
+            if u in settled:
+                continue
+            settled[u] = d
+            for e in range(offsets[u], offsets[u + 1]):
+                new_d = d + weights[e]
+                v = targets[e]
+                if new_d <= budget and new_d < dist.get(v, budget + 1.0):
+                    dist[v] = new_d
+                    heapq.heappush(pq, (new_d, v))
+        self.settled_nodes += len(settled)
+        return settled
+
+    def dijkstra_one_to_many(self, graph: RoadGraph, start: int, ends) -> Dict[int, Dict[str, Any]]:
+        """
+        One Dijkstra from start that stops as soon as every node in ends is settled.
+        Returns {end: route dict} (same shape as a dijkstra_k_routes entry) for each
+        reachable end; each route is the optimal path a single-pair search returns.
+        """
+        n = graph.num_nodes
+        if start is None or not (0 <= start < n):
+            return {}
+        remaining = {e for e in ends if e is not None and 0 <= e < n}
+        weights = graph.weights(self.risk_multiplier)
+        offsets = graph.offsets
+        targets = graph.targets
+        inf = float('inf')
+        dist = [inf] * n
+        parent_edge = [-1] * n
+        dist[start] = 0
+        pq = [(0, start)]
+        settled = 0
+        found = []
+        while pq and remaining:
+            d, u = heapq.heappop(pq)
+            if d > dist[u]:
+                continue
+            settled += 1
+            if u in remaining:
+                remaining.discard(u)
+                found.append(u)
+            for e in range(offsets[u], offsets[u + 1]):
+                new_d = d + weights[e]
+                v = targets[e]
+                if new_d < dist[v]:
+                    dist[v] = new_d
+                    parent_edge[v] = e
+                    heapq.heappush(pq, (new_d, v))
+        self.settled_nodes += settled
+        return {
+            end: self._route_from_edges(graph, start, self._edges_from_parents(graph, start, end, parent_edge))
+            for end in found
+        }
+
     def _risk_level(self, total_risk: float) -> str:
         """
         Classify accumulated edge risk into a colour band.
@@ -215,7 +554,14 @@ class ModifiedDijkstraService:
     # consistent with what the road risk layer shows on the map.
     BRIDGE_RISK = 0.0
 
-    def _bridge_components(self, graph: dict, nodes: set) -> dict:
+    def _bridge_components(self, graph: RoadGraph) -> RoadGraph:
+        """
+        Return a NEW RoadGraph with the bridge edges from _find_bridges() appended
+        (the graph itself when it is already connected); the original is never mutated.
+        """
+        return graph.with_extra_edges(self._find_bridges(graph))
+
+    def _find_bridges(self, graph: RoadGraph) -> list:
         """
         Detect disconnected graph components and stitch each one to the nearest node
         in the growing connected set via a synthetic bidirectional bridge edge.
@@ -225,7 +571,7 @@ class ModifiedDijkstraService:
         Dijkstra returns empty routes whenever the user's snapped start node and the
         evacuation centre's snapped end node lie in different components.
 
-        Algorithm (O(V²) in the number of graph nodes, fast for ≤ ~3 000 nodes):
+        Algorithm (grid nearest-neighbour per component node):
           1. BFS to discover all components; sort largest-first.
           2. Keep a "connected set" initialised with the main (largest) component.
           3. For each remaining component, find the closest pair of nodes
@@ -234,20 +580,14 @@ class ModifiedDijkstraService:
           4. Add a bidirectional bridge edge with haversine distance and BRIDGE_RISK.
           5. Merge the newly connected component into the connected set.
 
-        Returns a NEW adjacency dict; the original is never mutated.
+        Returns the bridges as (u, v, distance_m, BRIDGE_RISK) tuples. They depend
+        only on geometry, so network_cache persists them per road-network version.
         """
-        def _bfs_comp(start: str) -> set:
-            comp: set = set()
-            q = deque([start])
-            while q:
-                n = q.popleft()
-                if n in comp:
-                    continue
-                comp.add(n)
-                for v, *_ in graph.get(n, []):
-                    if v not in comp:
-                        q.append(v)
-            return comp
+        n = graph.num_nodes
+        offsets = graph.offsets
+        targets = graph.targets
+        node_lat = graph.node_lat
+        node_lng = graph.node_lng
 
         def _hav_m(la1: float, ln1: float, la2: float, ln2: float) -> float:
             dlat = math.radians(la2 - la1)
@@ -257,49 +597,42 @@ class ModifiedDijkstraService:
                  * math.sin(dlng / 2) ** 2)
             return 6_371_000.0 * 2.0 * math.asin(min(1.0, math.sqrt(a)))
 
-        # 1. Discover all components
-        visited: set = set()
+        # 1. Discover all components (BFS over node ids, labelled in place)
+        comp_of = [-1] * n
         components: list = []
-        for nd in nodes:
-            if nd not in visited:
-                comp = _bfs_comp(nd)
-                visited.update(comp)
-                components.append(comp)
+        for root in range(n):
+            if comp_of[root] != -1:
+                continue
+            cid = len(components)
+            comp = [root]
+            comp_of[root] = cid
+            q = deque([root])
+            while q:
+                u = q.popleft()
+                for e in range(offsets[u], offsets[u + 1]):
+                    v = targets[e]
+                    if comp_of[v] == -1:
+                        comp_of[v] = cid
+                        comp.append(v)
+                        q.append(v)
+            components.append(comp)
 
         if len(components) <= 1:
-            return graph  # already fully connected — nothing to do
+            return []  # already fully connected — nothing to do
 
         components.sort(key=lambda c: -len(c))
 
-        # 2. Shallow-copy adjacency lists so we can append bridge edges
-        bridged: dict = {k: list(v) for k, v in graph.items()}
-
-        connected_set: set = set(components[0])
-
-        # Pre-cache (lat, lng) tuples to avoid repeated string splits
-        _coords_cache: dict = {}
-
-        def _coords(key: str):
-            if key not in _coords_cache:
-                la, ln = key.split(',')
-                _coords_cache[key] = (float(la), float(ln))
-            return _coords_cache[key]
-
-        # Preload coords for the initial connected set
-        for k in connected_set:
-            _coords(k)
-
         # Spatial grid over the connected set for fast nearest-neighbour lookup.
         # Cell size ~2 km so each query searches ≤ a handful of cells.
         GRID_DEG = 0.02
         conn_grid: dict = defaultdict(list)
-        for mn in connected_set:
-            mla, mln = _coords(mn)
-            conn_grid[(int(mla / GRID_DEG), int(mln / GRID_DEG))].append(mn)
+        for mn in components[0]:
+            conn_grid[(int(node_lat[mn] / GRID_DEG), int(node_lng[mn] / GRID_DEG))].append(mn)
 
-        def _nearest_in_connected(query_key: str):
-            """Return (nearest_key, dist_sq) from the connected set using grid lookup."""
-            qla, qln = _coords(query_key)
+        def _nearest_in_connected(query: int):
+            """Return (nearest_node, dist_sq) from the connected set using grid lookup."""
+            qla = node_lat[query]
+            qln = node_lng[query]
             qr = int(qla / GRID_DEG)
             qc = int(qln / GRID_DEG)
             best_d_sq = float('inf')
@@ -310,9 +643,8 @@ class ModifiedDijkstraService:
                     for dc in range(-radius, radius + 1):
                         if abs(dr) != radius and abs(dc) != radius:
                             continue  # only the outer ring of this radius
-                        for mn in conn_grid.get((qr + dr, qc + dc), []):
-                            mla, mln = _coords(mn)
-                            d_sq = (qla - mla) ** 2 + (qln - mln) ** 2
+                        for mn in conn_grid.get((qr + dr, qc + dc), ()):
+                            d_sq = (qla - node_lat[mn]) ** 2 + (qln - node_lng[mn]) ** 2
                             if d_sq < best_d_sq:
                                 best_d_sq = d_sq
                                 best_mn = mn
@@ -324,6 +656,7 @@ class ModifiedDijkstraService:
             return best_mn, best_d_sq
 
         # 3-5. Bridge each isolated component to the connected set
+        bridges = []
         for comp in components[1:]:
             best_d_sq = float('inf')
             best_cn = best_mn = None
@@ -338,25 +671,14 @@ class ModifiedDijkstraService:
             if best_cn is None:
                 continue
 
-            cla, cln = _coords(best_cn)
-            mla, mln = _coords(best_mn)
-            bridge_dist = _hav_m(cla, cln, mla, mln)
-            bridge_w = bridge_dist + self.BRIDGE_RISK * self.risk_multiplier
+            bridge_dist = _hav_m(node_lat[best_cn], node_lng[best_cn], node_lat[best_mn], node_lng[best_mn])
+            bridges.append((best_cn, best_mn, bridge_dist, self.BRIDGE_RISK))
 
-            if best_cn not in bridged:
-                bridged[best_cn] = []
-            if best_mn not in bridged:
-                bridged[best_mn] = []
-            bridged[best_cn].append((best_mn, bridge_w, bridge_dist, self.BRIDGE_RISK))
-            bridged[best_mn].append((best_cn, bridge_w, bridge_dist, self.BRIDGE_RISK))
+            # Add the newly connected nodes to the spatial grid
+            for nd in comp:
+                conn_grid[(int(node_lat[nd] / GRID_DEG), int(node_lng[nd] / GRID_DEG))].append(nd)
 
-            # Cache coords for newly connected nodes and add them to the spatial grid
-            for k in comp:
-                kla, kln = _coords(k)
-                conn_grid[(int(kla / GRID_DEG), int(kln / GRID_DEG))].append(k)
-            connected_set.update(comp)
-
-        return bridged
+        return bridges
 
     def get_safest_routes(
         self,
@@ -371,46 +693,67 @@ class ModifiedDijkstraService:
         Public API: build graph from segments, bridge disconnected components,
         find nearest nodes to start/end, return k safest routes with risk level.
         """
-        graph, nodes = self.build_graph(segments)
+        graph = self.build_graph(segments)
         # Bridge isolated sub-graphs caused by OSM data gaps so Dijkstra can
         # always find a path regardless of which component start/end snap to.
-        graph = self._bridge_components(graph, nodes)
-        start_key = _key(_float(start_lat), _float(start_lng))
-        end_key = _key(_float(end_lat), _float(end_lng))
-        if start_key not in nodes:
-            start_key = self._nearest_node(start_key, nodes)
-        if end_key not in nodes:
-            end_key = self._nearest_node(end_key, nodes)
-        routes = self.dijkstra_k_routes(graph, start_key, end_key, k=k)
-        # Convert path_keys to list of [lat, lng]
+        graph = self._bridge_components(graph)
+        return self.get_safest_routes_on_graph(
+            graph, start_lat, start_lng, end_lat, end_lng, k=k,
+        )
+
+    def get_safest_routes_on_graph(
+        self,
+        graph: RoadGraph,
+        start_lat: float,
+        start_lng: float,
+        end_lat: float,
+        end_lng: float,
+        k: int = 3,
+        tree: Optional[ShortestPathTree] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Same as get_safest_routes() but on an already built and bridged graph
+        (e.g. the cached one from mobile_sync.services.network_cache).
+        Edge weights for this service's risk_multiplier are cached on the graph.
+        tree: optional ShortestPathTree rooted at the destination (see dijkstra_k_routes).
+        """
+        start = self._nearest_node(graph, _float(start_lat), _float(start_lng))
+        end = self._nearest_node(graph, _float(end_lat), _float(end_lng))
+        routes = self.dijkstra_k_routes(graph, start, end, k=k, tree=tree)
+        # String keys and [lat, lng] coordinates are produced only here, at the boundary.
         for r in routes:
-            r['path'] = [self._key_to_coords(p) for p in r['path_keys']]
+            nodes = r.pop('path_nodes')
+            r['path_keys'] = [graph.key(nd) for nd in nodes]
+            r['path'] = [graph.coords(nd) for nd in nodes]
         return routes
 
-    def _nearest_node(self, key: str, nodes: set) -> str:
-        """Return nearest node by string key (approximate)."""
-        if not nodes:
-            return key
-        try:
-            lat, lng = map(float, key.split(','))
-        except Exception:
-            return next(iter(nodes))
-        best = None
-        best_d = float('inf')
-        for n in nodes:
-            try:
-                la, ln = map(float, n.split(','))
-                d = (lat - la) ** 2 + (lng - ln) ** 2
-                if d < best_d:
-                    best_d = d
-                    best = n
-            except Exception:
-                continue
-        return best or key
-
-    def _key_to_coords(self, key: str) -> List[float]:
-        try:
-            lat, lng = key.split(',')
-            return [float(lat), float(lng)]
-        except Exception:
-            return [0, 0]
+    def get_routes_to_many_on_graph(
+        self,
+        graph: RoadGraph,
+        start_lat: float,
+        start_lng: float,
+        destinations,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Best route from (start_lat, start_lng) to each (lat, lng) in destinations,
+        found by a single one-to-many search. Returns one route dict (with
+        path_keys / path, as get_safest_routes_on_graph) or None per destination.
+        """
+        start = self._nearest_node(graph, _float(start_lat), _float(start_lng))
+        ends = [self._nearest_node(graph, _float(lat), _float(lng)) for lat, lng in destinations]
+        found = self.dijkstra_one_to_many(graph, start, ends)
+        routes = []
+        for end in ends:
+            r = found.get(end)
+            if r is not None:
+                r = dict(r)
+                nodes = r.pop('path_nodes')
+                r['path_keys'] = [graph.key(nd) for nd in nodes]
+                r['path'] = [graph.coords(nd) for nd in nodes]
+            routes.append(r)
+        return routes
+
+    def _nearest_node(self, graph: RoadGraph, lat: float, lng: float) -> Optional[int]:
+        """Return the id of the nearest graph node (approximate), or None for an empty graph."""
+        return graph.nearest_node(lat, lng)
+
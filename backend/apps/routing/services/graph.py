@@ -0,0 +1,266 @@
+"""
+Compact integer-indexed road graph in compressed-sparse-row (CSR) form.
+
+Nodes are integer ids 0..n-1 with coordinates held in float arrays. The outgoing
+edges of node u are the directed edge indices offsets[u] .. offsets[u + 1] - 1;
+targets / dist / risk are parallel arrays over those indices. Every undirected
+road edge is stored as two directed edges and twin[e] is the opposite direction,
+so penalties and bans can be applied to both at once.
+
+The "lat,lng" string keys of the old dict-of-lists graph are only used to
+deduplicate nodes while building and to label paths at the API boundary; the
+search itself never hashes or parses a string.
+"""
+import math
+from array import array
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+from core.utils.spatial import GridIndex
+
+# Matches core.utils.geo.haversine_meters and the bridge-edge haversine.
+EARTH_RADIUS_M = 6_371_000.0
+
+
+def node_key(lat: float, lng: float) -> str:
+    """Canonical string key for a node (6 decimals ≈ 0.1 m)."""
+    return f"{lat:.6f},{lng:.6f}"
+
+
+class RoadGraph:
+    """
+    Immutable CSR road graph.
+
+    Undirected edges keep their insertion order (segment order, then bridge
+    edges) in und_u / und_v / und_dist / und_risk; directed edge e belongs to
+    undirected edge und_index[e]. Per-multiplier weight arrays
+    (dist + risk × multiplier) are computed on first use and cached.
+    """
+
+    __slots__ = (
+        'node_lat', 'node_lng', 'offsets', 'targets', 'dist', 'risk', 'twin',
+        'und_index', 'und_u', 'und_v', 'und_dist', 'und_risk', '_weights', '_spatial',
+        '_xyz', '_h_scale', '_ch', '_ch_metrics',
+    )
+
+    def __init__(
+        self,
+        node_lat: Sequence[float],
+        node_lng: Sequence[float],
+        und_u: Sequence[int],
+        und_v: Sequence[int],
+        und_dist: Sequence[float],
+        und_risk: Sequence[float],
+    ):
+        n = len(node_lat)
+        m = len(und_u)
+        self.node_lat = array('d', node_lat)
+        self.node_lng = array('d', node_lng)
+        self.und_u = array('l', und_u)
+        self.und_v = array('l', und_v)
+        self.und_dist = array('d', und_dist)
+        self.und_risk = array('d', und_risk)
+
+        # Counting sort of the 2m directed edges by source node. Filling in
+        # undirected-edge order keeps each node's neighbour order identical to
+        # appending to a per-node list, which keeps search tie-breaking stable.
+        degree = [0] * (n + 1)
+        for i in range(m):
+            degree[self.und_u[i] + 1] += 1
+            degree[self.und_v[i] + 1] += 1
+        for i in range(n):
+            degree[i + 1] += degree[i]
+        self.offsets = array('l', degree)
+
+        cursor = list(degree[:n]) if n else []
+        targets = [0] * (2 * m)
+        dist = [0.0] * (2 * m)
+        risk = [0.0] * (2 * m)
+        twin = [0] * (2 * m)
+        und_index = [0] * (2 * m)
+        for i in range(m):
+            u = self.und_u[i]
+            v = self.und_v[i]
+            d = self.und_dist[i]
+            r = self.und_risk[i]
+            fwd = cursor[u]
+            cursor[u] += 1
+            bwd = cursor[v]
+            cursor[v] += 1
+            targets[fwd] = v
+            targets[bwd] = u
+            dist[fwd] = dist[bwd] = d
+            risk[fwd] = risk[bwd] = r
+            twin[fwd] = bwd
+            twin[bwd] = fwd
+            und_index[fwd] = und_index[bwd] = i
+        self.targets = array('l', targets)
+        self.dist = array('d', dist)
+        self.risk = array('d', risk)
+        self.twin = array('l', twin)
+        self.und_index = array('l', und_index)
+        self._weights: dict = {}
+        self._spatial = None
+        self._xyz = None
+        self._h_scale = None
+        self._ch = None
+        self._ch_metrics: dict = {}
+
+    # ── construction ────────────────────────────────────────────────────────
+
+    @classmethod
+    def from_segments(cls, segments: Iterable, coord=float) -> 'RoadGraph':
+        """
+        Build from RoadSegment-like objects (start_lat, start_lng, end_lat, end_lng,
+        base_distance, effective_risk or predicted_risk_score). Endpoints that share
+        the same 6-decimal key become the same node; node coordinates are the
+        key's rounded values so paths match the old string-keyed output exactly.
+        """
+        key_to_id: dict = {}
+        node_lat: List[float] = []
+        node_lng: List[float] = []
+
+        def _node(lat: float, lng: float) -> int:
+            k = node_key(lat, lng)
+            nid = key_to_id.get(k)
+            if nid is None:
+                nid = len(node_lat)
+                key_to_id[k] = nid
+                la, ln = k.split(',')
+                node_lat.append(float(la))
+                node_lng.append(float(ln))
+            return nid
+
+        und_u: List[int] = []
+        und_v: List[int] = []
+        und_dist: List[float] = []
+        und_risk: List[float] = []
+        for seg in segments:
+            u = _node(coord(seg.start_lat), coord(seg.start_lng))
+            v = _node(coord(seg.end_lat), coord(seg.end_lng))
+            und_u.append(u)
+            und_v.append(v)
+            und_dist.append(coord(seg.base_distance))
+            # Use effective_risk (base + hazard proximity) when set; else predicted_risk_score
+            und_risk.append(coord(getattr(seg, 'effective_risk', getattr(seg, 'predicted_risk_score', 0))))
+        return cls(node_lat, node_lng, und_u, und_v, und_dist, und_risk)
+
+    def with_extra_edges(self, edges: Sequence[Tuple[int, int, float, float]]) -> 'RoadGraph':
+        """Return a new graph with (u, v, dist, risk) undirected edges appended."""
+        if not edges:
+            return self
+        graph = RoadGraph(
+            self.node_lat,
+            self.node_lng,
+            list(self.und_u) + [e[0] for e in edges],
+            list(self.und_v) + [e[1] for e in edges],
+            list(self.und_dist) + [e[2] for e in edges],
+            list(self.und_risk) + [e[3] for e in edges],
+        )
+        graph._spatial = self._spatial  # same nodes, same index
+        graph._xyz = self._xyz
+        return graph
+
+    # ── accessors ───────────────────────────────────────────────────────────
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_lat)
+
+    @property
+    def num_edges(self) -> int:
+        """Number of directed edges (two per undirected road edge)."""
+        return len(self.targets)
+
+    def __len__(self) -> int:
+        return self.num_nodes
+
+    def weights(self, risk_multiplier: float) -> array:
+        """Directed edge weights: base_distance + risk × risk_multiplier."""
+        key = float(risk_multiplier)
+        w = self._weights.get(key)
+        if w is None:
+            w = array('d', [d + r * key for d, r in zip(self.dist, self.risk)])
+            self._weights[key] = w
+        return w
+
+    def key(self, node: int) -> str:
+        return node_key(self.node_lat[node], self.node_lng[node])
+
+    def coords(self, node: int) -> List[float]:
+        return [self.node_lat[node], self.node_lng[node]]
+
+    def edges_between(self, u: int, v: int) -> List[int]:
+        """All directed edge indices u → v (parallel segments included)."""
+        targets = self.targets
+        return [e for e in range(self.offsets[u], self.offsets[u + 1]) if targets[e] == v]
+
+    def unit_vectors(self) -> Tuple[array, array, array]:
+        """Node positions as points on a sphere of EARTH_RADIUS_M (x, y, z arrays, metres)."""
+        if self._xyz is None:
+            xs, ys, zs = array('d'), array('d'), array('d')
+            for lat, lng in zip(self.node_lat, self.node_lng):
+                phi = math.radians(lat)
+                lam = math.radians(lng)
+                xs.append(EARTH_RADIUS_M * math.cos(phi) * math.cos(lam))
+                ys.append(EARTH_RADIUS_M * math.cos(phi) * math.sin(lam))
+                zs.append(EARTH_RADIUS_M * math.sin(phi))
+            self._xyz = (xs, ys, zs)
+        return self._xyz
+
+    @property
+    def heuristic_scale(self) -> float:
+        """
+        Largest factor c with c × chord(u, v) <= base_distance(u, v) on every edge.
+
+        The straight-line chord through the sphere never exceeds the haversine arc,
+        and c absorbs segments whose stored base_distance is slightly shorter than
+        their endpoints' separation, so c × chord(node, target) is a consistent
+        (hence admissible) A* heuristic for any risk_multiplier >= 0.
+        """
+        if self._h_scale is None:
+            xs, ys, zs = self.unit_vectors()
+            scale = 1.0
+            for i in range(len(self.und_u)):
+                u = self.und_u[i]
+                v = self.und_v[i]
+                chord = math.sqrt((xs[u] - xs[v]) ** 2 + (ys[u] - ys[v]) ** 2 + (zs[u] - zs[v]) ** 2)
+                if chord > 0 and self.und_dist[i] < scale * chord:
+                    scale = max(0.0, self.und_dist[i]) / chord
+            self._h_scale = scale
+        return self._h_scale
+
+    @property
+    def spatial_index(self) -> GridIndex:
+        """Grid index over node coordinates, built on first use (ids = node ids)."""
+        if self._spatial is None:
+            self._spatial = GridIndex(self.node_lat, self.node_lng)
+        return self._spatial
+
+    @property
+    def contraction_hierarchy(self):
+        """Metric-independent ContractionHierarchy for this topology, built on first use."""
+        if self._ch is None:
+            from .ch import ContractionHierarchy
+            self._ch = ContractionHierarchy(self)
+        return self._ch
+
+    def attach_hierarchy(self, hierarchy) -> bool:
+        """Reuse a hierarchy preprocessed for an identical topology; False if it does not match."""
+        if hierarchy is None or not hierarchy.matches(self):
+            return False
+        self._ch = hierarchy
+        return True
+
+    def ch_metric(self, risk_multiplier: float):
+        """Hierarchy customized with weights(risk_multiplier); cached per multiplier."""
+        key = float(risk_multiplier)
+        metric = self._ch_metrics.get(key)
+        if metric is None:
+            metric = self.contraction_hierarchy.customize(self.weights(key))
+            self._ch_metrics[key] = metric
+        return metric
+
+    def nearest_node(self, lat: float, lng: float) -> Optional[int]:
+        """Id of the node nearest to (lat, lng) in metres, or None for an empty graph."""
+        found = self.spatial_index.nearest(lat, lng)
+        return found[0] if found else None
@@ -4,6 +4,7 @@ Tests for Modified Dijkstra routing service.
 import unittest
 from decimal import Decimal
 from apps.routing.services.dijkstra import ModifiedDijkstraService
+from apps.routing.services.graph import RoadGraph
 
 
 class MockSegment:
@@ -32,18 +33,21 @@ class ModifiedDijkstraServiceTests(unittest.TestCase):
 
     def test_build_graph(self):
         """Test that graph building works."""
-        graph, nodes = self.service.build_graph(self.segments)
-        self.assertIsInstance(graph, dict)
-        self.assertIsInstance(nodes, set)
-        self.assertGreater(len(nodes), 0)
-        self.assertGreater(len(graph), 0)
+        graph = self.service.build_graph(self.segments)
+        self.assertIsInstance(graph, RoadGraph)
+        # A, B, C and the risky segment's distinct end point
+        self.assertEqual(graph.num_nodes, 4)
+        self.assertEqual(graph.num_edges, 2 * len(self.segments))
 
     def test_build_graph_bidirectional(self):
         """Test that graph is bidirectional."""
-        graph, nodes = self.service.build_graph(self.segments)
+        graph = self.service.build_graph(self.segments)
         # Each segment should create edges in both directions
-        for key in graph:
-            self.assertIsInstance(graph[key], list)
+        for e in range(graph.num_edges):
+            twin = graph.twin[e]
+            self.assertEqual(graph.twin[twin], e)
+            self.assertIn(e, graph.edges_between(graph.targets[twin], graph.targets[e]))
+            self.assertEqual(graph.dist[e], graph.dist[twin])
 
     def test_get_safest_routes_simple(self):
         """Test finding routes in simple graph."""
@@ -105,16 +109,225 @@ class ModifiedDijkstraServiceTests(unittest.TestCase):
         self.assertIsInstance(routes_low, list)
         self.assertIsInstance(routes_high, list)
 
-    def test_key_to_coords(self):
-        """Test coordinate key conversion."""
-        coords = self.service._key_to_coords("14.599500,120.984200")
-        self.assertIsInstance(coords, list)
-        self.assertEqual(len(coords), 2)
-        self.assertIsInstance(coords[0], float)
-        self.assertIsInstance(coords[1], float)
-
     def test_nearest_node_empty(self):
-        """Test nearest node with empty set."""
-        key = "14.599500,120.984200"
-        result = self.service._nearest_node(key, set())
-        self.assertEqual(result, key)
+        """Test nearest node with empty graph."""
+        graph = self.service.build_graph([])
+        self.assertIsNone(self.service._nearest_node(graph, 14.5995, 120.9842))
+
+    def test_path_keys_match_coordinates(self):
+        """String keys are produced at the boundary and agree with the path."""
+        routes = self.service.get_safest_routes(
+            self.segments, 14.5995, 120.9842, 14.6005, 120.9842, k=1
+        )
+        self.assertEqual(
+            routes[0]['path_keys'],
+            ['14.599500,120.984200', '14.600000,120.984200', '14.600500,120.984200'],
+        )
+        self.assertEqual(
+            routes[0]['path'],
+            [[float(part) for part in key.split(',')] for key in routes[0]['path_keys']],
+        )
+        self.assertAlmostEqual(routes[0]['total_distance'], 200.0)
+
+    def test_bridge_components_connects_islands(self):
+        """A disconnected segment is reachable after bridging."""
+        segments = self.segments + [
+            MockSegment(14.6010, 120.9842, 14.6015, 120.9842, 50.0, 0.0),
+        ]
+        graph = self.service.build_graph(segments)
+        self.assertEqual(
+            self.service.dijkstra_k_routes(
+                graph, graph.nearest_node(14.5995, 120.9842), graph.nearest_node(14.6015, 120.9842), k=1
+            ),
+            [],
+        )
+        routes = self.service.get_safest_routes(
+            segments, 14.5995, 120.9842, 14.6015, 120.9842, k=1
+        )
+        self.assertEqual(routes[0]['path_keys'][-1], '14.601500,120.984200')
+
+
+class SearchModeTests(unittest.TestCase):
+    """A* and bidirectional search must return the same routes as Dijkstra."""
+
+    def setUp(self):
+        import random
+        rnd = random.Random(3)
+        # 12 x 12 street grid, ~110 m blocks, lengths >= straight line, random risk.
+        step = 0.001
+        self.segments = []
+        for i in range(12):
+            for j in range(12):
+                lat, lng = 12.70 + i * step, 123.90 + j * step
+                if i + 1 < 12:
+                    self.segments.append(MockSegment(
+                        lat, lng, lat + step, lng, 111.2 + rnd.random() * 30, rnd.random() * 0.6))
+                if j + 1 < 12:
+                    self.segments.append(MockSegment(
+                        lat, lng, lat, lng + step, 108.5 + rnd.random() * 30, rnd.random() * 0.6))
+
+    def test_unknown_mode_rejected(self):
+        with self.assertRaises(ValueError):
+            ModifiedDijkstraService(search_mode='greedy')
+
+    def test_modes_return_identical_routes(self):
+        reference = ModifiedDijkstraService()
+        graph = reference.build_graph(self.segments)
+        pairs = [(0, graph.num_nodes - 1), (5, 130), (17, 17), (140, 3)]
+        for mode in ('astar', 'bidirectional'):
+            service = ModifiedDijkstraService(search_mode=mode)
+            for start, end in pairs:
+                self.assertEqual(
+                    service.dijkstra_k_routes(graph, start, end, k=3),
+                    reference.dijkstra_k_routes(graph, start, end, k=3),
+                    msg=f'{mode} {start}->{end}',
+                )
+
+    def test_astar_settles_fewer_nodes(self):
+        dijkstra = ModifiedDijkstraService(risk_multiplier=0.0)
+        astar = ModifiedDijkstraService(risk_multiplier=0.0, search_mode='astar')
+        graph = dijkstra.build_graph(self.segments)
+        start = graph.nearest_node(12.700, 123.900)
+        end = graph.nearest_node(12.705, 123.905)
+        self.assertEqual(
+            astar.dijkstra_k_routes(graph, start, end, k=1),
+            dijkstra.dijkstra_k_routes(graph, start, end, k=1),
+        )
+        self.assertLess(astar.settled_nodes, dijkstra.settled_nodes)
+
+    def test_heuristic_scale_is_admissible(self):
+        # A segment stored shorter than its endpoints' separation lowers the scale.
+        segments = [MockSegment(12.7000, 123.9000, 12.7010, 123.9000, 100.0, 0.0)]
+        graph = ModifiedDijkstraService().build_graph(segments)
+        self.assertLess(graph.heuristic_scale, 1.0)
+        self.assertGreater(graph.heuristic_scale, 0.85)
+
+    def test_one_to_many_matches_single_pair(self):
+        service = ModifiedDijkstraService()
+        graph = service.build_graph(self.segments)
+        start = 5
+        ends = [0, 77, graph.num_nodes - 1, 5]
+        found = service.dijkstra_one_to_many(graph, start, ends)
+        self.assertEqual(set(found), set(ends))
+        for end in ends:
+            self.assertEqual(found[end], service._dijkstra_one(graph, start, end))
+
+    def test_bounded_search_matches_full_tree(self):
+        for multiplier in (150.0, 0.0):
+            service = ModifiedDijkstraService(risk_multiplier=multiplier)
+            graph = service.build_graph(self.segments)
+            tree = service.shortest_path_tree(graph, 77)
+            budget = 600.0
+            reach = service.bounded_search(graph, 77, budget)
+            expected = {v: d for v, d in enumerate(tree.dist) if d <= budget}
+            self.assertEqual(set(reach), set(expected))
+            for v, d in expected.items():
+                self.assertAlmostEqual(reach[v], d, places=9)
+
+    def test_shortest_path_tree_matches_search(self):
+        service = ModifiedDijkstraService()
+        graph = service.build_graph(self.segments)
+        root = 77
+        tree = service.shortest_path_tree(graph, root)
+        for start in (0, 5, 77, 143):
+            self.assertEqual(
+                service.dijkstra_k_routes(graph, start, root, k=3, tree=tree),
+                service.dijkstra_k_routes(graph, start, root, k=3),
+            )
+
+    def test_tree_for_other_root_or_multiplier_is_ignored(self):
+        service = ModifiedDijkstraService()
+        graph = service.build_graph(self.segments)
+        wrong_root = service.shortest_path_tree(graph, 10)
+        wrong_mult = ModifiedDijkstraService(risk_multiplier=0.0).shortest_path_tree(graph, 77)
+        expected = service.dijkstra_k_routes(graph, 0, 77, k=1)
+        self.assertEqual(service.dijkstra_k_routes(graph, 0, 77, k=1, tree=wrong_root), expected)
+        self.assertEqual(service.dijkstra_k_routes(graph, 0, 77, k=1, tree=wrong_mult), expected)
+
+    def test_alternatives_engine_matches_reruns_with_fewer_settled_nodes(self):
+        searches = ModifiedDijkstraService()
+        engine = ModifiedDijkstraService()
+        graph = searches.build_graph(self.segments)
+        tree = engine.shortest_path_tree(graph, 140)
+        engine.settled_nodes = 0
+        for start in (0, 3, 60, 131):
+            self.assertEqual(
+                engine.dijkstra_k_routes(graph, start, 140, k=3, tree=tree),
+                searches.dijkstra_k_routes(graph, start, 140, k=3),
+            )
+        self.assertLess(engine.settled_nodes, searches.settled_nodes)
+
+
+class ContractionHierarchyTests(unittest.TestCase):
+    """The 'ch' mode must return the reference (plain Dijkstra) optimum."""
+
+    def setUp(self):
+        import random
+        self.rnd = random.Random(11)
+        step = 0.001
+        self.segments = []
+        # 10 x 10 grid with random diagonals, a duplicated (parallel) segment and
+        # a separate 3-node street that nothing connects to.
+        for i in range(10):
+            for j in range(10):
+                lat, lng = 12.70 + i * step, 123.90 + j * step
+                if i + 1 < 10:
+                    self.segments.append(MockSegment(
+                        lat, lng, lat + step, lng, 111.2 + self.rnd.random() * 30, self.rnd.random()))
+                if j + 1 < 10:
+                    self.segments.append(MockSegment(
+                        lat, lng, lat, lng + step, 108.5 + self.rnd.random() * 30, self.rnd.random()))
+                if i + 1 < 10 and j + 1 < 10 and self.rnd.random() < 0.2:
+                    self.segments.append(MockSegment(
+                        lat, lng, lat + step, lng + step, 160.0 + self.rnd.random() * 30, self.rnd.random()))
+        self.segments.append(MockSegment(12.700, 123.900, 12.701, 123.900, 90.0, 0.9))
+        self.segments.append(MockSegment(12.750, 123.950, 12.751, 123.950, 111.0, 0.0))
+        self.segments.append(MockSegment(12.751, 123.950, 12.752, 123.950, 111.0, 0.0))
+
+    def _assert_matches_reference(self, graph, multiplier, pairs):
+        reference = ModifiedDijkstraService(risk_multiplier=multiplier)
+        ch = ModifiedDijkstraService(risk_multiplier=multiplier, search_mode='ch')
+        for start, end in pairs:
+            expected = reference._dijkstra_one(graph, start, end)
+            got = ch._dijkstra_one(graph, start, end)
+            if expected is None:
+                self.assertIsNone(got)
+                continue
+            self.assertAlmostEqual(got['weight'], expected['weight'], places=6)
+            nodes = got['path_nodes']
+            self.assertEqual((nodes[0], nodes[-1]), (start, end))
+            for u, v in zip(nodes, nodes[1:]):
+                self.assertTrue(graph.edges_between(u, v))
+        return ch
+
+    def test_matches_reference_for_random_pairs(self):
+        graph = ModifiedDijkstraService().build_graph(self.segments)
+        pairs = [(self.rnd.randrange(graph.num_nodes), self.rnd.randrange(graph.num_nodes)) for _ in range(150)]
+        pairs += [(0, graph.num_nodes - 1), (4, 4)]
+        for multiplier in (150.0, 0.0):
+            self._assert_matches_reference(graph, multiplier, pairs)
+
+    def test_customization_follows_new_risks(self):
+        service = ModifiedDijkstraService()
+        graph = service.build_graph(self.segments)
+        hierarchy = graph.contraction_hierarchy
+        for seg in self.segments[::3]:
+            seg.predicted_risk_score = 1.0
+        riskier = service.build_graph(self.segments)
+        self.assertTrue(riskier.attach_hierarchy(hierarchy))
+        self.assertIs(riskier.contraction_hierarchy, hierarchy)
+        pairs = [(self.rnd.randrange(riskier.num_nodes), self.rnd.randrange(riskier.num_nodes)) for _ in range(60)]
+        self._assert_matches_reference(riskier, 150.0, pairs)
+
+    def test_hierarchy_rejected_for_other_topology(self):
+        service = ModifiedDijkstraService()
+        hierarchy = service.build_graph(self.segments).contraction_hierarchy
+        other = service.build_graph(self.segments[:-1])
+        self.assertFalse(other.attach_hierarchy(hierarchy))
+
+    def test_k_routes_use_hierarchy_then_penalised_reruns(self):
+        graph = ModifiedDijkstraService().build_graph(self.segments)
+        reference = ModifiedDijkstraService().dijkstra_k_routes(graph, 0, 99, k=3)
+        routes = ModifiedDijkstraService(search_mode='ch').dijkstra_k_routes(graph, 0, 99, k=3)
+        self.assertEqual(len(routes), len(reference))
+        self.assertAlmostEqual(routes[0]['weight'], reference[0]['weight'], places=6)
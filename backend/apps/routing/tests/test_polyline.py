@@ -0,0 +1,27 @@
+"""
+Tests for encoded polyline path compression.
+"""
+import random
+import unittest
+
+from core.utils import polyline
+
+
+class PolylineTests(unittest.TestCase):
+    def test_google_reference_example(self):
+        points = [[38.5, -120.2], [40.7, -120.95], [43.252, -126.453]]
+        encoded = polyline.encode(points, precision=5)
+        self.assertEqual(encoded, '_p~iF~ps|U_ulLnnqC_mqNvxq`@')
+        self.assertEqual(polyline.decode(encoded, precision=5), points)
+
+    def test_round_trip_node_coordinates_exactly(self):
+        rnd = random.Random(3)
+        points = [
+            [float(f'{12.6 + rnd.random() * 0.1:.6f}'), float(f'{123.8 + rnd.random() * 0.1:.6f}')]
+            for _ in range(200)
+        ]
+        self.assertEqual(polyline.decode(polyline.encode(points)), points)
+
+    def test_empty_path(self):
+        self.assertEqual(polyline.encode([]), '')
+        self.assertEqual(polyline.decode(''), [])
@@ -0,0 +1,66 @@
+"""
+Tests for the grid spatial index used for node snapping.
+"""
+import math
+import random
+import unittest
+
+from core.utils.spatial import GridIndex
+
+
+class GridIndexTests(unittest.TestCase):
+    """Grid queries must agree with a brute-force scan."""
+
+    def setUp(self):
+        rnd = random.Random(7)
+        self.lats = [12.64 + rnd.random() * 0.08 for _ in range(800)]
+        self.lngs = [123.85 + rnd.random() * 0.09 for _ in range(800)]
+        self.index = GridIndex(self.lats, self.lngs, cell_m=200.0)
+        self.queries = [
+            (12.64 + rnd.random() * 0.08, 123.85 + rnd.random() * 0.09) for _ in range(100)
+        ]
+
+    def _brute(self, lat, lng):
+        kx = self.index._kx
+        ky = self.index._ky
+        return sorted(
+            (math.hypot((self.lngs[i] - lng) * kx, (self.lats[i] - lat) * ky), i)
+            for i in range(len(self.lats))
+        )
+
+    def test_nearest_matches_brute_force(self):
+        for lat, lng in self.queries:
+            d, i = self._brute(lat, lng)[0]
+            found, found_d = self.index.nearest(lat, lng)
+            self.assertEqual(found, i)
+            self.assertAlmostEqual(found_d, d, places=6)
+
+    def test_k_nearest_matches_brute_force(self):
+        for lat, lng in self.queries[:20]:
+            expected = [i for _, i in self._brute(lat, lng)[:5]]
+            self.assertEqual([i for i, _ in self.index.k_nearest(lat, lng, 5)], expected)
+
+    def test_within_matches_brute_force(self):
+        for lat, lng in self.queries[:20]:
+            expected = [i for d, i in self._brute(lat, lng) if d <= 450.0]
+            self.assertEqual([i for i, _ in self.index.within(lat, lng, 450.0)], expected)
+
+    def test_far_query_still_finds_nearest(self):
+        d, i = self._brute(0.0, 0.0)[0]
+        self.assertEqual(self.index.nearest(0.0, 0.0)[0], i)
+        self.assertEqual(self.index.within(0.0, 0.0, 1000.0), [])
+
+    def test_bounds_and_contains(self):
+        self.assertEqual(
+            self.index.bounds,
+            (min(self.lats), max(self.lats), min(self.lngs), max(self.lngs)),
+        )
+        self.assertTrue(self.index.contains(12.68, 123.9))
+        self.assertFalse(self.index.contains(14.6, 121.0))
+
+    def test_empty_index(self):
+        index = GridIndex([], [])
+        self.assertIsNone(index.nearest(12.7, 123.9))
+        self.assertEqual(index.k_nearest(12.7, 123.9, 3), [])
+        self.assertEqual(index.within(12.7, 123.9, 100.0), [])
+        self.assertFalse(index.contains(12.7, 123.9))
@@ -9,6 +9,7 @@ from django.contrib.auth import get_user_model
 from django.db.models import Q
 
 from core.permissions.mdrrmo import IsMDRRMO
+from apps.hazards.models import HazardReport
 from apps.users.serializers import MdrrmoUserListSerializer
 from apps.system_logs.models import SystemLog
 from apps.system_logs.serializers import SystemLogSerializer
@@ -83,7 +84,9 @@ def get_user(request, user_id):
     data = serializer.data
     data['total_reports'] = user.hazard_reports.count()
     data['approved_reports'] = user.hazard_reports.filter(status='approved').count()
-    data['pending_reports'] = user.hazard_reports.filter(status='pending').count()
+    data['pending_reports'] = user.hazard_reports.filter(
+        status__in=[HazardReport.Status.PENDING, HazardReport.Status.PENDING_SCORING],
+    ).count()
     
     return Response(data)
 
@@ -9,21 +9,88 @@ Consensus rules:
 - only PENDING / APPROVED reports are considered
 - only reports within 150 m and within the configured time window are considered
 - duplicate reports in the same area/time are clustered to prevent inflation
+
+Candidates are narrowed in the database with a latitude / longitude range
+around the query point (within_bounding_box, backed by the (hazard_type,
+status, latitude) and (status, latitude) indexes on HazardReport), so only
+reports in the surrounding box are loaded and checked with exact haversine;
+submission cost no longer grows with the size of the reports table.
 """
+import math
 from dataclasses import dataclass
 from datetime import timedelta
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, List, Optional, Set
 
 from django.utils import timezone
 
-from core.utils.geo import haversine_meters, within_radius
+from core.utils.geo import bounding_box, haversine_meters, within_radius
 
 
 CONSENSUS_RADIUS_METERS = 150.0
 NEARBY_TIME_WINDOW_HOURS = 1
 
 
+def within_bounding_box(report_queryset, lat: float, lng: float, radius_m: float):
+    """Restrict report_queryset to the lat/lng box around a radius_m circle (superset of the circle)."""
+    min_lat, max_lat, min_lng, max_lng = bounding_box(float(lat), float(lng), radius_m)
+    return report_queryset.filter(
+        latitude__gte=min_lat, latitude__lte=max_lat,
+        longitude__gte=min_lng, longitude__lte=max_lng,
+    )
+
+
+def cluster_reports(reports, radius_m: float, window_seconds: float) -> List[Set[int]]:
+    """
+    Anti-duplicate clustering: in order, each report joins the first cluster
+    whose representative (its first report) is within radius_m and
+    window_seconds, otherwise it starts a new cluster. Returns each cluster's
+    user ids, in creation order.
+
+    Clusters are bucketed by their representative's cell in a
+    radius_m × radius_m × window_seconds grid and listed under the 27 cells
+    around it, so each report is compared only with the clusters near its own
+    cell instead of with all of them.
+    Cell sides are the bounding_box extents at the highest |latitude| present,
+    so every representative within reach lies in a neighbouring cell and the
+    result is the same as scanning every cluster.
+    """
+    points = [
+        (float(r.latitude), float(r.longitude), r.created_at.timestamp() if r.created_at else 0.0, r.user_id)
+        for r in reports
+    ]
+    if not points:
+        return []
+    max_abs_lat = max(abs(p[0]) for p in points)
+    _, lat_hi, _, lng_hi = bounding_box(max_abs_lat, 0.0, radius_m)
+    cell_lat = lat_hi - max_abs_lat
+    cell_lng = lng_hi
+    cell_t = window_seconds if window_seconds > 0 else 1.0
+
+    reps: List[tuple] = []  # (lat, lng, ts) of each cluster's first report
+    users: List[Set[int]] = []
+    # cell -> ids of clusters whose representative lies in that cell or a neighbouring one,
+    # in creation order, so the first match found is the first cluster that matches.
+    near: Dict[tuple, List[int]] = {}
+    for lat, lng, ts, user_id in points:
+        cell = (math.floor(lat / cell_lat), math.floor(lng / cell_lng), math.floor(ts / cell_t))
+        for idx in near.get(cell, ()):
+            r_lat, r_lng, r_ts = reps[idx]
+            if abs(ts - r_ts) <= window_seconds and haversine_meters(lat, lng, r_lat, r_lng) <= radius_m:
+                users[idx].add(user_id)
+                break
+        else:
+            idx = len(reps)
+            reps.append((lat, lng, ts))
+            users.append({user_id})
+            cx, cy, ct = cell
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for dt in (-1, 0, 1):
+                        near.setdefault((cx + dx, cy + dy, ct + dt), []).append(idx)
+    return users
+
+
 class ConsensusScoringService:
     def __init__(self, radius_m: float = CONSENSUS_RADIUS_METERS):
         self.radius_m = radius_m
@@ -39,8 +106,10 @@ class ConsensusScoringService:
         report_queryset,
         hazard_type: Optional[str],
         time_window_hours: Optional[float],
+        lat: float,
+        lng: float,
     ):
-        qs = report_queryset.filter(status__in=['pending', 'approved'])
+        qs = within_bounding_box(report_queryset.filter(status__in=['pending', 'pending_scoring', 'approved']), lat, lng, self.radius_m)
         if hazard_type:
             qs = qs.filter(hazard_type=hazard_type)
         if time_window_hours is not None:
@@ -59,7 +128,7 @@ class ConsensusScoringService:
     ) -> "ConsensusScoringService.SupportSummary":
         lat_f = float(lat) if isinstance(lat, Decimal) else float(lat)
         lng_f = float(lng) if isinstance(lng, Decimal) else float(lng)
-        qs = self._filtered_queryset(report_queryset, hazard_type, time_window_hours)
+        qs = self._filtered_queryset(report_queryset, hazard_type, time_window_hours, lat_f, lng_f)
 
         nearby_reports = []
         for report in qs:
@@ -70,34 +139,20 @@ class ConsensusScoringService:
             if within_radius(lat_f, lng_f, report_lat, report_lng, self.radius_m):
                 nearby_reports.append(report)
 
+        return self.summarize(nearby_reports, time_window_hours)
+
+    def summarize(
+        self,
+        nearby_reports,
+        time_window_hours: Optional[float] = None,
+    ) -> "ConsensusScoringService.SupportSummary":
+        """SupportSummary of reports already known to be within the radius (in query order)."""
         if not nearby_reports:
             return self.SupportSummary(0, 0, 0)
 
         # Cluster nearby reports by proximity + time overlap (anti-duplicate logic).
-        clusters = []
         time_window_seconds = (time_window_hours or NEARBY_TIME_WINDOW_HOURS) * 3600.0
-        for report in nearby_reports:
-            report_lat = float(report.latitude)
-            report_lng = float(report.longitude)
-            report_ts = report.created_at.timestamp() if report.created_at else 0.0
-            placed = False
-
-            for cluster in clusters:
-                if (
-                    haversine_meters(report_lat, report_lng, cluster['rep_lat'], cluster['rep_lng']) <= self.radius_m
-                    and abs(report_ts - cluster['rep_ts']) <= time_window_seconds
-                ):
-                    cluster['user_ids'].add(report.user_id)
-                    placed = True
-                    break
-
-            if not placed:
-                clusters.append({
-                    'rep_lat': report_lat,
-                    'rep_lng': report_lng,
-                    'rep_ts': report_ts,
-                    'user_ids': {report.user_id},
-                })
+        clusters = cluster_reports(nearby_reports, self.radius_m, time_window_seconds)
 
         unique_user_ids = {report.user_id for report in nearby_reports}
         return self.SupportSummary(
@@ -143,7 +198,7 @@ class ConsensusScoringService:
         """
         lat_f = float(lat) if isinstance(lat, Decimal) else float(lat)
         lng_f = float(lng) if isinstance(lng, Decimal) else float(lng)
-        qs = self._filtered_queryset(report_queryset, hazard_type, time_window_hours)
+        qs = self._filtered_queryset(report_queryset, hazard_type, time_window_hours, lat_f, lng_f)
 
         best_report = None
         best_distance = float('inf')
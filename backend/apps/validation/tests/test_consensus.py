@@ -2,11 +2,16 @@
 Tests for deduplicated nearby support (ConsensusScoringService)
 and rule_scoring consensus_rule_score.
 """
+import math
+import random
+from datetime import datetime, timedelta, timezone as dt_timezone
 from decimal import Decimal
-from django.test import TestCase
+from types import SimpleNamespace
+from django.test import SimpleTestCase, TestCase
 from apps.users.models import User
 from apps.hazards.models import HazardReport
-from apps.validation.services.consensus import ConsensusScoringService
+from apps.validation.services.consensus import ConsensusScoringService, cluster_reports, within_bounding_box
+from core.utils.geo import bounding_box, haversine_meters
 from apps.validation.services.rule_scoring import consensus_rule_score, combine_validation_scores
 
 
@@ -116,6 +121,30 @@ class ConsensusScoringServiceTests(TestCase):
         self.assertEqual(summary.nearby_cluster_count, 1)
         self.assertEqual(summary.nearby_unique_user_count, 2)
 
+    def test_bounding_box_prefilter_matches_full_scan(self):
+        """Range prefilter keeps every report within the radius; results equal a full haversine scan."""
+        rnd = random.Random(21)
+        center = (14.5995, 120.9842)
+        for i in range(80):
+            HazardReport.objects.create(
+                user=self.user, hazard_type='flood', description=f'R{i}',
+                latitude=Decimal(f'{center[0] + rnd.uniform(-0.002, 0.002):.7f}'),
+                longitude=Decimal(f'{center[1] + rnd.uniform(-0.002, 0.002):.7f}'),
+            )
+        service = ConsensusScoringService(radius_m=150.0)
+        all_reports = list(HazardReport.objects.all())
+        inside = [
+            r for r in all_reports
+            if haversine_meters(*center, float(r.latitude), float(r.longitude)) <= 150.0
+        ]
+        boxed = set(within_bounding_box(HazardReport.objects.all(), *center, 150.0))
+        self.assertTrue(set(inside) <= boxed)
+        self.assertLess(len(boxed), len(all_reports))
+        summary = service.get_support_summary(*center, HazardReport.objects.all(), hazard_type='flood')
+        self.assertEqual(summary.nearby_raw_reports, len(inside))
+        nearest = min(inside, key=lambda r: haversine_meters(*center, float(r.latitude), float(r.longitude)))
+        self.assertEqual(service.find_similar_existing_report(*center, HazardReport.objects.all()), nearest)
+
     def test_consensus_rule_score_steps(self):
         """Consensus rule uses smooth formula min((nearby+confirmations)/5, 1.0)."""
         self.assertEqual(consensus_rule_score(0), 0.0)
@@ -138,3 +167,70 @@ class ConsensusScoringServiceTests(TestCase):
         low = combine_validation_scores(0.6, 0.5, 0.0)
         high = combine_validation_scores(0.6, 0.5, 1.0)
         self.assertGreater(high, low)
+
+
+class BoundingBoxTests(SimpleTestCase):
+    def test_encloses_every_point_within_radius(self):
+        rnd = random.Random(7)
+        for lat in (0.0, 12.8, -45.0, 70.0, 89.99):
+            for radius in (50.0, 150.0, 5000.0):
+                min_lat, max_lat, min_lng, max_lng = bounding_box(lat, 120.0, radius)
+                for _ in range(200):
+                    # Destination point at a random bearing and distance <= radius.
+                    d = radius * rnd.random() ** 0.5 / 6371000
+                    brg = rnd.uniform(0, 2 * math.pi)
+                    p1, l1 = math.radians(lat), math.radians(120.0)
+                    p2 = math.asin(math.sin(p1) * math.cos(d) + math.cos(p1) * math.sin(d) * math.cos(brg))
+                    l2 = l1 + math.atan2(
+                        math.sin(brg) * math.sin(d) * math.cos(p1), math.cos(d) - math.sin(p1) * math.sin(p2),
+                    )
+                    plat, plng = math.degrees(p2), math.degrees(l2)
+                    self.assertLessEqual(haversine_meters(lat, 120.0, plat, plng), radius * (1 + 1e-9))
+                    self.assertTrue(min_lat <= plat <= max_lat and min_lng <= plng <= max_lng)
+
+
+def _reference_clusters(reports, radius_m, window_seconds):
+    """The original nested-loop clustering: compare with every cluster, join the first match."""
+    clusters = []
+    for r in reports:
+        lat, lng, ts = float(r.latitude), float(r.longitude), r.created_at.timestamp()
+        for c in clusters:
+            if haversine_meters(lat, lng, c[0], c[1]) <= radius_m and abs(ts - c[2]) <= window_seconds:
+                c[3].add(r.user_id)
+                break
+        else:
+            clusters.append((lat, lng, ts, {r.user_id}))
+    return [c[3] for c in clusters]
+
+
+class ClusterReportsTests(SimpleTestCase):
+    def _reports(self, n, seed, span_deg, span_hours, base_lat=12.97):
+        rnd = random.Random(seed)
+        t0 = datetime(2026, 1, 1, tzinfo=dt_timezone.utc)
+        return [
+            SimpleNamespace(
+                latitude=Decimal(f'{base_lat + rnd.uniform(0, span_deg):.7f}'),
+                longitude=Decimal(f'{124.0 + rnd.uniform(0, span_deg):.7f}'),
+                created_at=t0 + timedelta(seconds=rnd.uniform(0, span_hours * 3600)),
+                user_id=rnd.randrange(40),
+            )
+            for _ in range(n)
+        ]
+
+    def test_matches_nested_loop_clustering(self):
+        cases = [
+            (400, 1, 0.01, 1.0),   # flood event: hundreds of reports in one barangay within an hour
+            (400, 2, 0.05, 24.0),  # spread over a municipality and a day
+            (300, 3, 0.003, 0.2),  # very dense
+        ]
+        for n, seed, span_deg, span_hours in cases:
+            reports = self._reports(n, seed, span_deg, span_hours)
+            for radius, window in ((150.0, 3600.0), (50.0, 600.0), (150.0, 0.0)):
+                self.assertEqual(
+                    cluster_reports(reports, radius, window),
+                    _reference_clusters(reports, radius, window),
+                )
+
+    def test_high_latitude_cells(self):
+        reports = self._reports(300, 4, 0.02, 2.0, base_lat=64.0)
+        self.assertEqual(cluster_reports(reports, 150.0, 3600.0), _reference_clusters(reports, 150.0, 3600.0))
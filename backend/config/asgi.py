@@ -8,3 +8,12 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_asgi_application()
+
+# Background job threads (JOB_QUEUE_BACKEND=thread) start with the web process,
+# so jobs left pending by a restart are picked up without a new enqueue; the
+# network warm-up thread keeps this process's snapshot and centre trees built.
+from apps.jobs.queue import start_workers  # noqa: E402
+from apps.mobile_sync.services.network_cache import start_warmup  # noqa: E402
+
+start_workers()
+start_warmup()
@@ -47,6 +47,7 @@ INSTALLED_APPS = [
     'apps.mobile_sync',
     'apps.system_logs',
     'apps.notifications',
+    'apps.jobs',
 ]
 
 MIDDLEWARE = [
@@ -266,3 +267,70 @@ HAZARD_VIDEO_MAX_DURATION_SEC = 10
 # MP4 hazard clips: on by default; set HAZARD_VIDEO_UPLOAD=0 or false to disable.
 _hazard_video_flag = os.environ.get('HAZARD_VIDEO_UPLOAD', 'true').strip().lower()
 HAZARD_VIDEO_UPLOAD_ENABLED = _hazard_video_flag not in ('0', 'false', 'no', 'off')
+
+# Single-pair route search algorithm for searches without a centre shortest-path
+# tree: 'dijkstra' (default), or opt in to 'astar', 'bidirectional' or 'ch'
+# (contraction hierarchy, preprocessed once per road network and re-customized
+# per hazard state). All return routes of identical cost; compare them with
+# `python manage.py benchmark_routing`. calculate-route reads the destination
+# centre's tree (network_cache.center_tree), so its routes do not depend on this.
+ROUTING_SEARCH_MODE = os.environ.get('ROUTING_SEARCH_MODE', 'dijkstra').strip().lower()
+
+# Each web process rebuilds its network snapshot, centre trees and isochrones in
+# its own warm-up thread (network_cache.start_warmup) when it sees a new version,
+# and re-checks the versions this often so changes made through other processes
+# are warmed before the next request (0 = only when this process notices).
+ROUTING_WARM_POLL_SECONDS = float(os.environ.get('ROUTING_WARM_POLL_SECONDS', '30'))
+
+# calculate-route result cache (apps.mobile_sync.services.route_cache), keyed by
+# snapped start node, centre, k and the road / hazard / centre versions.
+# ROUTE_CACHE_SIZE=0 disables it.
+ROUTE_CACHE_SIZE = int(os.environ.get('ROUTE_CACHE_SIZE', '512'))
+ROUTE_CACHE_TTL_SECONDS = float(os.environ.get('ROUTE_CACHE_TTL_SECONDS', '300'))
+
+# Fraction of computed routes whose per-hazard / per-candidate / per-stage
+# diagnostics are logged on 'routing.diagnostics' (0 = never, 1 = every request).
+# Stage timings are always recorded; see mdrrmo/route-timings/.
+ROUTE_DIAGNOSTICS_SAMPLE_RATE = float(os.environ.get('ROUTE_DIAGNOSTICS_SAMPLE_RATE', '0.01'))
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {'console': {'class': 'logging.StreamHandler'}},
+    'loggers': {
+        'routing.diagnostics': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+    },
+}
+
+# mdrrmo/batch-routes/: origins per request. The endpoint searches in the
+# request worker (never a process pool) and must finish well inside the gunicorn
+# timeout; larger planning runs go to `python manage.py batch_routes --workers N`.
+BATCH_ROUTE_MAX_ORIGINS = int(os.environ.get('BATCH_ROUTE_MAX_ORIGINS', '100'))
+
+# Background jobs (apps.jobs.queue): report scoring, geocoding, FCM pushes and
+# segment-risk refreshes. 'thread' runs them in JOB_QUEUE_WORKERS threads per
+# web process, started with the WSGI / ASGI app (0 = leave them to
+# `python manage.py run_jobs`); 'sync' runs each job
+# inside the request that queued it.
+JOB_QUEUE_BACKEND = os.environ.get('JOB_QUEUE_BACKEND', 'thread').strip().lower()
+JOB_QUEUE_WORKERS = int(os.environ.get('JOB_QUEUE_WORKERS', '2'))
+JOB_QUEUE_POLL_SECONDS = float(os.environ.get('JOB_QUEUE_POLL_SECONDS', '5'))
+JOB_QUEUE_RETRY_SECONDS = float(os.environ.get('JOB_QUEUE_RETRY_SECONDS', '10'))
+JOB_QUEUE_STALE_SECONDS = float(os.environ.get('JOB_QUEUE_STALE_SECONDS', '600'))
+JOB_QUEUE_RETENTION_DAYS = float(os.environ.get('JOB_QUEUE_RETENTION_DAYS', '7'))
+
+# Hazard location: barangay/municipality from local boundary polygons (GeoJSON
+# FeatureCollection, see apps/hazards/barangay_boundaries.py; install it with
+# `python manage.py load_barangay_boundaries <file>`). Nominatim reverse
+# geocoding only adds the full address (queued job); set
+# REVERSE_GEOCODE_NOMINATIM=false to run fully offline.
+BARANGAY_BOUNDARIES_PATH = os.environ.get(
+    'BARANGAY_BOUNDARIES_PATH', str(BASE_DIR / 'data' / 'sorsogon_barangays.geojson'),
+)
+REVERSE_GEOCODE_NOMINATIM = os.environ.get('REVERSE_GEOCODE_NOMINATIM', 'true').strip().lower() in ('1', 'true', 'yes')
+
+# isochrones/: default budgets (metres, or risk-weighted metres for metric=cost)
+# and the largest budget a request may ask for.
+ISOCHRONE_BUDGETS_M = tuple(
+    float(b) for b in os.environ.get('ISOCHRONE_BUDGETS_M', '500,1000,2000').split(',') if b.strip()
+)
+ISOCHRONE_MAX_BUDGET_M = float(os.environ.get('ISOCHRONE_MAX_BUDGET_M', '10000'))
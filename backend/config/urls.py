@@ -14,6 +14,7 @@ urlpatterns = [
     path('api/', include('apps.mobile_sync.urls')),  # Mobile sync endpoints
     path('api/', include('apps.system_logs.urls')),  # System logs & user management
     path('api/', include('apps.notifications.urls')),  # Notifications
+    path('api/', include('apps.jobs.urls')),  # Background job queue
 ]
 
 # Serve user-uploaded hazard media (MDRRMO previews). For scale-out, use object storage + CDN.
@@ -22,3 +22,47 @@ def haversine_meters(lat1: float, lon1: float, lat2: float, lon2: float) -> floa
 def within_radius(lat1: float, lon1: float, lat2: float, lon2: float, radius_m: float) -> bool:
     """True if (lat2, lon2) is within radius_m meters of (lat1, lon1)."""
     return haversine_meters(lat1, lon1, lat2, lon2) <= radius_m
+
+
+def bounding_box(lat: float, lng: float, radius_m: float):
+    """
+    (min_lat, max_lat, min_lng, max_lng) enclosing every point within radius_m
+    of (lat, lng) by haversine_meters, for index-backed range prefilters before
+    the exact distance check. The longitude span is the exact great-circle bound
+    (widest at the circle's extreme latitudes), so no point in range is lost.
+    """
+    R = 6371000
+    ang = radius_m / R
+    dlat = math.degrees(ang)
+    cos_lat = math.cos(math.radians(lat))
+    if ang >= math.pi / 2 or math.sin(ang) >= cos_lat:
+        dlng = 180.0  # the circle reaches a pole: every longitude is in range
+    else:
+        dlng = math.degrees(math.asin(math.sin(ang) / cos_lat))
+    eps = 1e-9  # float rounding at the exact boundary
+    return lat - dlat - eps, lat + dlat + eps, lng - dlng - eps, lng + dlng + eps
+
+
+def convex_hull(points):
+    """
+    Convex hull of [lat, lng] points (Andrew's monotone chain), as a closed ring
+    in counter-clockwise order. Fewer than three distinct points are returned as-is.
+    """
+    pts = sorted({(float(p[0]), float(p[1])) for p in points})
+    if len(pts) < 3:
+        return [list(p) for p in pts]
+
+    def _cross(o, a, b):
+        return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+    lower, upper = [], []
+    for p in pts:
+        while len(lower) >= 2 and _cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    for p in reversed(pts):
+        while len(upper) >= 2 and _cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    ring = lower[:-1] + upper[:-1]
+    return [list(p) for p in ring + ring[:1]]
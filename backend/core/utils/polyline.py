@@ -0,0 +1,55 @@
+"""
+Encoded polyline format (Google Maps algorithm) for compact path transfer.
+
+Each coordinate is scaled by 10**precision, delta-encoded against the previous
+point and written as zig-zag varint characters in the printable range 63–126.
+precision=6 matches the 6-decimal road-graph node keys (≈ 0.1 m), so a decoded
+path is exactly the node coordinates; precision=5 is the classic Google format.
+"""
+from typing import Iterable, List, Sequence
+
+DEFAULT_PRECISION = 6
+
+
+def _encode_value(value: int, out: list) -> None:
+    value = ~(value << 1) if value < 0 else value << 1
+    while value >= 0x20:
+        out.append(chr((0x20 | (value & 0x1F)) + 63))
+        value >>= 5
+    out.append(chr(value + 63))
+
+
+def encode(points: Iterable[Sequence[float]], precision: int = DEFAULT_PRECISION) -> str:
+    """Encode [lat, lng] pairs as a polyline string."""
+    factor = 10 ** precision
+    out: list = []
+    prev_lat = prev_lng = 0
+    for lat, lng in points:
+        ilat = int(round(lat * factor))
+        ilng = int(round(lng * factor))
+        _encode_value(ilat - prev_lat, out)
+        _encode_value(ilng - prev_lng, out)
+        prev_lat, prev_lng = ilat, ilng
+    return ''.join(out)
+
+
+def decode(encoded: str, precision: int = DEFAULT_PRECISION) -> List[List[float]]:
+    """Decode a polyline string back to [lat, lng] pairs."""
+    factor = 10 ** precision
+    points = []
+    index = 0
+    coords = [0, 0]
+    length = len(encoded)
+    while index < length:
+        for j in (0, 1):
+            shift = result = 0
+            while True:
+                b = ord(encoded[index]) - 63
+                index += 1
+                result |= (b & 0x1F) << shift
+                shift += 5
+                if b < 0x20:
+                    break
+            coords[j] += ~(result >> 1) if result & 1 else result >> 1
+        points.append([coords[0] / factor, coords[1] / factor])
+    return points
@@ -0,0 +1,146 @@
+"""
+Uniform-grid spatial index over WGS84 points.
+
+Points are projected once onto a local equirectangular plane (metres) and
+bucketed into square cells. Nearest / k-nearest / radius queries search rings of
+cells outward from the query cell and stop as soon as no unsearched cell can hold
+a closer point, so a query touches a handful of cells instead of every point.
+Over a municipality-sized area the projected distance differs from haversine by
+well under 0.1 %.
+"""
+import heapq
+import math
+from collections import defaultdict
+from typing import List, Optional, Sequence, Tuple
+
+# Metres per degree of latitude (mean Earth radius 6 371 km, matches core.utils.geo).
+_M_PER_DEG = 6371000 * math.pi / 180.0
+
+
+class GridIndex:
+    """
+    Static point index. Point i is (lats[i], lngs[i]); queries return point
+    indices with their distance in metres, nearest first.
+    """
+
+    def __init__(self, lats: Sequence[float], lngs: Sequence[float], cell_m: float = 250.0):
+        self.cell_m = float(cell_m)
+        self.size = len(lats)
+        ref_lat = (min(lats) + max(lats)) / 2.0 if self.size else 0.0
+        self._kx = _M_PER_DEG * math.cos(math.radians(ref_lat))
+        self._ky = _M_PER_DEG
+        self._x = [lng * self._kx for lng in lngs]
+        self._y = [lat * self._ky for lat in lats]
+        self._cells: dict = defaultdict(list)
+        for i in range(self.size):
+            self._cells[self._cell(self._x[i], self._y[i])].append(i)
+        self._cells = dict(self._cells)
+        if self.size:
+            self.bounds = (min(lats), max(lats), min(lngs), max(lngs))
+            cxs = [c[0] for c in self._cells]
+            cys = [c[1] for c in self._cells]
+            self._cell_box = (min(cxs), max(cxs), min(cys), max(cys))
+        else:
+            self.bounds = None
+            self._cell_box = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return (int(math.floor(x / self.cell_m)), int(math.floor(y / self.cell_m)))
+
+    def contains(self, lat: float, lng: float) -> bool:
+        """True if (lat, lng) lies inside the bounding box of the indexed points."""
+        if self.bounds is None:
+            return False
+        min_lat, max_lat, min_lng, max_lng = self.bounds
+        return min_lat <= lat <= max_lat and min_lng <= lng <= max_lng
+
+    def _ring_range(self, cx: int, cy: int) -> Tuple[int, int]:
+        """First and last rings around cell (cx, cy) that can contain occupied cells."""
+        min_cx, max_cx, min_cy, max_cy = self._cell_box
+        first = max(min_cx - cx, cx - max_cx, min_cy - cy, cy - max_cy, 0)
+        last = max(abs(cx - min_cx), abs(cx - max_cx), abs(cy - min_cy), abs(cy - max_cy))
+        return first, last
+
+    def _far_query(self, first_ring: int) -> bool:
+        """Queries far outside the grid scan every point instead of huge empty rings."""
+        return 8 * first_ring > len(self._cells)
+
+    def _ring(self, cx: int, cy: int, r: int):
+        """Yield the point lists of the cells on the square ring at Chebyshev radius r."""
+        cells = self._cells
+        if r == 0:
+            pts = cells.get((cx, cy))
+            if pts:
+                yield pts
+            return
+        for dx in range(-r, r + 1):
+            for dy in (-r, r):
+                pts = cells.get((cx + dx, cy + dy))
+                if pts:
+                    yield pts
+        for dy in range(-r + 1, r):
+            for dx in (-r, r):
+                pts = cells.get((cx + dx, cy + dy))
+                if pts:
+                    yield pts
+
+    def k_nearest(self, lat: float, lng: float, k: int = 1) -> List[Tuple[int, float]]:
+        """Return up to k (index, distance_m) pairs, nearest first."""
+        if not self.size or k <= 0:
+            return []
+        qx = lng * self._kx
+        qy = lat * self._ky
+        cx, cy = self._cell(qx, qy)
+        xs, ys = self._x, self._y
+        heap: list = []  # max-heap of (-d², index) holding the k best so far
+        first, last = self._ring_range(cx, cy)
+        if self._far_query(first):
+            rings = [(self._cells.values(), float('inf'))]
+        else:
+            rings = ((self._ring(cx, cy, r), r * self.cell_m) for r in range(first, last + 1))
+        for cells, reach in rings:
+            for pts in cells:
+                for i in pts:
+                    d2 = (xs[i] - qx) ** 2 + (ys[i] - qy) ** 2
+                    if len(heap) < k:
+                        heapq.heappush(heap, (-d2, -i))
+                    elif d2 < -heap[0][0]:
+                        heapq.heapreplace(heap, (-d2, -i))
+            # Every point outside rings 0..r is at least r * cell_m away.
+            if len(heap) == k and -heap[0][0] <= reach ** 2:
+                break
+        return [(-i, math.sqrt(-nd2)) for nd2, i in sorted(heap, reverse=True)]
+
+    def nearest(self, lat: float, lng: float) -> Optional[Tuple[int, float]]:
+        """Return (index, distance_m) of the nearest point, or None when empty."""
+        found = self.k_nearest(lat, lng, 1)
+        return found[0] if found else None
+
+    def within(self, lat: float, lng: float, radius_m: float) -> List[Tuple[int, float]]:
+        """Return all (index, distance_m) pairs within radius_m, nearest first."""
+        if not self.size or radius_m < 0:
+            return []
+        qx = lng * self._kx
+        qy = lat * self._ky
+        cx, cy = self._cell(qx, qy)
+        xs, ys = self._x, self._y
+        r2 = radius_m * radius_m
+        first, last = self._ring_range(cx, cy)
+        last = min(int(math.ceil(radius_m / self.cell_m)), last)
+        if first > last:
+            return []
+        if self._far_query(first):
+            cells = self._cells.values()
+        else:
+            cells = (pts for r in range(first, last + 1) for pts in self._ring(cx, cy, r))
+        found = []
+        for pts in cells:
+            for i in pts:
+                d2 = (xs[i] - qx) ** 2 + (ys[i] - qy) ** 2
+                if d2 <= r2:
+                    found.append((d2, i))
+        found.sort()
+        return [(i, math.sqrt(d2)) for d2, i in found]
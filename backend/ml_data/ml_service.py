@@ -15,11 +15,14 @@ Usage:
     score = ml.predict_naive_bayes('flooded_road', 'deep flood blocking road')
     risk  = ml.predict_road_risk(flood_count=2, landslide_count=0,
                                   avg_severity=0.6, incident_count=5)
+    risks = ml.predict_road_risk_batch(X)   # X: (n, 9) in RF_FEATURE_COLUMNS order
 """
 import pickle
 import logging
 from pathlib import Path
 
+from ml_data.train_random_forest import FEATURE_COLUMNS as RF_FEATURE_COLUMNS
+
 logger = logging.getLogger(__name__)
 
 MODELS_DIR = Path(__file__).parent / 'models'
@@ -215,6 +218,49 @@ class MLService:
         )
         return max(0.0, min(1.0, risk))
 
+    def predict_road_risk_batch(self, features):
+        """
+        Predict risk for many segments in one call.
+
+        features: (n, 9) array-like, columns in RF_FEATURE_COLUMNS order
+                  (the keyword order of predict_road_risk).
+        Returns an (n,) ndarray in [0, 1] — one RandomForestRegressor.predict call
+        instead of n. Falls back to the same weighted formula as predict_road_risk,
+        vectorized, and to a plain list when numpy is unavailable.
+        """
+        if not self._rf_ready:
+            self._load_rf()
+        if not HAS_SKLEARN:
+            return [self.predict_road_risk(*row) for row in features]
+        X = np.asarray(features, dtype=float).reshape(-1, len(RF_FEATURE_COLUMNS))
+        if len(X) == 0:
+            return np.zeros(0)
+        if self._rf_ready and self._rf_model is not None:
+            try:
+                return np.clip(self._rf_model.predict(X), 0.0, 1.0)
+            except Exception as e:
+                logger.error('RF batch prediction error: %s', e)
+        return road_risk_fallback_batch(X)
+
+
+def road_risk_fallback_batch(X):
+    """
+    Vectorized fallback formula; column-by-column in the scalar formula's order
+    so every row equals predict_road_risk's fallback exactly.
+    """
+    risk = (
+        X[:, 0] * 0.04
+        + X[:, 1] * 0.07
+        + X[:, 2] * 0.03
+        + X[:, 3] * 0.04
+        + X[:, 4] * 0.05
+        + X[:, 5] * 0.09
+        + X[:, 6] * 0.07
+        + X[:, 7] * 0.07
+        + X[:, 8] * 0.50
+    )
+    return np.clip(risk, 0.0, 1.0)
+
 
 # Singleton instance
 _ml_service: MLService | None = None